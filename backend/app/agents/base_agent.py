@@ -1,7 +1,12 @@
 from typing import Dict, Any, List, Optional
 from groq import Groq
+from app.agents.generated_message import GeneratedMessage
 from app.core.config import settings
+from app.core.metrics import record_llm_call, record_llm_error
+from app.core.tracing import tracer
+from app.services import llm_ledger
 import json
+import time
 from datetime import datetime, date
 
 
@@ -18,7 +23,7 @@ class BaseAgent:
         self, 
         context: Dict[str, Any], 
         message_type: str = "general",
-        previous_messages: List[Dict] = None
+        previous_messages: List[GeneratedMessage] = None
     ) -> str:
         """Generate a contextual message based on the member's current state"""
         
@@ -43,21 +48,38 @@ Generate a natural, WhatsApp-style message as {self.name}. Keep it:
 
 Message:"""
 
-        response = self.client.chat.completions.create(
-            model=settings.GROQ_MODEL,
-            messages=[
-                {"role": "user", "content": full_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1024
-        )
+        with tracer.span(
+            "llm.chat_completion", **{"llm.agent": self.name, "llm.model": settings.GROQ_MODEL, "llm.message_type": message_type}
+        ) as span:
+            started = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(
+                    model=settings.GROQ_MODEL,
+                    messages=[
+                        {"role": "user", "content": full_prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=1024
+                )
+            except Exception as e:
+                record_llm_error(self.name, settings.GROQ_MODEL, e)
+                llm_ledger.record_call(
+                    self.name, settings.GROQ_MODEL, message_type, context, time.perf_counter() - started, error=e
+                )
+                raise
+            latency = time.perf_counter() - started
+            usage = getattr(response, "usage", None)
+            record_llm_call(self.name, settings.GROQ_MODEL, latency, usage)
+            llm_ledger.record_call(self.name, settings.GROQ_MODEL, message_type, context, latency, usage)
+            span.set_attribute("llm.prompt_tokens", getattr(usage, "prompt_tokens", None))
+            span.set_attribute("llm.completion_tokens", getattr(usage, "completion_tokens", None))
         return response.choices[0].message.content.strip()
     
     def _build_context_prompt(
         self, 
         context: Dict[str, Any], 
         message_type: str,
-        previous_messages: List[Dict] = None
+        previous_messages: List[GeneratedMessage] = None
     ) -> str:
         """Build context prompt from member data and journey state"""
         
@@ -83,8 +105,8 @@ Message:"""
         if previous_messages:
             context_parts.append("\nRecent conversation context:")
             for msg in previous_messages[-3:]:  # Last 3 messages
-                agent_name = msg.get('agent_name', 'Unknown')
-                content = msg.get('content', '')[:100] + "..." if len(msg.get('content', '')) > 100 else msg.get('content', '')
+                agent_name = msg.agent_name or 'Unknown'
+                content = msg.content[:100] + "..." if len(msg.content) > 100 else msg.content
                 context_parts.append(f"  {agent_name}: {content}")
         
         return "\n".join(context_parts)
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class GeneratedMessage:
+    """
+    One message produced during journey generation.
+
+    Generation keeps hundreds of these per journey alive at once, so they use
+    __slots__ rather than a dict per message. Fields only some generators set
+    (member-initiated flags, plan and exercise changes) live in extra. Convert
+    with to_dict() where a message leaves generation, e.g. JSON backups.
+    """
+
+    __slots__ = ("agent_name", "agent_role", "content", "message_type", "timestamp", "day", "month", "id", "extra")
+
+    def __init__(
+        self,
+        agent_name: str,
+        agent_role: str,
+        content: str,
+        message_type: str,
+        timestamp: datetime,
+        day: int,
+        month: int,
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.agent_name = agent_name
+        self.agent_role = agent_role
+        self.content = content
+        self.message_type = message_type
+        self.timestamp = timestamp
+        self.day = day
+        self.month = month
+        # Set once the message is published live, and kept when it is saved
+        self.id: Optional[str] = None
+        self.extra = extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The message in the generators' original dict shape, as read by the backup importer"""
+        data = {
+            "agent_name": self.agent_name,
+            "agent_role": self.agent_role,
+            "content": self.content,
+            "message_type": self.message_type,
+            "timestamp": self.timestamp,
+            "day": self.day,
+            "month": self.month
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"GeneratedMessage({self.agent_name!r}, {self.message_type!r}, day={self.day})"
@@ -1,10 +1,16 @@
 from typing import Dict, Any, List, TypedDict, Annotated
 from langgraph.graph import StateGraph, END
 import operator
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 import random
 from app.agents.base_agent import BaseAgent
+from app.agents.generated_message import GeneratedMessage
 from app.agents.personas import AGENT_PERSONAS
+from app.agents.simulation_clock import SimulationClock
+from app.core.tracing import traced, tracer
+
+# Messages of history the graph sees; agents only look back this far
+RECENT_MESSAGES = 5
 
 
 class HealthJourneyState(TypedDict):
@@ -12,7 +18,7 @@ class HealthJourneyState(TypedDict):
     current_month: int
     current_day: int
     journey_state: Dict[str, Any]
-    messages: Annotated[List[Dict], operator.add]
+    messages: Annotated[List[GeneratedMessage], operator.add]
     agents: Dict[str, BaseAgent]
     context: Dict[str, Any]
 
@@ -21,6 +27,7 @@ class LangGraphOrchestrator:
     def __init__(self):
         self.agents = {}
         self.graph = None
+        self.clock = SimulationClock()
         self._initialize_agents()
         self._build_graph()
     
@@ -70,6 +77,7 @@ class LangGraphOrchestrator:
         
         self.graph = workflow.compile()
     
+    @traced("orchestrator.node.coordinator")
     def _coordinator_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Central coordinator that decides which agents should act"""
         current_day = state["current_day"]
@@ -78,7 +86,8 @@ class LangGraphOrchestrator:
         # Update context for decision making
         state["context"]["last_coordinator_run"] = current_day
         
-        return state
+        # Returning messages here would re-append them through the reducer
+        return {"context": state["context"]}
     
     def _decide_next_agents(self, state: HealthJourneyState) -> str:
         """Decide which agent should act next based on context"""
@@ -86,6 +95,10 @@ class LangGraphOrchestrator:
         current_month = state["current_month"]
         recent_messages = state["messages"][-10:]  # Last 10 messages
         
+        # One agent speaks per run; end once it has
+        if len(state["messages"]) > state["context"].get("turn_start", 0):
+            return "end"
+        
         # Check if we need diagnostic results (months 3 and 6)
         if current_month in [3, 6] and current_day % 30 == 15:  # Mid-month diagnostics
             return "dr_warren"
@@ -123,6 +136,7 @@ class LangGraphOrchestrator:
         
         return "end"
     
+    @traced("orchestrator.node.dr_warren")
     def _dr_warren_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Dr. Warren's medical oversight and recommendations"""
         agent = self.agents["Dr. Warren"]
@@ -143,26 +157,28 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": current_month
+                "current_month": current_month,
+                "current_day": state["current_day"]
             },
             message_type=message_type,
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
         )
         
         # Add message to state
-        new_message = {
-            "agent_name": "Dr. Warren",
-            "agent_role": "Lead Physician",
-            "content": message,
-            "message_type": message_type,
-            "timestamp": datetime.now(),
-            "day": current_day,
-            "month": current_month
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        new_message = GeneratedMessage(
+            agent_name="Dr. Warren",
+            agent_role="Lead Physician",
+            content=message,
+            message_type=message_type,
+            timestamp=self.clock.timestamp(state["current_day"], "Dr. Warren"),
+            day=current_day,
+            month=current_month
+        )
+        
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
+    @traced("orchestrator.node.ruby")
     def _ruby_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Ruby's nutrition guidance and meal planning"""
         agent = self.agents["Ruby"]
@@ -182,25 +198,27 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": current_month
+                "current_month": current_month,
+                "current_day": state["current_day"]
             },
             message_type=message_type,
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
         )
         
-        new_message = {
-            "agent_name": "Ruby",
-            "agent_role": "Nutritionist",
-            "content": message,
-            "message_type": message_type,
-            "timestamp": datetime.now(),
-            "day": current_day,
-            "month": current_month
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        new_message = GeneratedMessage(
+            agent_name="Ruby",
+            agent_role="Nutritionist",
+            content=message,
+            message_type=message_type,
+            timestamp=self.clock.timestamp(state["current_day"], "Ruby"),
+            day=current_day,
+            month=current_month
+        )
+        
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
+    @traced("orchestrator.node.advik")
     def _advik_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Advik's performance analysis and biomarker insights"""
         agent = self.agents["Advik"]
@@ -209,25 +227,27 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": state["current_month"]
+                "current_month": state["current_month"],
+                "current_day": state["current_day"]
             },
             message_type="biomarker_analysis",
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
+        )
+        
+        new_message = GeneratedMessage(
+            agent_name="Advik",
+            agent_role="Performance Scientist",
+            content=message,
+            message_type="biomarker_analysis",
+            timestamp=self.clock.timestamp(state["current_day"], "Advik"),
+            day=state["current_day"],
+            month=state["current_month"]
         )
         
-        new_message = {
-            "agent_name": "Advik",
-            "agent_role": "Performance Scientist",
-            "content": message,
-            "message_type": "biomarker_analysis",
-            "timestamp": datetime.now(),
-            "day": state["current_day"],
-            "month": state["current_month"]
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
+    @traced("orchestrator.node.carla")
     def _carla_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Carla's fitness coaching and workout guidance"""
         agent = self.agents["Carla"]
@@ -245,25 +265,27 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": state["current_month"]
+                "current_month": state["current_month"],
+                "current_day": state["current_day"]
             },
             message_type=message_type,
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
         )
         
-        new_message = {
-            "agent_name": "Carla",
-            "agent_role": "Fitness Coach",
-            "content": message,
-            "message_type": message_type,
-            "timestamp": datetime.now(),
-            "day": current_day,
-            "month": state["current_month"]
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        new_message = GeneratedMessage(
+            agent_name="Carla",
+            agent_role="Fitness Coach",
+            content=message,
+            message_type=message_type,
+            timestamp=self.clock.timestamp(state["current_day"], "Carla"),
+            day=current_day,
+            month=state["current_month"]
+        )
+        
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
+    @traced("orchestrator.node.rachel")
     def _rachel_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Rachel's mental health support and stress management"""
         agent = self.agents["Rachel"]
@@ -272,25 +294,27 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": state["current_month"]
+                "current_month": state["current_month"],
+                "current_day": state["current_day"]
             },
             message_type="mental_wellness",
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
+        )
+        
+        new_message = GeneratedMessage(
+            agent_name="Rachel",
+            agent_role="Mental Health Specialist",
+            content=message,
+            message_type="mental_wellness",
+            timestamp=self.clock.timestamp(state["current_day"], "Rachel"),
+            day=state["current_day"],
+            month=state["current_month"]
         )
         
-        new_message = {
-            "agent_name": "Rachel",
-            "agent_role": "Mental Health Specialist", 
-            "content": message,
-            "message_type": "mental_wellness",
-            "timestamp": datetime.now(),
-            "day": state["current_day"],
-            "month": state["current_month"]
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
+    @traced("orchestrator.node.neel")
     def _neel_node(self, state: HealthJourneyState) -> Dict[str, Any]:
         """Neel's care coordination and member support"""
         agent = self.agents["Neel"]
@@ -299,31 +323,36 @@ class LangGraphOrchestrator:
             context={
                 "member": state["member_profile"],
                 "journey_state": state["journey_state"],
-                "current_month": state["current_month"]
+                "current_month": state["current_month"],
+                "current_day": state["current_day"]
             },
             message_type="coordination",
-            previous_messages=state["messages"][-5:]
+            previous_messages=state["messages"][-RECENT_MESSAGES:]
+        )
+        
+        new_message = GeneratedMessage(
+            agent_name="Neel",
+            agent_role="Relationship Manager",
+            content=message,
+            message_type="coordination",
+            timestamp=self.clock.timestamp(state["current_day"], "Neel"),
+            day=state["current_day"],
+            month=state["current_month"]
         )
         
-        new_message = {
-            "agent_name": "Neel",
-            "agent_role": "Relationship Manager",
-            "content": message,
-            "message_type": "coordination",
-            "timestamp": datetime.now(),
-            "day": state["current_day"],
-            "month": state["current_month"]
-        }
-        
-        state["messages"].append(new_message)
-        return state
+        # The messages reducer appends, so return only the new message
+        return {"messages": [new_message]}
     
-    def generate_day_messages(self, state: HealthJourneyState) -> List[Dict]:
+    def generate_day_messages(self, state: HealthJourneyState) -> List[GeneratedMessage]:
         """Generate messages for a single day"""
-        initial_message_count = len(state["messages"])
+        # The messages reducer copies the list the graph is given, so pass it the
+        # recent window the agents read rather than the whole journey so far
+        recent_messages = state["messages"][-RECENT_MESSAGES:]
+        state["context"]["turn_start"] = len(recent_messages)
         
         # Run the graph for one iteration
-        result = self.graph.invoke(state)
+        with tracer.span("orchestrator.day", **{"journey.month": state["current_month"], "journey.day": state["current_day"]}):
+            result = self.graph.invoke({**state, "messages": recent_messages})
         
         # Return only new messages generated
-        return result["messages"][initial_message_count:]
\ No newline at end of file
+        return result["messages"][len(recent_messages):]
@@ -7,6 +7,7 @@ AGENT_PERSONAS = {
     "Dr. Warren": {
         "role": "The Medical Strategist",
         "specialty": "Clinical Authority & Medical Direction",
+        "active_hours": (9, 12),
         "persona_prompt": """
 You are Dr. Warren, the team's physician and final clinical authority.
 
@@ -42,6 +43,7 @@ Communication style:
     "Ruby": {
         "role": "The Concierge / Orchestrator", 
         "specialty": "Logistics Coordination & Client Experience",
+        "active_hours": (8, 18),
         "persona_prompt": """
 You are Ruby, the primary point of contact for all logistics and the master of coordination.
 
@@ -78,6 +80,7 @@ Communication style:
     "Advik": {
         "role": "The Performance Scientist",
         "specialty": "Data Analysis & Performance Optimization", 
+        "active_hours": (10, 16),
         "persona_prompt": """
 You are Advik, the data analysis expert who lives in wearable data.
 
@@ -114,6 +117,7 @@ Communication style:
     "Carla": {
         "role": "The Nutritionist",
         "specialty": "Fuel Pillar & Nutrition Strategy",
+        "active_hours": (7, 10),
         "persona_prompt": """
 You are Carla, the owner of the "Fuel" pillar and nutrition expert.
 
@@ -150,6 +154,7 @@ Communication style:
     "Rachel": {
         "role": "The PT / Physiotherapist",
         "specialty": "Chassis & Physical Movement",
+        "active_hours": (6, 9),
         "persona_prompt": """
 You are Rachel, the owner of the "Chassis" and physical movement expert.
 
@@ -186,6 +191,7 @@ Communication style:
     "Neel": {
         "role": "The Concierge Lead / Relationship Manager", 
         "specialty": "Strategic Leadership & Relationship Management",
+        "active_hours": (9, 18),
         "persona_prompt": """
 You are Neel, the senior leader of the team and relationship manager.
 
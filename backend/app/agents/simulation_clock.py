@@ -0,0 +1,55 @@
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import random
+from app.agents.personas import AGENT_PERSONAS
+
+
+# Day 1 of a simulated journey; matches the 2024 dates used for health events
+JOURNEY_START = datetime(2024, 1, 1)
+
+# The member writes in the evening, after a day of sales work
+MEMBER_ACTIVE_HOURS = (19, 23)
+DEFAULT_ACTIVE_HOURS = (9, 18)
+
+# Gap between consecutive messages on the same simulated day
+MIN_REPLY_GAP_MINUTES = 2
+MAX_REPLY_GAP_MINUTES = 20
+
+
+class SimulationClock:
+    """
+    Assigns in-journey timestamps to generated messages.
+
+    A message on journey day N is stamped JOURNEY_START + (N - 1) days, at a
+    time of day inside the sender's active hours. Timestamps never go
+    backwards within a day, so ordering by timestamp follows journey
+    chronology regardless of the order messages were generated in.
+    """
+    
+    def __init__(self, start: datetime = JOURNEY_START, seed: Optional[int] = None):
+        self.start = start
+        self._random = random.Random(seed)
+        self._latest: Dict[int, datetime] = {}
+    
+    def active_hours(self, agent_name: str) -> Tuple[int, int]:
+        if agent_name in AGENT_PERSONAS:
+            return AGENT_PERSONAS[agent_name].get("active_hours", DEFAULT_ACTIVE_HOURS)
+        return MEMBER_ACTIVE_HOURS
+    
+    def timestamp(self, day: int, agent_name: str) -> datetime:
+        """Timestamp for a message sent by agent_name on journey day `day` (1-based)"""
+        first_hour, last_hour = self.active_hours(agent_name)
+        day_start = self.start + timedelta(days=day - 1)
+        stamp = day_start + timedelta(minutes=self._random.randint(first_hour * 60, last_hour * 60 - 1))
+        
+        day_end = day_start + timedelta(days=1)
+        latest = self._latest.get(day)
+        if latest and stamp <= latest:
+            stamp = latest + timedelta(minutes=self._random.randint(MIN_REPLY_GAP_MINUTES, MAX_REPLY_GAP_MINUTES))
+            if stamp >= day_end:
+                # No room for a full gap: step a second at a time, so late messages stay
+                # on their calendar day (keeping day-based ranges exact) and in order
+                stamp = latest + min(timedelta(seconds=1), (day_end - latest) / 2)
+        
+        self._latest[day] = stamp
+        return stamp
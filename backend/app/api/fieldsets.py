@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
+
+
+# Response field -> SQL column for each section of a member journey
+JOURNEY_FIELDS: Dict[str, Dict[str, Any]] = {
+    "member": {
+        "id": Member.id,
+        "name": Member.name,
+        "age": Member.age,
+        "occupation": Member.occupation,
+        "location": Member.location,
+        "health_goals": Member.health_goals
+    },
+    "messages": {
+        "id": Message.id,
+        "agent_name": Agent.name,
+        "agent_role": Agent.role,
+        "content": Message.content,
+        "message_type": Message.message_type,
+        "timestamp": Message.timestamp,
+        "context_data": Message.context_data
+    },
+    "health_events": {
+        "id": HealthEvent.id,
+        "event_type": HealthEvent.event_type,
+        "event_date": HealthEvent.event_date,
+        "description": HealthEvent.description,
+        "results": HealthEvent.results
+    },
+    "journey_states": {
+        "month": JourneyState.month,
+        "biomarkers": JourneyState.biomarkers,
+        "interventions": JourneyState.current_interventions,
+        "metrics": JourneyState.progress_metrics
+    }
+}
+
+# Sections that include= can switch on and off; the member is always returned
+JOURNEY_INCLUDES = ("messages", "health_events", "journey_states")
+
+
+def parse_include(include: Optional[str]) -> Tuple[str, ...]:
+    """Sections named in include=a,b (all of them when omitted), raising 400 on unknown names"""
+    if include is None:
+        return JOURNEY_INCLUDES
+    sections = tuple(name.strip() for name in include.split(",") if name.strip())
+    unknown = [name for name in sections if name not in JOURNEY_INCLUDES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include {', '.join(unknown)}, expected any of {', '.join(JOURNEY_INCLUDES)}"
+        )
+    return sections
+
+
+def parse_fields(section: str, fields: Optional[str]) -> List[str]:
+    """Fields named in fields[section]=a,b (all of them when omitted), raising 400 on unknown names"""
+    available = JOURNEY_FIELDS[section]
+    if fields is None:
+        return list(available)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields[{section}], expected any of {', '.join(available)}"
+        )
+    return names
+
+
+def select_columns(section: str, names: List[str], required: Tuple[str, ...] = ()) -> List[Any]:
+    """
+    Labelled columns for the requested fields plus any the query itself needs.
+
+    required covers columns a keyset cursor is read from; they are
+    selected but left out of the response by project().
+    """
+    available = JOURNEY_FIELDS[section]
+    wanted = list(dict.fromkeys(list(names) + list(required)))
+    return [available[name].label(name) for name in wanted]
+
+
+def project(row: Any, names: List[str]) -> Dict[str, Any]:
+    """Response dict for a selected row, with only the requested fields"""
+    return {name: str(getattr(row, name)) if name == "id" else getattr(row, name) for name in names}
+
+
+def needs_agent_join(names: List[str]) -> bool:
+    return any(JOURNEY_FIELDS["messages"][name].class_ is Agent for name in names)
@@ -0,0 +1,188 @@
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.api.fieldsets import needs_agent_join, project, select_columns
+from app.db.models import Member, Agent, Message, MessageRollup, HealthEvent, JourneyState
+
+
+BATCH_SECTIONS = ("journey", "timeline")
+
+
+def parse_member_ids(member_ids: List[str]) -> Tuple[List[uuid.UUID], Dict[str, Dict[str, Any]]]:
+    """Valid, de-duplicated member ids in request order, plus an error entry for each malformed one"""
+    valid: Dict[str, uuid.UUID] = {}
+    errors = {}
+    for member_id in member_ids:
+        try:
+            valid.setdefault(member_id, uuid.UUID(member_id))
+        except ValueError:
+            errors[member_id] = {"status": 400, "detail": "Invalid member id"}
+    return list(valid.values()), errors
+
+
+def _grouped(rows) -> Dict[str, List[Any]]:
+    groups = defaultdict(list)
+    for row in rows:
+        groups[str(row.member_key)].append(row)
+    return groups
+
+
+def batch_member_journeys(
+    db: Session,
+    member_ids: List[uuid.UUID],
+    sections: Tuple[str, ...],
+    fields: Dict[str, List[str]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Journeys for many members, keyed by member id; unknown members are absent.
+
+    One IN query per section regardless of how many members are asked for,
+    selecting only the requested columns, grouped per member in memory.
+    """
+    members = db.query(
+        Member.id.label("member_key"), *select_columns("member", fields["member"])
+    ).filter(Member.id.in_(member_ids)).all()
+    found = [member.member_key for member in members]
+    journeys = {str(member.member_key): {"member": project(member, fields["member"])} for member in members}
+    if not found:
+        return journeys
+
+    if "messages" in sections:
+        message_query = db.query(
+            Message.member_id.label("member_key"), *select_columns("messages", fields["messages"])
+        ).select_from(Message).filter(Message.member_id.in_(found))
+        if needs_agent_join(fields["messages"]):
+            message_query = message_query.join(Agent, Agent.id == Message.agent_id)
+        messages = _grouped(message_query.order_by(Message.member_id, Message.timestamp, Message.id).all())
+        for member_id, journey in journeys.items():
+            journey["messages"] = [project(msg, fields["messages"]) for msg in messages[member_id]]
+
+    if "health_events" in sections:
+        health_events = _grouped(db.query(
+            HealthEvent.member_id.label("member_key"), *select_columns("health_events", fields["health_events"])
+        ).filter(HealthEvent.member_id.in_(found)).order_by(HealthEvent.member_id, HealthEvent.event_date).all())
+        for member_id, journey in journeys.items():
+            journey["health_events"] = [project(event, fields["health_events"]) for event in health_events[member_id]]
+
+    if "journey_states" in sections:
+        journey_states = _grouped(db.query(
+            JourneyState.member_id.label("member_key"), *select_columns("journey_states", fields["journey_states"])
+        ).filter(JourneyState.member_id.in_(found)).order_by(JourneyState.member_id, JourneyState.month).all())
+        for member_id, journey in journeys.items():
+            journey["journey_states"] = [project(state, fields["journey_states"]) for state in journey_states[member_id]]
+
+    return journeys
+
+
+def batch_member_timelines(
+    db: Session, member_ids: List[uuid.UUID], messages_per_month: Optional[int]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Timelines for many members, keyed by member id; unknown members are absent.
+
+    Same shape as the single-member timeline, built from five IN queries:
+    members, rollup counts, the per-(member, month) message ranking, health
+    events and journey states.
+    """
+    found = [row.id for row in db.query(Member.id).filter(Member.id.in_(member_ids)).all()]
+    timelines = {str(member_id): {} for member_id in found}
+    if not found:
+        return {}
+
+    def timeline_month(member_id: str, month: int) -> Dict[str, Any]:
+        months = timelines[member_id]
+        if month not in months:
+            months[month] = {
+                "month": month,
+                "messages": [],
+                "total_messages": 0,
+                "agent_activity": {},
+                "message_types": {}
+            }
+        return months[month]
+
+    # Agent activity and message type counts from the monthly rollups
+    counts = db.query(
+        MessageRollup.member_id,
+        MessageRollup.month,
+        Agent.name,
+        MessageRollup.message_type,
+        MessageRollup.message_count
+    ).join(Agent, Agent.id == MessageRollup.agent_id).filter(MessageRollup.member_id.in_(found)).all()
+
+    for member_id, month, agent_name, msg_type, count in counts:
+        month_entry = timeline_month(str(member_id), month)
+        month_entry["total_messages"] += count
+        month_entry["agent_activity"][agent_name] = month_entry["agent_activity"].get(agent_name, 0) + count
+        month_entry["message_types"][msg_type] = month_entry["message_types"].get(msg_type, 0) + count
+
+    # Each member's messages by month, or the first N of each month when capped, ranked in one window query
+    if messages_per_month != 0:
+        ranked = db.query(
+            Message.id.label("message_id"),
+            Message.member_id.label("member_key"),
+            Message.journey_month.label("month"),
+            Message.journey_day.label("day"),
+            func.row_number().over(
+                partition_by=(Message.member_id, Message.journey_month),
+                order_by=(Message.timestamp, Message.id)
+            ).label("position")
+        ).filter(Message.member_id.in_(found)).subquery()
+
+        rows = db.query(
+            ranked.c.member_key,
+            ranked.c.month,
+            ranked.c.day,
+            Agent.name.label("agent_name"),
+            Message.content,
+            Message.message_type,
+            Message.timestamp
+        ).join(Message, Message.id == ranked.c.message_id).join(
+            Agent, Agent.id == Message.agent_id
+        )
+        if messages_per_month is not None:
+            rows = rows.filter(ranked.c.position <= messages_per_month)
+        rows = rows.order_by(ranked.c.member_key, ranked.c.month, ranked.c.position).all()
+
+        for row in rows:
+            timeline_month(str(row.member_key), row.month)["messages"].append({
+                "agent_name": row.agent_name,
+                "content": row.content,
+                "message_type": row.message_type,
+                "timestamp": row.timestamp,
+                "day": row.day
+            })
+
+    health_events = _grouped(db.query(
+        HealthEvent.member_id.label("member_key"), HealthEvent.event_date, HealthEvent.event_type,
+        HealthEvent.description, HealthEvent.results
+    ).filter(HealthEvent.member_id.in_(found)).all())
+
+    journey_states = _grouped(db.query(
+        JourneyState.member_id.label("member_key"), JourneyState.month, JourneyState.biomarkers
+    ).filter(JourneyState.member_id.in_(found)).order_by(JourneyState.member_id, JourneyState.month).all())
+
+    return {
+        member_id: {
+            "member_id": member_id,
+            "timeline": [months[month] for month in sorted(months)],
+            "health_events": [
+                {
+                    "month": event.event_date.month,
+                    "day": event.event_date.day,
+                    "event_type": event.event_type,
+                    "description": event.description,
+                    "results": event.results
+                } for event in health_events[member_id]
+            ],
+            "biomarker_progression": [
+                {
+                    "month": state.month,
+                    "biomarkers": state.biomarkers
+                } for state in journey_states[member_id]
+            ]
+        }
+        for member_id, months in timelines.items()
+    }
@@ -0,0 +1,84 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Type
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.core.cache import journey_response_cache
+from app.db.models import Member
+
+
+def journey_version(db: Session, member_id: str) -> datetime:
+    """
+    Version a member's journey by members.journey_updated_at.
+
+    Every journey write sets that column, whichever table it touches and
+    whichever process makes it, so it changes whenever the journey does.
+    This reads one row by primary key. Raises 404 for an unknown member, so
+    conditional requests can't be answered for members that don't exist.
+    """
+    row = db.query(Member.journey_updated_at).filter(Member.id == member_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return row[0]
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since as RFC 9110 prescribes"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+
+    return False
+
+
+def cached_journey_response(
+    request: Request,
+    db: Session,
+    member_id: str,
+    build: Callable[[], Dict[str, Any]],
+    response_model: Type[BaseModel]
+) -> Response:
+    """
+    Serve a journey read endpoint with ETag/Last-Modified validation.
+
+    Answers conditional requests with 304 when the journey is unchanged, and
+    otherwise serves the serialized body from the in-process LRU, calling
+    build() only on a miss.
+
+    The handler returns this Response directly, so FastAPI never applies its
+    response_model; build()'s output is validated and serialized through
+    response_model here instead, before it is cached. Fields the payload
+    leaves out, e.g. through fields[...]=, stay out of the body.
+    """
+    last_updated = journey_version(db, member_id)
+    version = last_updated.isoformat()
+    url = request.url.path + "?" + "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    etag = 'W/"' + hashlib.sha1(f"{version}|{url}".encode("utf-8")).hexdigest() + '"'
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Last-Modified": format_datetime(last_updated.replace(tzinfo=timezone.utc), usegmt=True)
+    }
+
+    if _not_modified(request, etag, last_updated):
+        return Response(status_code=304, headers=headers)
+
+    cache_key = (str(member_id), version, url)
+    body = journey_response_cache.get(cache_key)
+    if body is None:
+        body = response_model.model_validate(build()).model_dump_json(exclude_unset=True).encode("utf-8")
+        journey_response_cache.set(cache_key, body)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,99 @@
+from typing import Iterator
+from app.api.responses import dumps
+from app.db.database import read_session
+from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
+
+
+def iter_journey_ndjson(member_id: str, batch_size: int = 1000) -> Iterator[bytes]:
+    """
+    Stream a member's full journey as newline-delimited JSON.
+
+    Emits one member record, then message, health event and journey state
+    records. Rows are pulled through a server-side cursor (yield_per) and
+    flushed in chunks of batch_size lines, so memory stays flat regardless
+    of journey length. Uses its own read session because the stream outlives
+    the request's dependencies.
+    """
+    db = read_session(member_id)
+    try:
+        member = db.query(Member).filter(Member.id == member_id).first()
+        if not member:
+            return
+        
+        yield dumps({
+            "record_type": "member",
+            "id": str(member.id),
+            "name": member.name,
+            "age": member.age,
+            "occupation": member.occupation,
+            "location": member.location,
+            "health_goals": member.health_goals,
+            "created_at": member.created_at
+        }) + b"\n"
+        
+        buffer = []
+        
+        def flush():
+            chunk = b"".join(buffer)
+            buffer.clear()
+            return chunk
+        
+        # Plain column rows avoid building ORM objects for every message
+        messages = db.query(
+            Message.id, Agent.name, Agent.role, Message.content,
+            Message.message_type, Message.timestamp, Message.context_data
+        ).join(Agent, Agent.id == Message.agent_id).filter(
+            Message.member_id == member_id
+        ).order_by(Message.timestamp, Message.id).yield_per(batch_size)
+        
+        for message_id, agent_name, agent_role, content, message_type, timestamp, context_data in messages:
+            buffer.append(dumps({
+                "record_type": "message",
+                "id": str(message_id),
+                "agent_name": agent_name,
+                "agent_role": agent_role,
+                "content": content,
+                "message_type": message_type,
+                "timestamp": timestamp,
+                "context_data": context_data
+            }) + b"\n")
+            if len(buffer) >= batch_size:
+                yield flush()
+        
+        events = db.query(
+            HealthEvent.id, HealthEvent.event_type, HealthEvent.event_date,
+            HealthEvent.description, HealthEvent.results
+        ).filter(HealthEvent.member_id == member_id).order_by(HealthEvent.event_date).yield_per(batch_size)
+        
+        for event_id, event_type, event_date, description, results in events:
+            buffer.append(dumps({
+                "record_type": "health_event",
+                "id": str(event_id),
+                "event_type": event_type,
+                "event_date": event_date,
+                "description": description,
+                "results": results
+            }) + b"\n")
+            if len(buffer) >= batch_size:
+                yield flush()
+        
+        states = db.query(
+            JourneyState.month, JourneyState.biomarkers,
+            JourneyState.current_interventions, JourneyState.progress_metrics
+        ).filter(JourneyState.member_id == member_id).order_by(JourneyState.month).yield_per(batch_size)
+        
+        for month, biomarkers, interventions, metrics in states:
+            buffer.append(dumps({
+                "record_type": "journey_state",
+                "month": month,
+                "biomarkers": biomarkers,
+                "interventions": interventions,
+                "metrics": metrics
+            }) + b"\n")
+            if len(buffer) >= batch_size:
+                yield flush()
+        
+        if buffer:
+            yield flush()
+    finally:
+        db.close()
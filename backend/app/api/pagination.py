@@ -0,0 +1,65 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort_value: datetime, row_id: Any) -> str:
+    """Encode the (sort value, id) keyset position of a row as an opaque cursor"""
+    payload = json.dumps([sort_value.isoformat() if sort_value else None, str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], uuid.UUID]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (
+            datetime.fromisoformat(sort_value) if sort_value else None,
+            uuid.UUID(row_id)
+        )
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, sort_column, id_column, cursor: Optional[str], limit: int, descending: bool = False) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply keyset pagination over (sort_column, id_column) to a query.
+
+    Rows are ordered by the sort column with the id as a tie-breaker, so the
+    ordering is stable even when many rows share a timestamp. The cursor marks
+    the last row of the previous page and is turned into a range predicate,
+    which an index on (sort_column, id) can seek to directly instead of
+    scanning and discarding an OFFSET.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        # A row-value comparison rather than the equivalent OR of two terms:
+        # Postgres turns it into one index range condition, so deep pages seek
+        position = tuple_(sort_column, id_column)
+        if descending:
+            query = query.filter(position < (sort_value, last_id))
+        else:
+            query = query.filter(position > (sort_value, last_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
@@ -0,0 +1,15 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes; datetimes, dates and UUIDs are handled natively by orjson"""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class for the API, rendering with orjson instead of the stdlib json module"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
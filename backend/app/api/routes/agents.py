@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from typing import List
-from app.db.database import get_db
-from app.db.models import Agent, Message
+from app.core.query_audit import QueryBudgetExceeded, query_budget
+from app.db.database import get_read_db
+from app.db.models import Agent, Message, MessageRollup
 from app.agents.personas import AGENT_PERSONAS
+from app.models.schemas import AgentSummary, AgentPersonas, AgentMessages, AgentStats, AgentLlmUsage
+from app.services.llm_ledger import agent_usage
 
 router = APIRouter()
 
 
-@router.get("/")
-async def list_agents(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[AgentSummary], dependencies=[Depends(query_budget(1))])
+async def list_agents(db: Session = Depends(get_read_db)):
     """List all agents in the system"""
     try:
         agents = db.query(Agent).all()
@@ -21,11 +25,13 @@ async def list_agents(db: Session = Depends(get_db)):
                 "specialty": agent.specialty
             } for agent in agents
         ]
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/personas")
+@router.get("/personas", response_model=AgentPersonas)
 async def get_agent_personas():
     """Get all agent personas and their configurations"""
     return {
@@ -41,8 +47,17 @@ async def get_agent_personas():
     }
 
 
-@router.get("/{agent_id}/messages")
-async def get_agent_messages(agent_id: str, db: Session = Depends(get_db)):
+@router.get("/llm-usage", response_model=AgentLlmUsage)
+async def get_agent_llm_usage(db: Session = Depends(get_read_db)):
+    """LLM tokens, latency and cost per agent and model across all generated journeys"""
+    try:
+        return agent_usage(db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{agent_id}/messages", response_model=AgentMessages, dependencies=[Depends(query_budget(2))])
+async def get_agent_messages(agent_id: str, db: Session = Depends(get_read_db)):
     """Get all messages from a specific agent"""
     try:
         # Check if agent exists
@@ -51,7 +66,9 @@ async def get_agent_messages(agent_id: str, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Agent not found")
         
         # Get messages
-        messages = db.query(Message).filter(Message.agent_id == agent_id).order_by(Message.timestamp).all()
+        messages = db.query(Message).options(joinedload(Message.member)).filter(
+            Message.agent_id == agent_id
+        ).order_by(Message.timestamp).all()
         
         return {
             "agent": {
@@ -71,12 +88,14 @@ async def get_agent_messages(agent_id: str, db: Session = Depends(get_db)):
             ],
             "total_messages": len(messages)
         }
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{agent_id}/stats")
-async def get_agent_stats(agent_id: str, db: Session = Depends(get_db)):
+@router.get("/{agent_id}/stats", response_model=AgentStats, dependencies=[Depends(query_budget(2))])
+async def get_agent_stats(agent_id: str, db: Session = Depends(get_read_db)):
     """Get statistics for a specific agent"""
     try:
         # Check if agent exists
@@ -84,21 +103,28 @@ async def get_agent_stats(agent_id: str, db: Session = Depends(get_db)):
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
         
-        # Get messages
-        messages = db.query(Message).filter(Message.agent_id == agent_id).all()
+        # Read this agent's buckets from the monthly rollups
+        buckets = db.query(
+            MessageRollup.month,
+            MessageRollup.message_type,
+            func.sum(MessageRollup.message_count)
+        ).filter(MessageRollup.agent_id == agent_id).group_by(
+            MessageRollup.month, MessageRollup.message_type
+        ).all()
         
         # Calculate stats
+        total_messages = 0
         message_types = {}
         monthly_activity = {}
         
-        for msg in messages:
+        for month, msg_type, count in buckets:
+            total_messages += count
+            
             # Message type distribution
-            msg_type = msg.message_type or "general"
-            message_types[msg_type] = message_types.get(msg_type, 0) + 1
+            message_types[msg_type] = message_types.get(msg_type, 0) + count
             
             # Monthly activity
-            month = msg.context_data.get("month", 1) if msg.context_data else 1
-            monthly_activity[month] = monthly_activity.get(month, 0) + 1
+            monthly_activity[month] = monthly_activity.get(month, 0) + count
         
         return {
             "agent": {
@@ -107,11 +133,13 @@ async def get_agent_stats(agent_id: str, db: Session = Depends(get_db)):
                 "role": agent.role
             },
             "statistics": {
-                "total_messages": len(messages),
+                "total_messages": total_messages,
                 "message_types": message_types,
-                "monthly_activity": monthly_activity,
-                "average_messages_per_month": len(messages) / 8 if len(messages) > 0 else 0
+                "monthly_activity": dict(sorted(monthly_activity.items())),
+                "average_messages_per_month": total_messages / 8 if total_messages > 0 else 0
             }
         }
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
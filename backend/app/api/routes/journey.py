@@ -1,23 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import itertools
+import os
+import tempfile
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from app.db.database import get_db
-from app.db.models import Member, Message, HealthEvent, JourneyState
+from typing import List, Dict, Any, Optional, Tuple
+from app.api.journey_cache import cached_journey_response
+from app.api.journey_export import iter_journey_ndjson
+from app.api.fieldsets import JOURNEY_FIELDS, needs_agent_join, parse_fields, parse_include, project, select_columns
+from app.api.journey_batch import BATCH_SECTIONS, batch_member_journeys, batch_member_timelines, parse_member_ids
+from app.api.pagination import paginate
+from app.api.responses import dumps
+from app.core.config import settings
+from app.core.metrics import track_generation_job
+from app.core.query_audit import QueryBudgetExceeded, query_budget
+from app.db.database import get_db, get_read_db, read_session, stick_reads_to_primary
+from app.db.models import Member, Agent, Message, MessageRollup, HealthEvent, JourneyState
+from app.models.schemas import MemberBatch, MemberBatchRequest, MemberJourney, MemberList, MemberLlmUsage, JourneyTimeline
+from app.services.journey_events import journey_events, persisted_journey_events, resync_event
 from app.services.journey_generator import HealthJourneyGenerator
+from app.services.llm_ledger import generation_run, member_usage
 from app.services.realistic_journey_generator import RealisticJourneyGenerator
+from app.services.parquet_export import EXPORT_TABLES, write_parquet_file
 
 router = APIRouter()
 
+# Saved events read and sent per round trip when a stream catches up from the database
+BACKLOG_BATCH_SIZE = 500
+
+
+def _member_exists(member_id: str) -> bool:
+    try:
+        uuid.UUID(member_id)
+    except ValueError:
+        return False
+    db = read_session(member_id)
+    try:
+        return db.query(Member.id).filter(Member.id == member_id).first() is not None
+    finally:
+        db.close()
+
+
+def _generate_journey(realistic: bool, member_id: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """Generate and save a journey, recording its LLM calls as one generation run"""
+    generator_name = "realistic" if realistic else "basic"
+    with track_generation_job(generator_name), generation_run(generator_name) as run:
+        generator = HealthJourneyGenerator()
+        if realistic:
+            journey_data = RealisticJourneyGenerator().generate_realistic_complete_journey(member_id)
+        else:
+            journey_data = generator.generate_complete_journey(member_id)
+        run.member_id = generator.save_journey_to_database(journey_data, member_id)
+    return run.member_id, journey_data
+
+
+def _generate_in_background(member_id: str, realistic: bool) -> None:
+    """Generate and save a journey under a reserved member id, reporting failures to its subscribers"""
+    try:
+        _generate_journey(realistic, member_id)
+    except Exception as e:
+        journey_events.publish(member_id, "journey_failed", {"error": str(e)})
+
+
+def _start_streamed_generation(response: Response, background_tasks: BackgroundTasks, realistic: bool) -> Dict[str, Any]:
+    """Reserve a member id and generate its journey after responding, so clients can watch it over the stream"""
+    member_id = str(uuid.uuid4())
+    journey_events.open(member_id)
+    background_tasks.add_task(_generate_in_background, member_id, realistic)
+    response.status_code = 202
+    stick_reads_to_primary(response)
+    return {
+        "message": "Journey generation started",
+        "member_id": member_id,
+        "stream_url": f"/api/v1/journey/members/{member_id}/stream"
+    }
+
 
 @router.post("/generate")
-async def generate_journey(db: Session = Depends(get_db)):
+async def generate_journey(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    stream: bool = Query(False, description="Return 202 at once and push the journey over the member stream"),
+    db: Session = Depends(get_db)
+):
     """Generate a complete 8-month health journey for Rohan Patel"""
     try:
-        generator = HealthJourneyGenerator()
-        journey_data = generator.generate_complete_journey()
+        if stream:
+            return _start_streamed_generation(response, background_tasks, realistic=False)
         
-        # Save to database
-        member_id = generator.save_journey_to_database(journey_data)
+        # Generate and save off the event loop so live streams keep flowing meanwhile
+        member_id, journey_data = await run_in_threadpool(_generate_journey, False)
+        stick_reads_to_primary(response)
         
         return {
             "message": "Journey generated successfully",
@@ -29,15 +107,20 @@ async def generate_journey(db: Session = Depends(get_db)):
 
 
 @router.post("/generate-realistic")
-async def generate_realistic_journey(db: Session = Depends(get_db)):
+async def generate_realistic_journey(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    stream: bool = Query(False, description="Return 202 at once and push the journey over the member stream"),
+    db: Session = Depends(get_db)
+):
     """Generate a realistic 8-month health journey with all constraints"""
     try:
-        generator = RealisticJourneyGenerator()
-        journey_data = generator.generate_realistic_complete_journey()
+        if stream:
+            return _start_streamed_generation(response, background_tasks, realistic=True)
         
-        # Save to database (reuse the save method)
-        basic_generator = HealthJourneyGenerator()
-        member_id = basic_generator.save_journey_to_database(journey_data)
+        # Saved with the basic generator's save method
+        member_id, journey_data = await run_in_threadpool(_generate_journey, True)
+        stick_reads_to_primary(response)
         
         return {
             "message": "Realistic journey generated successfully",
@@ -48,7 +131,7 @@ async def generate_realistic_journey(db: Session = Depends(get_db)):
                 "plan_adjustments": len(journey_data["plan_adherence_events"]),
                 "exercise_updates": len(journey_data["exercise_progressions"]),
                 "quarterly_diagnostics": len(journey_data["quarterly_diagnostics"]),
-                "chronic_condition": journey_data["member_profile"]["chronic_condition"],
+                "chronic_condition": journey_data["journey_summary"]["chronic_condition_managed"],
                 "average_adherence": f"{journey_data['journey_summary']['average_adherence_rate']*100}%"
             }
         }
@@ -56,150 +139,414 @@ async def generate_realistic_journey(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/members/{member_id}")
-async def get_member_journey(member_id: str, db: Session = Depends(get_db)):
-    """Get complete journey data for a member"""
+@router.websocket("/members/{member_id}/stream")
+async def stream_member_journey(
+    websocket: WebSocket,
+    member_id: str,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (e.g. the last message id seen)")
+):
+    """
+    Push a member's messages, health events and journey states as they are generated and saved.
+    
+    Each frame is a JSON event {id, seq, type, member_id, data}. Reconnect with
+    last_event_id to resume; events already seen may be repeated when the resume
+    point has to be recovered from the database, so clients should de-duplicate by id.
+    """
+    await websocket.accept()
+    # A channel exists as soon as generation is reserved, before the member row is saved
+    if not journey_events.has_channel(member_id) and not await run_in_threadpool(_member_exists, member_id):
+        await websocket.close(code=4404, reason="Member not found")
+        return
+    
+    subscription, backlog = journey_events.subscribe(member_id, last_event_id)
     try:
-        # Get member
-        member = db.query(Member).filter(Member.id == member_id).first()
-        if not member:
-            raise HTTPException(status_code=404, detail="Member not found")
+        async def send_backlog():
+            if backlog is not None:
+                for event in backlog:
+                    await websocket.send_text(dumps(event).decode("utf-8"))
+                return
+            # A saved journey can be long, so it is read and sent a batch at a time
+            persisted = persisted_journey_events(member_id, last_event_id, BACKLOG_BATCH_SIZE)
+            try:
+                while True:
+                    batch = await run_in_threadpool(lambda: list(itertools.islice(persisted, BACKLOG_BATCH_SIZE)))
+                    if not batch:
+                        return
+                    for event in batch:
+                        await websocket.send_text(dumps(event).decode("utf-8"))
+            finally:
+                # Closing releases the generator's read session
+                await run_in_threadpool(persisted.close)
         
-        # Get messages
-        messages = db.query(Message).filter(Message.member_id == member_id).order_by(Message.timestamp).all()
+        async def send_events():
+            await send_backlog()
+            while True:
+                event = await subscription.get()
+                if event is None:
+                    # Fell too far behind; the client reconnects with its last id
+                    await websocket.send_text(dumps(resync_event(member_id)).decode("utf-8"))
+                    await websocket.close(code=1013, reason="Subscriber fell behind, resume with last_event_id")
+                    return
+                await websocket.send_text(dumps(event).decode("utf-8"))
         
-        # Get health events
-        health_events = db.query(HealthEvent).filter(HealthEvent.member_id == member_id).order_by(HealthEvent.event_date).all()
+        async def watch_disconnect():
+            # Client frames are ignored; receiving surfaces the disconnect promptly
+            while True:
+                await websocket.receive_text()
         
-        # Get journey states
-        journey_states = db.query(JourneyState).filter(JourneyState.member_id == member_id).order_by(JourneyState.month).all()
-        
-        return {
-            "member": {
-                "id": str(member.id),
-                "name": member.name,
-                "age": member.age,
-                "occupation": member.occupation,
-                "location": member.location,
-                "health_goals": member.health_goals
-            },
-            "messages": [
-                {
-                    "id": str(msg.id),
-                    "agent_name": msg.agent.name,
-                    "agent_role": msg.agent.role,
-                    "content": msg.content,
-                    "message_type": msg.message_type,
-                    "timestamp": msg.timestamp,
-                    "context_data": msg.context_data
-                } for msg in messages
-            ],
-            "health_events": [
-                {
-                    "id": str(event.id),
-                    "event_type": event.event_type,
-                    "event_date": event.event_date,
-                    "description": event.description,
-                    "results": event.results
-                } for event in health_events
-            ],
-            "journey_states": [
-                {
-                    "month": state.month,
-                    "biomarkers": state.biomarkers,
-                    "interventions": state.current_interventions,
-                    "metrics": state.progress_metrics
-                } for state in journey_states
-            ]
+        sender = asyncio.ensure_future(send_events())
+        receiver = asyncio.ensure_future(watch_disconnect())
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        journey_events.unsubscribe(subscription)
+
+
+@router.get("/members/{member_id}", response_model=MemberJourney, dependencies=[Depends(query_budget(5))])
+async def get_member_journey(
+    member_id: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Messages per page (omit for the full journey)"),
+    include: Optional[str] = Query(None, description="Sections to return, e.g. journey_states,health_events (default: all)"),
+    member_fields: Optional[str] = Query(None, alias="fields[member]", description="Member fields to return"),
+    message_fields: Optional[str] = Query(None, alias="fields[messages]", description="Message fields to return, e.g. id,agent_name,timestamp"),
+    health_event_fields: Optional[str] = Query(None, alias="fields[health_events]", description="Health event fields to return"),
+    journey_state_fields: Optional[str] = Query(None, alias="fields[journey_states]", description="Journey state fields to return")
+):
+    """
+    Get journey data for a member, optionally paging through messages.
+    
+    include= and fields[section]= narrow the response; only the requested
+    sections are queried and only the requested columns are selected.
+    """
+    try:
+        sections = parse_include(include)
+        fields = {
+            "member": parse_fields("member", member_fields),
+            "messages": parse_fields("messages", message_fields),
+            "health_events": parse_fields("health_events", health_event_fields),
+            "journey_states": parse_fields("journey_states", journey_state_fields)
         }
+        
+        def build():
+            # Get member
+            member = db.query(*select_columns("member", fields["member"])).filter(Member.id == member_id).first()
+            if not member:
+                raise HTTPException(status_code=404, detail="Member not found")
+            journey = {"member": project(member, fields["member"])}
+            
+            # Get messages, keyset-paged over (timestamp, id) when a page size is given
+            if "messages" in sections:
+                message_query = db.query(
+                    *select_columns("messages", fields["messages"], required=("timestamp", "id"))
+                ).select_from(Message).filter(Message.member_id == member_id)
+                if needs_agent_join(fields["messages"]):
+                    message_query = message_query.join(Agent, Agent.id == Message.agent_id)
+                
+                next_cursor = None
+                if limit is not None or cursor:
+                    messages, next_cursor = paginate(message_query, Message.timestamp, Message.id, cursor, limit or 100)
+                else:
+                    messages = message_query.order_by(Message.timestamp, Message.id).all()
+                journey["messages"] = [project(msg, fields["messages"]) for msg in messages]
+            
+            # Health events and journey states are small, so only the first page carries them
+            if "health_events" in sections:
+                health_events = [] if cursor else db.query(
+                    *select_columns("health_events", fields["health_events"])
+                ).filter(HealthEvent.member_id == member_id).order_by(HealthEvent.event_date).all()
+                journey["health_events"] = [project(event, fields["health_events"]) for event in health_events]
+            
+            if "journey_states" in sections:
+                journey_states = [] if cursor else db.query(
+                    *select_columns("journey_states", fields["journey_states"])
+                ).filter(JourneyState.member_id == member_id).order_by(JourneyState.month).all()
+                journey["journey_states"] = [project(state, fields["journey_states"]) for state in journey_states]
+            
+            if "messages" in sections:
+                journey["next_cursor"] = next_cursor
+            return journey
+            
+        return cached_journey_response(request, db, member_id, build, MemberJourney)
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/members/{member_id}/timeline")
-async def get_journey_timeline(member_id: str, db: Session = Depends(get_db)):
-    """Get timeline view of member's journey"""
+@router.get("/members/{member_id}/export")
+async def export_member_journey(member_id: str, db: Session = Depends(get_read_db)):
+    """Stream a member's full journey as newline-delimited JSON records"""
     try:
-        # Get member
-        member = db.query(Member).filter(Member.id == member_id).first()
-        if not member:
+        # Check member exists before committing to a streaming response
+        if not db.query(Member.id).filter(Member.id == member_id).first():
             raise HTTPException(status_code=404, detail="Member not found")
         
-        # Get messages grouped by month
-        messages = db.query(Message).filter(Message.member_id == member_id).order_by(Message.timestamp).all()
+        return StreamingResponse(
+            iter_journey_ndjson(member_id),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="journey_{member_id}.ndjson"'}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export/{table}")
+async def export_parquet(
+    table: str,
+    db: Session = Depends(get_read_db),
+    member_id: Optional[List[str]] = Query(None, description="Members to export (repeatable, omit for all)")
+):
+    """Export messages, health_events or journey_state as a Parquet file"""
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export table, expected one of {', '.join(EXPORT_TABLES)}")
+    
+    try:
+        # Build the file on disk in row groups so memory stays bounded
+        handle, path = tempfile.mkstemp(suffix=".parquet")
+        os.close(handle)
+        try:
+            await run_in_threadpool(write_parquet_file, db, table, path, member_id)
+        except Exception:
+            # The file is only handed to the response, which removes it, once written
+            os.remove(path)
+            raise
         
-        # Group messages by month
-        timeline = {}
-        for message in messages:
-            month = message.context_data.get("month", 1) if message.context_data else 1
+        return FileResponse(
+            path,
+            media_type="application/vnd.apache.parquet",
+            filename=f"{table}.parquet",
+            background=BackgroundTask(os.remove, path)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/members/{member_id}/timeline", response_model=JourneyTimeline, dependencies=[Depends(query_budget(6))])
+async def get_journey_timeline(
+    member_id: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    messages_per_month: Optional[int] = Query(None, ge=0, le=1000, description="Maximum messages listed per month; all by default")
+):
+    """Get timeline view of member's journey"""
+    try:
+        def build():
+            # Get member
+            member = db.query(Member).filter(Member.id == member_id).first()
+            if not member:
+                raise HTTPException(status_code=404, detail="Member not found")
             
-            if month not in timeline:
-                timeline[month] = {
-                    "month": month,
-                    "messages": [],
-                    "agent_activity": {},
-                    "message_types": {}
-                }
+            # Agent activity and message type counts from the monthly rollups
+            counts = db.query(
+                MessageRollup.month,
+                Agent.name,
+                MessageRollup.message_type,
+                MessageRollup.message_count
+            ).join(Agent, Agent.id == MessageRollup.agent_id).filter(
+                MessageRollup.member_id == member_id
+            ).all()
             
-            timeline[month]["messages"].append({
-                "agent_name": message.agent.name,
-                "content": message.content,
-                "message_type": message.message_type,
-                "timestamp": message.timestamp,
-                "day": message.context_data.get("day", 1) if message.context_data else 1
-            })
+            timeline = {}
             
-            # Track agent activity
-            agent_name = message.agent.name
-            timeline[month]["agent_activity"][agent_name] = timeline[month]["agent_activity"].get(agent_name, 0) + 1
+            def timeline_month(month: int) -> Dict[str, Any]:
+                if month not in timeline:
+                    timeline[month] = {
+                        "month": month,
+                        "messages": [],
+                        "total_messages": 0,
+                        "agent_activity": {},
+                        "message_types": {}
+                    }
+                return timeline[month]
             
-            # Track message types
-            msg_type = message.message_type or "general"
-            timeline[month]["message_types"][msg_type] = timeline[month]["message_types"].get(msg_type, 0) + 1
+            for month, agent_name, msg_type, count in counts:
+                month_entry = timeline_month(month)
+                month_entry["total_messages"] += count
+                month_entry["agent_activity"][agent_name] = month_entry["agent_activity"].get(agent_name, 0) + count
+                month_entry["message_types"][msg_type] = month_entry["message_types"].get(msg_type, 0) + count
+            
+            # Each month's messages in order, or its first N when capped, ranked by
+            # a window function so only the listed rows leave the database. Ranking
+            # reads only columns in the covering (member_id, timestamp, id) index;
+            # content is fetched for the kept rows alone.
+            if messages_per_month != 0:
+                ranked = db.query(
+                    Message.id.label("message_id"),
+                    Message.journey_month.label("month"),
+                    Message.journey_day.label("day"),
+                    func.row_number().over(
+                        partition_by=Message.journey_month,
+                        order_by=(Message.timestamp, Message.id)
+                    ).label("position")
+                ).filter(Message.member_id == member_id).subquery()
+                
+                rows = db.query(
+                    ranked.c.month,
+                    ranked.c.day,
+                    Agent.name.label("agent_name"),
+                    Message.content,
+                    Message.message_type,
+                    Message.timestamp
+                ).join(Message, Message.id == ranked.c.message_id).join(
+                    Agent, Agent.id == Message.agent_id
+                )
+                if messages_per_month is not None:
+                    rows = rows.filter(ranked.c.position <= messages_per_month)
+                rows = rows.order_by(ranked.c.month, ranked.c.position).all()
+                
+                for row in rows:
+                    timeline_month(row.month)["messages"].append({
+                        "agent_name": row.agent_name,
+                        "content": row.content,
+                        "message_type": row.message_type,
+                        "timestamp": row.timestamp,
+                        "day": row.day
+                    })
+            
+            # Get health events
+            health_events = db.query(HealthEvent).filter(HealthEvent.member_id == member_id).all()
+            
+            # Get journey states (biomarker progression)
+            journey_states = db.query(JourneyState).filter(JourneyState.member_id == member_id).order_by(JourneyState.month).all()
+            
+            return {
+                "member_id": member_id,
+                "timeline": [timeline[month] for month in sorted(timeline)],
+                "health_events": [
+                    {
+                        "month": event.event_date.month,
+                        "day": event.event_date.day,
+                        "event_type": event.event_type,
+                        "description": event.description,
+                        "results": event.results
+                    } for event in health_events
+                ],
+                "biomarker_progression": [
+                    {
+                        "month": state.month,
+                        "biomarkers": state.biomarkers
+                    } for state in journey_states
+                ]
+            }
+            
+        return cached_journey_response(request, db, member_id, build, JourneyTimeline)
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/members/{member_id}/llm-usage", response_model=MemberLlmUsage, dependencies=[Depends(query_budget(5))])
+async def get_member_llm_usage(member_id: str, db: Session = Depends(get_read_db)):
+    """LLM tokens, latency and cost of generating a member's journey, by agent, message type, month and run"""
+    try:
+        if not db.query(Member.id).filter(Member.id == member_id).first():
+            raise HTTPException(status_code=404, detail="Member not found")
+        return member_usage(db, member_id)
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/members/batch",
+    response_model=MemberBatch,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(query_budget(9))]
+)
+async def get_member_batch(batch: MemberBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    Journeys and timelines for many members in one request.
+    
+    Each section is loaded with set-based IN queries over all requested
+    members, so the query count does not grow with the batch size. Malformed
+    or unknown member ids are reported under errors without failing the rest.
+    """
+    if len(batch.member_ids) > settings.MEMBER_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MEMBER_BATCH_MAX_SIZE} member ids per batch")
+    unknown_sections = [section for section in batch.sections if section not in BATCH_SECTIONS]
+    if unknown_sections:
+        raise HTTPException(status_code=400, detail=f"Unknown sections {', '.join(unknown_sections)}, expected any of {', '.join(BATCH_SECTIONS)}")
+    unknown_fields = [section for section in batch.fields if section not in JOURNEY_FIELDS]
+    if unknown_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown fields sections {', '.join(unknown_fields)}")
+    
+    try:
+        sections = parse_include(batch.include)
+        fields = {section: parse_fields(section, batch.fields.get(section)) for section in JOURNEY_FIELDS}
+        member_ids, errors = parse_member_ids(batch.member_ids)
         
-        # Get health events
-        health_events = db.query(HealthEvent).filter(HealthEvent.member_id == member_id).all()
+        journeys = batch_member_journeys(db, member_ids, sections, fields) if "journey" in batch.sections else {}
+        timelines = batch_member_timelines(db, member_ids, batch.messages_per_month) if "timeline" in batch.sections else {}
         
-        # Get journey states (biomarker progression)
-        journey_states = db.query(JourneyState).filter(JourneyState.member_id == member_id).order_by(JourneyState.month).all()
+        members = {}
+        for member_id in map(str, member_ids):
+            if member_id not in journeys and member_id not in timelines:
+                errors[member_id] = {"status": 404, "detail": "Member not found"}
+                continue
+            entry = {}
+            if member_id in journeys:
+                entry["journey"] = journeys[member_id]
+            if member_id in timelines:
+                entry["timeline"] = timelines[member_id]
+            members[member_id] = entry
         
         return {
-            "member_id": member_id,
-            "timeline": list(timeline.values()),
-            "health_events": [
-                {
-                    "month": event.event_date.month,
-                    "day": event.event_date.day,
-                    "event_type": event.event_type,
-                    "description": event.description,
-                    "results": event.results
-                } for event in health_events
-            ],
-            "biomarker_progression": [
-                {
-                    "month": state.month,
-                    "biomarkers": state.biomarkers
-                } for state in journey_states
-            ]
+            "members": members,
+            "errors": errors,
+            "requested": len(batch.member_ids),
+            "returned": len(members)
         }
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/members")
-async def list_members(db: Session = Depends(get_db)):
-    """List all members in the system"""
+@router.get("/members", response_model=MemberList, dependencies=[Depends(query_budget(1))])
+async def list_members(
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of members to return")
+):
+    """List members in the system, keyset-paged over (created_at, id)"""
     try:
-        members = db.query(Member).all()
-        return [
-            {
-                "id": str(member.id),
-                "name": member.name,
-                "age": member.age,
-                "occupation": member.occupation,
-                "location": member.location,
-                "created_at": member.created_at
-            } for member in members
-        ]
+        members, next_cursor = paginate(db.query(Member), Member.created_at, Member.id, cursor, limit)
+        return {
+            "members": [
+                {
+                    "id": str(member.id),
+                    "name": member.name,
+                    "age": member.age,
+                    "occupation": member.occupation,
+                    "location": member.location,
+                    "created_at": member.created_at
+                } for member in members
+            ],
+            "next_cursor": next_cursor
+        }
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,25 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
-from app.db.database import get_db
-from app.db.models import Message
+from app.api.pagination import paginate
+from app.core.cache import analytics_cache
+from app.core.query_audit import QueryBudgetExceeded, query_budget
+from app.db.database import get_read_db
+from app.db.models import Agent, Message, MessageRollup
+from app.models.schemas import MessageList, MessageTypes, MessageSearchResults, MessageAnalytics
+from app.services.message_search import full_text_search
 from datetime import datetime
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=MessageList, dependencies=[Depends(query_budget(1))])
 async def list_messages(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     member_id: Optional[str] = Query(None, description="Filter by member ID"),
     agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
     message_type: Optional[str] = Query(None, description="Filter by message type"),
     month: Optional[int] = Query(None, description="Filter by month (1-8)"),
-    limit: int = Query(100, description="Maximum number of messages to return")
+    since: Optional[datetime] = Query(None, description="Only messages sent at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only messages sent before this time"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of messages to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor")
 ):
-    """List messages with optional filtering"""
+    """List messages with optional filtering, newest first, keyset-paged over (timestamp, id)"""
     try:
-        query = db.query(Message).order_by(Message.timestamp.desc())
+        # Member and agent names come in the same query rather than one lazy load per row
+        query = db.query(Message).options(joinedload(Message.member), joinedload(Message.agent))
         
         # Apply filters
         if member_id:
@@ -32,10 +42,17 @@ async def list_messages(
             query = query.filter(Message.message_type == message_type)
         
         if month:
-            # Filter by month using context_data
-            query = query.filter(Message.context_data.op('->>')('month') == str(month))
+            query = query.filter(Message.journey_month == month)
         
-        messages = query.limit(limit).all()
+        # Timestamps follow the simulated journey calendar, so a time range is
+        # a chronological slice served by the (member_id, timestamp, id) index
+        if since:
+            query = query.filter(Message.timestamp >= since)
+        
+        if until:
+            query = query.filter(Message.timestamp < until)
+        
+        messages, next_cursor = paginate(query, Message.timestamp, Message.id, cursor, limit, descending=True)
         
         return {
             "messages": [
@@ -51,52 +68,63 @@ async def list_messages(
                 } for msg in messages
             ],
             "total_returned": len(messages),
+            "next_cursor": next_cursor,
             "filters_applied": {
                 "member_id": member_id,
                 "agent_id": agent_id,
                 "message_type": message_type,
-                "month": month
+                "month": month,
+                "since": since,
+                "until": until
             }
         }
+    except HTTPException:
+        raise
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/types")
-async def get_message_types(db: Session = Depends(get_db)):
+@router.get("/types", response_model=MessageTypes, dependencies=[Depends(query_budget(1))])
+async def get_message_types(db: Session = Depends(get_read_db)):
     """Get all unique message types in the system"""
     try:
-        # Get distinct message types
-        result = db.query(Message.message_type).distinct().all()
-        message_types = [row[0] for row in result if row[0] is not None]
-        
-        # Get count for each type
-        type_counts = {}
-        for msg_type in message_types:
-            count = db.query(Message).filter(Message.message_type == msg_type).count()
-            type_counts[msg_type] = count
+        def compute():
+            # One grouped query over the rollups yields both the types and their counts
+            type_stats = db.query(
+                MessageRollup.message_type,
+                func.sum(MessageRollup.message_count)
+            ).group_by(MessageRollup.message_type).order_by(MessageRollup.message_type).all()
+            
+            type_counts = {msg_type: count for msg_type, count in type_stats}
+            return {
+                "message_types": list(type_counts),
+                "type_counts": type_counts,
+                "total_types": len(type_counts)
+            }
         
-        return {
-            "message_types": message_types,
-            "type_counts": type_counts,
-            "total_types": len(message_types)
-        }
+        return analytics_cache.get_or_set("message_types", compute)
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/search")
+@router.get("/search", response_model=MessageSearchResults, dependencies=[Depends(query_budget(4))])
 async def search_messages(
     query: str = Query(..., description="Search term"),
-    db: Session = Depends(get_db),
-    limit: int = Query(50, description="Maximum number of results")
+    db: Session = Depends(get_read_db),
+    member_id: Optional[str] = Query(None, description="Filter by member ID"),
+    agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
+    month: Optional[int] = Query(None, description="Filter by month (1-8)"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of results")
 ):
-    """Search messages by content"""
+    """Full-text search over message content, ranked by relevance"""
     try:
-        # Search in message content
-        messages = db.query(Message).filter(
-            Message.content.ilike(f"%{query}%")
-        ).order_by(Message.timestamp.desc()).limit(limit).all()
+        results = full_text_search(
+            db, query, member_id=member_id, agent_id=agent_id, month=month, limit=limit
+        )
         
         return {
             "search_query": query,
@@ -106,58 +134,58 @@ async def search_messages(
                     "member_name": msg.member.name,
                     "agent_name": msg.agent.name,
                     "content": msg.content,
+                    "snippet": snippet,
+                    "rank": rank,
                     "message_type": msg.message_type,
                     "timestamp": msg.timestamp,
                     "context": msg.context_data
-                } for msg in messages
+                } for msg, rank, snippet in results
             ],
-            "total_results": len(messages)
+            "total_results": len(results)
         }
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/analytics")
-async def get_message_analytics(db: Session = Depends(get_db)):
+@router.get("/analytics", response_model=MessageAnalytics, dependencies=[Depends(query_budget(1))])
+async def get_message_analytics(db: Session = Depends(get_read_db)):
     """Get analytics about messages in the system"""
     try:
-        # Total message count
-        total_messages = db.query(Message).count()
-        
-        # Messages per agent
-        agent_stats = db.query(
-            Message.agent_id,
-            db.func.count(Message.id).label('message_count')
-        ).group_by(Message.agent_id).all()
-        
-        agent_message_counts = {}
-        for agent_id, count in agent_stats:
-            agent = db.query(db.session.query(Message).filter(Message.agent_id == agent_id).first().agent).first()
-            if agent:
-                agent_message_counts[agent.name] = count
-        
-        # Messages per type
-        type_stats = db.query(
-            Message.message_type,
-            db.func.count(Message.id).label('count')
-        ).group_by(Message.message_type).all()
-        
-        type_counts = {msg_type or "general": count for msg_type, count in type_stats}
-        
-        # Messages per month (from context_data)
-        monthly_stats = {}
-        messages_with_context = db.query(Message).filter(Message.context_data.isnot(None)).all()
-        
-        for msg in messages_with_context:
-            month = msg.context_data.get("month", 1) if msg.context_data else 1
-            monthly_stats[month] = monthly_stats.get(month, 0) + 1
+        def compute():
+            # A single grouped query over the monthly rollups; every breakdown
+            # is then folded from the buckets, so cost tracks bucket count
+            buckets = db.query(
+                Agent.name,
+                MessageRollup.message_type,
+                MessageRollup.month,
+                func.sum(MessageRollup.message_count)
+            ).join(Agent, Agent.id == MessageRollup.agent_id).group_by(
+                Agent.name, MessageRollup.message_type, MessageRollup.month
+            ).all()
+            
+            total_messages = 0
+            agent_message_counts = {}
+            type_counts = {}
+            monthly_stats = {}
+            
+            for agent_name, msg_type, month, count in buckets:
+                total_messages += count
+                agent_message_counts[agent_name] = agent_message_counts.get(agent_name, 0) + count
+                type_counts[msg_type] = type_counts.get(msg_type, 0) + count
+                monthly_stats[month] = monthly_stats.get(month, 0) + count
+            
+            return {
+                "total_messages": total_messages,
+                "agent_activity": agent_message_counts,
+                "message_types": type_counts,
+                "monthly_distribution": dict(sorted(monthly_stats.items())),
+                "average_messages_per_month": total_messages / 8 if total_messages > 0 else 0
+            }
         
-        return {
-            "total_messages": total_messages,
-            "agent_activity": agent_message_counts,
-            "message_types": type_counts,
-            "monthly_distribution": monthly_stats,
-            "average_messages_per_month": total_messages / 8 if total_messages > 0 else 0
-        }
+        return analytics_cache.get_or_set("message_analytics", compute)
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
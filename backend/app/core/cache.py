@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after a fixed TTL"""
+    
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        
+        # Compute outside the lock so a slow query doesn't block other keys
+        value = factory()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class LRUCache:
+    """Thread-safe in-process cache holding at most max_entries, evicting the least recently used"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key matches predicate"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# System-wide message analytics, shared by all requests in this process
+analytics_cache = TTLCache(settings.ANALYTICS_CACHE_TTL_SECONDS)
+
+# Serialized journey and timeline response bodies, keyed by (member_id, version, url)
+journey_response_cache = LRUCache(settings.JOURNEY_RESPONSE_CACHE_SIZE)
+
+
+def invalidate_journey_caches(member_id: str) -> None:
+    """Drop cached data that a newly written or extended journey makes stale"""
+    analytics_cache.clear()
+    journey_response_cache.invalidate(lambda key: key[0] == str(member_id))
@@ -9,6 +9,16 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_ANON_KEY: str = ""
     
+    # Read Replica Configuration (comma-separated URLs; empty = read from primary)
+    READ_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: float = 30.0
+    
+    # Connection Pools (per engine: the primary and each replica)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    
     # Groq LLM Configuration
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.3-70b-versatile"  # or "llama-3.1-8b-instant" for faster responses
@@ -19,9 +29,35 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
     
+    # Caching Configuration
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+    JOURNEY_RESPONSE_CACHE_SIZE: int = 256
+    
+    # Batch Reads
+    MEMBER_BATCH_MAX_SIZE: int = 100
+    
+    # Query Accounting (X-DB-Queries / Server-Timing headers, N+1 warnings, route query budgets)
+    QUERY_TIMING_HEADERS: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5
+    QUERY_BUDGET_STRICT: bool = False
+    
+    # Tracing (exporter: none, console or file)
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0
+    
+    # Live Journey Events (per-member WebSocket channels)
+    JOURNEY_EVENT_HISTORY_SIZE: int = 2000
+    JOURNEY_EVENT_MAX_PENDING: int = 1000
+    JOURNEY_EVENT_MAX_CHANNELS: int = 500
+    
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    
+    @property
+    def read_replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.READ_REPLICA_URLS.split(",") if url.strip()]
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,225 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from app.core.query_audit import current_queries
+
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body is sent, by matched route template",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests that have started and not yet finished sending a response",
+    ["method"]
+)
+
+# Database
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while serving one request, by matched route template",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+# LLM
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of chat completion calls",
+    ["agent", "model"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "Tokens reported by the LLM provider",
+    ["agent", "model", "kind"]
+)
+LLM_ERRORS = Counter(
+    "llm_errors",
+    "Chat completion calls that raised, by exception type",
+    ["agent", "model", "error"]
+)
+
+# Journey generation jobs
+GENERATION_JOBS_IN_PROGRESS = Gauge(
+    "journey_generation_jobs_in_progress",
+    "Journey generations currently running, inline or in the background",
+    ["generator"]
+)
+GENERATION_JOBS = Counter(
+    "journey_generation_jobs",
+    "Finished journey generations by outcome",
+    ["generator", "outcome"]
+)
+GENERATION_JOB_DURATION = Histogram(
+    "journey_generation_job_duration_seconds",
+    "Wall time to generate and save one journey",
+    ["generator"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited, labelled by the pool's logging name"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name or "default").observe(time.perf_counter() - started)
+
+
+class PoolCollector:
+    """
+    Connection pool gauges read at scrape time.
+
+    Nothing is recorded per checkout, so utilization costs the hot path
+    nothing; engine.pool is looked up on every scrape so pools replaced by
+    dispose() are still reported.
+    """
+
+    def __init__(self):
+        # name -> (engine, max_overflow it was created with)
+        self.engines: Dict[str, Tuple[Engine, int]] = {}
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "db_pool_connections", "Pooled connections by state", labels=["pool", "state"]
+        )
+        utilization = GaugeMetricFamily(
+            "db_pool_utilization", "Checked-out connections as a fraction of pool_size + max_overflow", labels=["pool"]
+        )
+        for name, (engine, max_overflow) in self.engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            checked_out = pool.checkedout()
+            connections.add_metric([name, "checked_out"], checked_out)
+            connections.add_metric([name, "idle"], pool.checkedin())
+            connections.add_metric([name, "overflow"], max(pool.overflow(), 0))
+            capacity = pool.size() + max(max_overflow, 0)
+            # A negative max_overflow means unlimited, so there is no capacity to compare against
+            if max_overflow >= 0 and capacity:
+                utilization.add_metric([name], checked_out / capacity)
+        yield connections
+        yield utilization
+
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def instrument_engine(engine: Engine, name: str, max_overflow: int) -> None:
+    """Report engine's pool, created with max_overflow, in db_pool_connections and db_pool_utilization"""
+    pool_collector.engines[name] = (engine, max_overflow)
+
+
+def record_llm_call(agent: str, model: str, seconds: float, usage: Any) -> None:
+    LLM_REQUEST_DURATION.labels(agent, model).observe(seconds)
+    if usage is not None:
+        LLM_TOKENS.labels(agent, model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+        LLM_TOKENS.labels(agent, model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_llm_error(agent: str, model: str, error: Exception) -> None:
+    LLM_ERRORS.labels(agent, model, type(error).__name__).inc()
+
+
+@contextmanager
+def track_generation_job(generator: str) -> Iterator[None]:
+    """Count a journey generation as in progress for the duration of the block"""
+    started = time.perf_counter()
+    GENERATION_JOBS_IN_PROGRESS.labels(generator).inc()
+    outcome = "failed"
+    try:
+        yield
+        outcome = "succeeded"
+    finally:
+        GENERATION_JOBS_IN_PROGRESS.labels(generator).dec()
+        GENERATION_JOBS.labels(generator, outcome).inc()
+        GENERATION_JOB_DURATION.labels(generator).observe(time.perf_counter() - started)
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route the router matched, e.g.
+    /api/v1/journey/members/{member_id}; one shared label for unmatched paths.
+
+    Newer FastAPI versions match routes of included routers by their
+    router-local path, so the include prefix is taken from the request path,
+    up to where the route's own pattern matches.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    path = scope["path"]
+    pattern = getattr(route, "path_regex", None)
+    if pattern is None or pattern.match(path):
+        return template
+    for index, char in enumerate(path):
+        if char == "/" and pattern.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware timing HTTP requests and recording their SQL statement counts.
+
+    Requests are finished when the last body chunk is sent, so background
+    tasks that run after the response (streamed generation) are not billed
+    to the route. Routes are labelled by their template, e.g.
+    /api/v1/journey/members/{member_id}, and unmatched paths share one label.
+    Statement counts come from QueryAuditMiddleware, which must wrap this one.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        queries = current_queries()
+        status = ["500"]
+        finished = [False]
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+
+        def finish():
+            if finished[0]:
+                return
+            finished[0] = True
+            in_progress.dec()
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route, status[0]).observe(time.perf_counter() - started)
+            if queries is not None:
+                DB_QUERIES_PER_REQUEST.labels(method, route).observe(queries.count)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
@@ -0,0 +1,137 @@
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists, e.g. "IN (?, ?, ?)" or "IN (%(id_1_1)s, %(id_1_2)s)", collapse to one shape
+_PARAMETER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised in strict mode when a route runs more SQL statements than its budget allows.
+
+    Routes re-raise it past their generic error handling, and the app's
+    handler for it answers 500 with the budget and the offending statement.
+    """
+
+    def __init__(self, budget: int, statement: str):
+        super().__init__(f"Query budget exceeded: statement {budget + 1} of a budget of {budget}: {statement[:200]}")
+        self.budget = budget
+        self.statement = statement
+
+
+class RequestQueries:
+    """SQL statements run while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.budget: Optional[int] = None
+        self.shapes: Counter = Counter()
+        self.finished = False
+
+
+# Stats for the request being served; None outside requests
+_current: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAMETER_LIST.sub("(?)", statement)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or stats.finished:
+        return
+    stats.count += 1
+    stats.shapes[statement_shape(statement)] += 1
+    if settings.QUERY_BUDGET_STRICT and stats.budget is not None and stats.count > stats.budget:
+        raise QueryBudgetExceeded(stats.budget, statement)
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or stats.finished or not started:
+        return
+    stats.seconds += time.perf_counter() - started.pop()
+
+
+def query_budget(limit: int) -> Callable[[], None]:
+    """
+    Route dependency declaring how many SQL statements one request may run.
+
+    Over budget, requests log a warning; with QUERY_BUDGET_STRICT the
+    statement that breaks the budget raises QueryBudgetExceeded instead,
+    so tests fail on the route that regressed.
+    """
+    async def declare_budget() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = limit
+    return declare_budget
+
+
+class QueryAuditMiddleware:
+    """
+    Plain ASGI middleware accounting for the SQL each HTTP request runs.
+
+    Adds X-DB-Queries and Server-Timing headers when the response starts
+    (streamed bodies may run more statements after that), and once the
+    body is sent logs statements repeated N_PLUS_ONE_THRESHOLD or more
+    times as suspected N+1 loads, plus any route over its query budget.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueries()
+        token = _current.set(stats)
+
+        def finish():
+            if stats.finished:
+                return
+            stats.finished = True
+            request = f"{scope['method']} {scope['path']}"
+            for shape, count in stats.shapes.items():
+                if count >= settings.N_PLUS_ONE_THRESHOLD:
+                    logger.warning("Suspected N+1 in %s: %d x %s", request, count, shape[:300])
+            if stats.budget is not None and stats.count > stats.budget:
+                logger.warning("%s ran %d SQL statements, over its budget of %d", request, stats.count, stats.budget)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.QUERY_TIMING_HEADERS:
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"server-timing", f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'.encode())
+                ]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            _current.reset(token)
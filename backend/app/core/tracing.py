@@ -0,0 +1,287 @@
+import contextvars
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import route_template
+
+
+class Span:
+    """One timed operation in a trace, with OpenTelemetry-style ids and attribute names"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "OK"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.attributes["error.type"] = type(error).__name__
+        self.attributes["error.message"] = str(error)[:500]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class _NoopSpan:
+    """Stands in for spans when tracing is off or the trace was not sampled"""
+
+    trace_id = span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class ConsoleExporter:
+    """One line per finished span on stderr"""
+
+    def export(self, span: Span) -> None:
+        # Statements span several lines; keep each span on one
+        attributes = " ".join(f"{key}={' '.join(str(value).split())}" for key, value in span.attributes.items())
+        print(
+            f"[trace {span.trace_id[:8]}] {span.name} {(span.end_ns - span.start_ns) / 1e6:.1f}ms "
+            f"{span.status} {attributes}",
+            file=sys.stderr
+        )
+
+
+class FileExporter:
+    """Finished spans appended to a JSON lines file, one object per span"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+
+def create_exporter(name: str, path: str):
+    if name == "none":
+        return None
+    if name == "console":
+        return ConsoleExporter()
+    if name == "file":
+        return FileExporter(path)
+    raise ValueError(f"Unknown TRACING_EXPORTER {name!r}, expected none, console or file")
+
+
+# Innermost open span in this context; NOOP_SPAN inside an unsampled trace
+_current_span: contextvars.ContextVar[Any] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Span factory with context propagation through contextvars.
+
+    Child spans follow the innermost open span, including across
+    run_in_threadpool and background tasks, which copy the context. A
+    root span decides sampling for its whole trace. With no exporter every
+    span is NOOP_SPAN, so instrumented code costs a contextvar lookup at
+    most.
+    """
+
+    def __init__(self, exporter, sample_rate: float):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start_span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, remote_parent: Optional[Tuple[str, str, bool]] = None
+    ):
+        """Open a span under the current one without making it current; finish it with end_span"""
+        if self.exporter is None:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is NOOP_SPAN:
+            return NOOP_SPAN
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, attributes or {})
+        if remote_parent is not None:
+            trace_id, parent_id, sampled = remote_parent
+            return Span(name, trace_id, parent_id, attributes or {}) if sampled else NOOP_SPAN
+        if random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        return Span(name, secrets.token_hex(16), None, attributes or {})
+
+    def end_span(self, span) -> None:
+        if span is NOOP_SPAN:
+            return
+        span.end_ns = time.time_ns()
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Span around the block, current for everything the block calls"""
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+
+tracer = Tracer(
+    exporter=create_exporter(settings.TRACING_EXPORTER, settings.TRACING_FILE_PATH),
+    sample_rate=settings.TRACING_SAMPLE_RATE
+)
+
+
+def traced(name: str) -> Callable:
+    """Decorator running the function inside a span called name"""
+    def decorate(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, parent span_id, sampled) from a W3C traceparent header, or None if absent or malformed"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    # Statements are only traced inside a span, so startup DDL doesn't start traces of its own
+    if tracer.exporter is None or _current_span.get() is None:
+        return
+    span = tracer.start_span("db.query", {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:500],
+        "db.executemany": executemany
+    })
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span = spans.pop()
+        span.set_attribute("db.rowcount", cursor.rowcount)
+        tracer.end_span(span)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_error(exception_context.original_exception)
+        tracer.end_span(span)
+
+
+class TracingMiddleware:
+    """
+    Plain ASGI middleware opening a root span per HTTP request.
+
+    Continues the caller's trace when a W3C traceparent header is sent and
+    returns this request's traceparent so clients can look the trace up.
+    The span ends when the last body chunk is sent; work in background
+    tasks after that still lands in the same trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or tracer.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        remote_parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        span = tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            remote_parent
+        )
+        token = _current_span.set(span)
+        finished = [False]
+
+        def finish():
+            if finished[0] or span is NOOP_SPAN:
+                return
+            finished[0] = True
+            route = route_template(scope)
+            span.name = f"{scope['method']} {route}"
+            span.set_attribute("http.route", route)
+            tracer.end_span(span)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and span is not NOOP_SPAN:
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status = "ERROR"
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"traceparent", f"00-{span.trace_id}-{span.span_id}-01".encode())
+                ]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            finish()
+            _current_span.reset(token)
@@ -1,17 +1,186 @@
-from sqlalchemy import create_engine
+import itertools
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.metrics import TimedQueuePool, instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+def _json_serializer(value) -> str:
+    # UUIDs and datetimes land in JSON columns, e.g. related_agents on SQLite
+    return json.dumps(value, default=str)
+
+
+def _create_engine(url: str, name: str) -> Engine:
+    """Engine whose pool reports checkout waits and utilization to /metrics"""
+    options = {"json_serializer": _json_serializer}
+    parsed = make_url(url)
+    # Only swap in the timed pool where the dialect would pool with a QueuePool anyway
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_logging_name=name,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW
+        )
+    created = create_engine(url, **options)
+    instrument_engine(created, name, settings.DB_MAX_OVERFLOW)
+    return created
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Sessions for read-only routes; bound per request by the replica router
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Cookie set on journey-creating responses so that client's next reads hit the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# Seconds a replica is behind the primary; 0 on the primary itself or when fully replayed
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replica_lag_seconds(replica: Engine) -> float:
+    """Replication lag of a replica. Databases without replication (e.g. SQLite files) report 0."""
+    with replica.connect() as connection:
+        if replica.dialect.name == "postgresql":
+            return float(connection.execute(POSTGRES_LAG_QUERY).scalar())
+        connection.execute(text("SELECT 1"))
+        return 0.0
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read-only sessions.
+
+    Reads go round-robin to replicas whose replication lag is within
+    max_lag_seconds, and fall back to the primary when none qualify or none
+    are configured. Lag is probed at most once per check_interval_seconds per
+    replica; a replica that can't be reached counts as lagging. Members
+    written in this process read from the primary for sticky_seconds, so a
+    journey is visible right after it is created.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        sticky_seconds: float,
+        lag_probe: Callable[[Engine], float] = replica_lag_seconds
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.sticky_seconds = sticky_seconds
+        self.lag_probe = lag_probe
+        self._next_replica = itertools.cycle(range(len(replicas)))
+        self._lag: Dict[int, tuple] = {}
+        self._sticky_members: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_written(self, member_id: str) -> None:
+        """Pin reads of member_id to the primary for the stickiness window"""
+        with self._lock:
+            now = time.monotonic()
+            self._sticky_members[str(member_id)] = now + self.sticky_seconds
+            # Drop expired pins so the map stays small under sustained writes
+            for key in [key for key, until in self._sticky_members.items() if until <= now]:
+                del self._sticky_members[key]
+
+    def is_sticky(self, member_id: Optional[str]) -> bool:
+        if not member_id:
+            return False
+        with self._lock:
+            until = self._sticky_members.get(str(member_id))
+        return bool(until and until > time.monotonic())
+
+    def _replica_lag(self, index: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._lag.get(index)
+        if cached and cached[0] > now:
+            return cached[1]
+        try:
+            lag = self.lag_probe(self.replicas[index])
+        except Exception:
+            lag = float("inf")
+        with self._lock:
+            self._lag[index] = (now + self.check_interval_seconds, lag)
+        return lag
+
+    def read_engine(self, member_id: Optional[str] = None, prefer_primary: bool = False) -> Engine:
+        """Engine for a read-only session, honouring stickiness and replica lag"""
+        if not self.replicas or prefer_primary or self.is_sticky(member_id):
+            return self.primary
+        with self._lock:
+            start = next(self._next_replica)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._replica_lag(index) <= self.max_lag_seconds:
+                return self.replicas[index]
+        return self.primary
+
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replicas=[
+        _create_engine(url, f"replica-{index}") for index, url in enumerate(settings.read_replica_urls_list)
+    ],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS
+)
+
+
+def read_session(member_id: Optional[str] = None, prefer_primary: bool = False) -> Session:
+    """Open a read-only session on the engine the replica router picks"""
+    return ReadSessionLocal(bind=replica_router.read_engine(member_id, prefer_primary))
+
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def stick_reads_to_primary(response: Response) -> None:
+    """Send this client's reads to the primary for the stickiness window, across workers"""
+    until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_PRIMARY_COOKIE, f"{until:.0f}",
+        max_age=int(settings.READ_YOUR_WRITES_SECONDS), httponly=True, samesite="lax"
+    )
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes, served by a replica when one is healthy"""
+    cookie = request.cookies.get(READ_PRIMARY_COOKIE)
+    try:
+        prefer_primary = bool(cookie) and float(cookie) > time.time()
+    except ValueError:
+        prefer_primary = False
+
+    db = read_session(request.path_params.get("member_id"), prefer_primary)
+    try:
+        yield db
+    finally:
+        db.close()
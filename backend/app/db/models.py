@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, Date
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, JSON, Date, Index, DDL, event
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -8,27 +9,46 @@ import uuid
 Base = declarative_base()
 
 
+class GUID(TypeDecorator):
+    """UUID column that also binds UUID strings, so string ids from paths work on SQLite as they do on Postgres"""
+    impl = UUID(as_uuid=True)
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
+
+
 class Member(Base):
     __tablename__ = "members"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     age = Column(Integer, nullable=False)
     occupation = Column(String(255), nullable=False)
     location = Column(String(255), nullable=False)
-    health_goals = Column(ARRAY(Text), nullable=True)
+    health_goals = Column(ARRAY(Text).with_variant(JSON, "sqlite"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # When the member's journey was last written; set on insert and by every path that
+    # changes an existing journey, so readers can tell cheaply whether it changed
+    journey_updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     
     # Relationships
     messages = relationship("Message", back_populates="member")
     health_events = relationship("HealthEvent", back_populates="member")
     journey_states = relationship("JourneyState", back_populates="member")
+    
+    __table_args__ = (
+        Index("idx_members_created_at_id", "created_at", "id"),
+        Index("idx_members_journey_updated_at", "journey_updated_at"),
+    )
 
 
 class Agent(Base):
     __tablename__ = "agents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     role = Column(String(255), nullable=False)
     specialty = Column(String(255), nullable=True)
@@ -41,29 +61,63 @@ class Agent(Base):
 class Message(Base):
     __tablename__ = "messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False)
-    agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=False)
+    agent_id = Column(GUID(), ForeignKey("agents.id"), nullable=False)
     content = Column(Text, nullable=False)
     message_type = Column(String(50), nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     context_data = Column(JSON, nullable=True)
+    # Journey position, also kept in context_data for API compatibility
+    journey_month = Column(Integer, nullable=False, default=1)
+    journey_day = Column(Integer, nullable=False, default=1)
     
     # Relationships
     member = relationship("Member", back_populates="messages")
     agent = relationship("Agent", back_populates="messages")
+    
+    __table_args__ = (
+        Index("idx_messages_timestamp_id", "timestamp", "id"),
+        # Hot per-member path; INCLUDE lets timeline ranking and rollup rebuilds
+        # run as index-only scans on Postgres
+        Index(
+            "idx_messages_member_timestamp_covering", "member_id", "timestamp", "id",
+            postgresql_include=["agent_id", "message_type", "journey_month", "journey_day"]
+        ),
+        Index("idx_messages_member_month_day", "member_id", "journey_month", "journey_day"),
+    )
+
+
+# Full-text search vector for messages on Postgres. It is a generated column,
+# so the database keeps it in sync with content on every write; other
+# databases use the in-process index in app.services.message_search instead.
+event.listen(
+    Message.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED"
+    ).execute_if(dialect="postgresql")
+)
+event.listen(
+    Message.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS idx_messages_search_vector ON messages USING GIN (search_vector)"
+    ).execute_if(dialect="postgresql")
+)
 
 
 class HealthEvent(Base):
     __tablename__ = "health_events"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=False)
     event_type = Column(String(255), nullable=False)
     event_date = Column(Date, nullable=False)
     description = Column(Text, nullable=True)
     results = Column(JSON, nullable=True)
-    related_agents = Column(ARRAY(UUID), nullable=True)
+    related_agents = Column(ARRAY(UUID).with_variant(JSON, "sqlite"), nullable=True)
     
     # Relationships
     member = relationship("Member", back_populates="health_events")
@@ -72,8 +126,8 @@ class HealthEvent(Base):
 class JourneyState(Base):
     __tablename__ = "journey_state"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=False)
     month = Column(Integer, nullable=False)
     biomarkers = Column(JSON, nullable=True)
     current_interventions = Column(JSON, nullable=True)
@@ -81,4 +135,77 @@ class JourneyState(Base):
     updated_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    member = relationship("Member", back_populates="journey_states")
\ No newline at end of file
+    member = relationship("Member", back_populates="journey_states")
+
+class MessageRollup(Base):
+    __tablename__ = "message_rollups"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=False)
+    agent_id = Column(GUID(), ForeignKey("agents.id"), nullable=False)
+    month = Column(Integer, nullable=False)
+    message_type = Column(String(50), nullable=False)
+    message_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("idx_message_rollups_bucket", "member_id", "agent_id", "month", "message_type", unique=True),
+        Index("idx_message_rollups_agent_id", "agent_id"),
+    )
+
+
+class JourneyImport(Base):
+    __tablename__ = "journey_imports"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    content_hash = Column(String(64), nullable=False)
+    source = Column(Text, nullable=True)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=False)
+    message_count = Column(Integer, nullable=False, default=0)
+    imported_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("idx_journey_imports_content_hash", "content_hash", unique=True),
+    )
+
+
+class GenerationRun(Base):
+    __tablename__ = "generation_runs"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    # Set once the journey is saved; failed runs have no member
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=True)
+    generator = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index("idx_generation_runs_member_id", "member_id"),
+    )
+
+
+class LlmCall(Base):
+    __tablename__ = "llm_calls"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    run_id = Column(GUID(), ForeignKey("generation_runs.id"), nullable=False)
+    member_id = Column(GUID(), ForeignKey("members.id"), nullable=True)
+    agent_name = Column(String(100), nullable=False)
+    model = Column(String(100), nullable=False)
+    message_type = Column(String(50), nullable=True)
+    journey_month = Column(Integer, nullable=True)
+    journey_day = Column(Integer, nullable=True)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    latency_ms = Column(Float, nullable=False)
+    # Priced when the call is made; NULL for models without a known price
+    cost_usd = Column(Float, nullable=True)
+    error = Column(String(100), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("idx_llm_calls_member_id", "member_id"),
+        Index("idx_llm_calls_run_id", "run_id"),
+        Index("idx_llm_calls_agent_model", "agent_name", "model"),
+    )
@@ -0,0 +1,115 @@
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+# Columns copied between layouts; search_vector is generated and recomputed on insert
+MESSAGE_COLUMNS = (
+    "id", "member_id", "agent_id", "content", "message_type", "timestamp",
+    "context_data", "journey_month", "journey_day"
+)
+
+# Secondary indexes for a messages table, shared by the plain and partitioned
+# layouts. On a partitioned parent each one cascades to every partition.
+MESSAGE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_messages_agent_id ON {table} (agent_id)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_type ON {table} (message_type)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_timestamp_id ON {table} (timestamp, id)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_member_timestamp_covering ON {table} (member_id, timestamp, id) "
+    "INCLUDE (agent_id, message_type, journey_month, journey_day)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_member_month_day ON {table} (member_id, journey_month, journey_day)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_search_vector ON {table} USING GIN (search_vector)",
+)
+
+
+def message_table_ddl(table: str, partitions: int = 0, foreign_keys: bool = True) -> List[str]:
+    """
+    DDL for a messages table, hash-partitioned by member_id when partitions > 0.
+
+    Postgres requires the partition key in every unique constraint, so a
+    partitioned table's primary key is (id, member_id); ids are UUIDs, so
+    this does not weaken uniqueness in practice. Index names are prefixed
+    with the table name when it is not "messages", so layouts can coexist.
+    """
+    primary_key = "PRIMARY KEY (id, member_id)" if partitions else "PRIMARY KEY (id)"
+    references = (
+        ("member_id UUID NOT NULL REFERENCES members(id) ON DELETE CASCADE", "agent_id UUID NOT NULL REFERENCES agents(id) ON DELETE CASCADE")
+        if foreign_keys else ("member_id UUID NOT NULL", "agent_id UUID NOT NULL")
+    )
+    statements = [
+        f"""CREATE TABLE {table} (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    {references[0]},
+    {references[1]},
+    content TEXT NOT NULL,
+    message_type VARCHAR(50),
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    context_data JSONB,
+    journey_month INTEGER NOT NULL DEFAULT 1,
+    journey_day INTEGER NOT NULL DEFAULT 1,
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED,
+    {primary_key}
+){f" PARTITION BY HASH (member_id)" if partitions else ""}"""
+    ]
+    for remainder in range(partitions):
+        statements.append(
+            f"CREATE TABLE {table}_p{remainder:02d} PARTITION OF {table} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    for index in MESSAGE_INDEXES:
+        statement = index.format(table=table)
+        if table != "messages":
+            statement = statement.replace("idx_messages_", f"idx_{table}_")
+        statements.append(statement)
+    return statements
+
+
+def is_partitioned(connection: Connection, table: str = "messages") -> bool:
+    """Whether table is a partitioned parent in the current schema"""
+    return bool(connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND c.relnamespace = current_schema()::regnamespace"
+    ), {"table": table}).first())
+
+
+def partition_messages_statements(connection: Connection, partitions: int) -> List[str]:
+    """
+    Statements that swap messages for a hash-partitioned copy, in one transaction.
+
+    The copy is built as messages_partitioned while a SHARE lock holds off
+    writers; reads continue until the final renames, which need only a brief
+    exclusive lock. The old table is kept as messages_unpartitioned, with its
+    indexes and primary key suffixed, so the swap can be reversed.
+    """
+    staging = "messages_partitioned"
+    old_indexes = connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'messages' "
+        "AND indexname <> 'messages_pkey'"
+    )).scalars().all()
+    new_indexes = [statement.split()[5] for statement in MESSAGE_INDEXES]
+    columns = ", ".join(MESSAGE_COLUMNS)
+
+    statements = ["LOCK TABLE messages IN SHARE MODE"]
+    statements += message_table_ddl(staging, partitions)
+    statements.append(f"INSERT INTO {staging} ({columns}) SELECT {columns} FROM messages")
+
+    # Swap: retire the old table and its index names, then promote the copy
+    statements.append("ALTER TABLE messages RENAME TO messages_unpartitioned")
+    statements.append("ALTER TABLE messages_unpartitioned RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey")
+    statements += [f"ALTER INDEX {name} RENAME TO {name}_unpartitioned" for name in old_indexes]
+    statements.append(f"ALTER TABLE {staging} RENAME TO messages")
+    statements.append(f"ALTER TABLE messages RENAME CONSTRAINT {staging}_pkey TO messages_pkey")
+    statements += [
+        f"ALTER TABLE {staging}_p{remainder:02d} RENAME TO messages_p{remainder:02d}"
+        for remainder in range(partitions)
+    ]
+    statements += [
+        f"ALTER INDEX {name.replace('idx_messages_', f'idx_{staging}_')} RENAME TO {name}"
+        for name in new_indexes
+    ]
+    statements += [
+        "ALTER TABLE messages ENABLE ROW LEVEL SECURITY",
+        'CREATE POLICY "Allow all operations on messages" ON messages FOR ALL USING (true) WITH CHECK (true)',
+        "ANALYZE messages",
+    ]
+    return statements
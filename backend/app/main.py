@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.query_audit import QueryAuditMiddleware, QueryBudgetExceeded
+from app.core.tracing import TracingMiddleware
 from app.api.routes import health, journey, agents, messages
+from app.api.responses import ORJSONResponse
 from app.db.database import engine
 from app.db import models
 
@@ -11,7 +16,8 @@ models.Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Elyx Health Journey API",
     description="API for AI-powered health journey simulation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -23,16 +29,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency, in-flight and per-request query counts for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Per-request SQL accounting; added after metrics so it wraps the metrics middleware
+app.add_middleware(QueryAuditMiddleware)
+
+# Root span per request (no-op unless TRACING_EXPORTER is set)
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(health.router, prefix="/api/v1/health", tags=["health"])
 app.include_router(journey.router, prefix="/api/v1/journey", tags=["journey"])
 app.include_router(agents.router, prefix="/api/v1/agents", tags=["agents"])
 app.include_router(messages.router, prefix="/api/v1/messages", tags=["messages"])
 
+@app.exception_handler(QueryBudgetExceeded)
+async def query_budget_exceeded(request: Request, exc: QueryBudgetExceeded):
+    """Strict mode: fail the over-budget request with the budget and the statement that broke it"""
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": str(exc), "budget": exc.budget, "statement": exc.statement}
+    )
+
 @app.get("/")
 async def root():
     return {"message": "Elyx Health Journey API", "version": "1.0.0"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition of request, database, LLM and generation job metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     import uvicorn
     import os
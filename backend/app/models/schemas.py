@@ -88,11 +88,125 @@ class JourneyState(JourneyStateBase):
         from_attributes = True
 
 
+# Journey fields are optional because fields[...]= can leave any of them out
+class JourneyMember(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    age: Optional[int] = None
+    occupation: Optional[str] = None
+    location: Optional[str] = None
+    health_goals: Optional[List[str]] = None
+
+
+class JourneyMessage(BaseModel):
+    id: Optional[str] = None
+    agent_name: Optional[str] = None
+    agent_role: Optional[str] = None
+    content: Optional[str] = None
+    message_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    context_data: Optional[Dict[str, Any]] = None
+
+
+class JourneyHealthEvent(BaseModel):
+    id: Optional[str] = None
+    event_type: Optional[str] = None
+    event_date: Optional[date] = None
+    description: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+
+class JourneyStateSnapshot(BaseModel):
+    month: Optional[int] = None
+    biomarkers: Optional[Dict[str, Any]] = None
+    interventions: Optional[Any] = None
+    metrics: Optional[Dict[str, Any]] = None
+
+
+class MemberJourney(BaseModel):
+    member: JourneyMember
+    messages: Optional[List[JourneyMessage]] = None
+    health_events: Optional[List[JourneyHealthEvent]] = None
+    journey_states: Optional[List[JourneyStateSnapshot]] = None
+    next_cursor: Optional[str] = None
+
+
+class MemberBatchRequest(BaseModel):
+    member_ids: List[str] = Field(..., min_length=1)
+    sections: List[str] = Field(default_factory=lambda: ["journey", "timeline"])
+    include: Optional[str] = None
+    fields: Dict[str, str] = Field(default_factory=dict)
+    messages_per_month: Optional[int] = Field(None, ge=0, le=1000)
+
+
+class MemberBatchError(BaseModel):
+    status: int
+    detail: str
+
+
+class MemberBatchEntry(BaseModel):
+    journey: Optional[MemberJourney] = None
+    timeline: Optional["JourneyTimeline"] = None
+
+
+class MemberBatch(BaseModel):
+    members: Dict[str, MemberBatchEntry]
+    errors: Dict[str, MemberBatchError]
+    requested: int
+    returned: int
+
+
+class MemberSummary(BaseModel):
+    id: str
+    name: str
+    age: int
+    occupation: str
+    location: str
+    created_at: Optional[datetime] = None
+
+
+class MemberList(BaseModel):
+    members: List[MemberSummary]
+    next_cursor: Optional[str] = None
+
+
+class TimelineMessage(BaseModel):
+    agent_name: str
+    content: str
+    message_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    day: int
+
+
+class TimelineMonth(BaseModel):
+    month: int
+    messages: List[TimelineMessage]
+    total_messages: int
+    agent_activity: Dict[str, int]
+    message_types: Dict[str, int]
+
+
+class TimelineHealthEvent(BaseModel):
+    month: int
+    day: int
+    event_type: str
+    description: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+
+class BiomarkerSnapshot(BaseModel):
+    month: int
+    biomarkers: Optional[Dict[str, Any]] = None
+
+
 class JourneyTimeline(BaseModel):
     member_id: UUID
-    timeline: List[Dict[str, Any]]
-    health_events: List[Dict[str, Any]]
-    biomarker_progression: List[Dict[str, Any]]
+    timeline: List[TimelineMonth]
+    health_events: List[TimelineHealthEvent]
+    biomarker_progression: List[BiomarkerSnapshot]
+
+
+MemberBatchEntry.model_rebuild()
 
 
 class JourneyGeneration(BaseModel):
@@ -104,9 +218,144 @@ class JourneyGeneration(BaseModel):
     journey_summary: Dict[str, Any]
 
 
+class LlmUsage(BaseModel):
+    calls: int
+    errors: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: Optional[float] = None
+    avg_latency_ms: float
+    avg_prompt_tokens: float
+
+
+class LlmAgentUsage(LlmUsage):
+    agent_name: str
+    model: str
+
+
+class LlmMessageTypeUsage(LlmUsage):
+    message_type: Optional[str] = None
+
+
+class LlmMonthUsage(LlmUsage):
+    month: Optional[int] = None
+
+
+class LlmRunUsage(LlmUsage):
+    run_id: str
+    generator: str
+    status: str
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class MemberLlmUsage(BaseModel):
+    member_id: str
+    totals: LlmUsage
+    by_agent: List[LlmAgentUsage]
+    by_message_type: List[LlmMessageTypeUsage]
+    by_month: List[LlmMonthUsage]
+    runs: List[LlmRunUsage]
+
+
+class AgentLlmUsage(BaseModel):
+    totals: LlmUsage
+    journeys: int
+    agents: List[LlmAgentUsage]
+
+
+class AgentSummary(BaseModel):
+    id: str
+    name: str
+    role: str
+    specialty: Optional[str] = None
+
+
+class AgentPersona(BaseModel):
+    name: str
+    role: str
+    specialty: str
+    description: str
+
+
+class AgentPersonas(BaseModel):
+    agents: List[AgentPersona]
+    total_agents: int
+
+
+class AgentReference(BaseModel):
+    id: str
+    name: str
+    role: str
+
+
+class AgentMessage(BaseModel):
+    id: str
+    content: str
+    message_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    member_name: str
+    context: Optional[Dict[str, Any]] = None
+
+
+class AgentMessages(BaseModel):
+    agent: AgentReference
+    messages: List[AgentMessage]
+    total_messages: int
+
+
+class AgentStatistics(BaseModel):
+    total_messages: int
+    message_types: Dict[str, int]
+    monthly_activity: Dict[int, int]
+    average_messages_per_month: float
+
+
 class AgentStats(BaseModel):
-    agent: Dict[str, Any]
-    statistics: Dict[str, Any]
+    agent: AgentReference
+    statistics: AgentStatistics
+
+
+class MessageListItem(BaseModel):
+    id: str
+    member_name: str
+    agent_name: str
+    agent_role: str
+    content: str
+    message_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    context: Optional[Dict[str, Any]] = None
+
+
+class MessageList(BaseModel):
+    messages: List[MessageListItem]
+    total_returned: int
+    next_cursor: Optional[str] = None
+    filters_applied: Dict[str, Any]
+
+
+class MessageTypes(BaseModel):
+    message_types: List[str]
+    type_counts: Dict[str, int]
+    total_types: int
+
+
+class MessageSearchResult(BaseModel):
+    id: str
+    member_name: str
+    agent_name: str
+    content: str
+    snippet: str
+    rank: float
+    message_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    context: Optional[Dict[str, Any]] = None
+
+
+class MessageSearchResults(BaseModel):
+    search_query: str
+    results: List[MessageSearchResult]
+    total_results: int
 
 
 class MessageAnalytics(BaseModel):
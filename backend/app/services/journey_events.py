@@ -0,0 +1,270 @@
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import tuple_
+from app.agents.generated_message import GeneratedMessage
+from app.core.config import settings
+from app.db.database import read_session
+from app.db.models import Agent, HealthEvent, JourneyState, Member, Message
+
+
+class Subscription:
+    """One subscriber's queue of events for a member, fed from any thread"""
+
+    def __init__(self, member_id: str, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.member_id = member_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        # Runs on the subscriber's loop. A consumer that falls max_pending events
+        # behind is cut off with a None sentinel and must resume from its last id.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Next event, or None once the subscriber has fallen too far behind"""
+        return await self.queue.get()
+
+
+class _Channel:
+    def __init__(self, history_size: int):
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.subscribers: Set[Subscription] = set()
+        self.next_seq = 1
+
+
+class JourneyEventBroker:
+    """
+    In-process pub/sub fan-out of journey events, one channel per member.
+
+    Each channel keeps its last history_size events so a subscriber can resume
+    from the id of the last event it saw. publish() is thread-safe, since the
+    generators run in worker threads; delivery hops onto each subscriber's
+    event loop. Idle channels beyond max_channels are dropped oldest first.
+    Events only reach subscribers connected to the same process.
+    """
+
+    def __init__(self, history_size: int, max_pending: int, max_channels: int):
+        self.history_size = history_size
+        self.max_pending = max_pending
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _channel(self, member_id: str) -> _Channel:
+        # Caller holds the lock
+        channel = self._channels.get(member_id)
+        if channel is None:
+            channel = self._channels[member_id] = _Channel(self.history_size)
+            idle = [key for key, other in self._channels.items() if not other.subscribers and key != member_id]
+            for key in idle[:max(0, len(self._channels) - self.max_channels)]:
+                del self._channels[key]
+        self._channels.move_to_end(member_id)
+        return channel
+
+    def open(self, member_id: str) -> None:
+        """Create a member's channel ahead of its first event, e.g. for a reserved member id"""
+        with self._lock:
+            self._channel(str(member_id))
+
+    def has_channel(self, member_id: str) -> bool:
+        with self._lock:
+            return str(member_id) in self._channels
+
+    def publish(self, member_id: str, event_type: str, data: Dict[str, Any], event_id: Optional[str] = None) -> Dict[str, Any]:
+        """Record an event in the member's history and push it to every subscriber"""
+        member_id = str(member_id)
+        event = {
+            "id": event_id or str(uuid.uuid4()),
+            "type": event_type,
+            "member_id": member_id,
+            "data": data
+        }
+        with self._lock:
+            channel = self._channel(member_id)
+            event["seq"] = channel.next_seq
+            channel.next_seq += 1
+            channel.history.append(event)
+
+            # Scheduled under the lock so every subscriber sees events in seq order
+            for subscription in list(channel.subscribers):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+                except RuntimeError:
+                    # The subscriber's event loop has shut down
+                    channel.subscribers.discard(subscription)
+        return event
+
+    def subscribe(self, member_id: str, last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[Dict[str, Any]]]]:
+        """
+        Register a subscriber on the running event loop.
+
+        Returns the subscription and the backlog to send before live events:
+        the events after last_event_id, or the whole retained history when no
+        id is given. The backlog is None when last_event_id is no longer in
+        the history, in which case the caller must catch up from the database.
+        """
+        member_id = str(member_id)
+        subscription = Subscription(member_id, asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            channel = self._channel(member_id)
+            channel.subscribers.add(subscription)
+            history = list(channel.history)
+
+        if not last_event_id:
+            return subscription, history
+        for position in range(len(history) - 1, -1, -1):
+            if history[position]["id"] == last_event_id:
+                return subscription, history[position + 1:]
+        return subscription, None
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.member_id)
+            if channel:
+                channel.subscribers.discard(subscription)
+
+
+journey_events = JourneyEventBroker(
+    history_size=settings.JOURNEY_EVENT_HISTORY_SIZE,
+    max_pending=settings.JOURNEY_EVENT_MAX_PENDING,
+    max_channels=settings.JOURNEY_EVENT_MAX_CHANNELS
+)
+
+
+def message_payload(msg: GeneratedMessage, message_id: Optional[str] = None) -> Dict[str, Any]:
+    """Event data for a generated message, under message_id when it has no id of its own yet"""
+    return {
+        "id": message_id or msg.id,
+        "agent_name": msg.agent_name,
+        "agent_role": msg.agent_role,
+        "content": msg.content,
+        "message_type": msg.message_type,
+        "timestamp": msg.timestamp,
+        "day": msg.day,
+        "month": msg.month
+    }
+
+
+def health_event_payload(event: Any) -> Dict[str, Any]:
+    """Event data for a saved health event"""
+    return {
+        "id": str(event.id),
+        "event_type": event.event_type,
+        "event_date": event.event_date,
+        "description": event.description,
+        "results": event.results
+    }
+
+
+def journey_state_payload(state: Any) -> Dict[str, Any]:
+    """Event data for a saved journey state"""
+    return {
+        "id": str(state.id),
+        "month": state.month,
+        "biomarkers": state.biomarkers
+    }
+
+
+def resync_event(member_id: str) -> Dict[str, Any]:
+    """Frame telling a subscriber it has missed events it can't be sent, so it should reload the journey"""
+    return {"type": "resync", "member_id": str(member_id)}
+
+
+def publish_generated_messages(member_id: Optional[str], messages: List[GeneratedMessage]) -> None:
+    """
+    Give freshly generated messages their ids and push them to the member's subscribers.
+
+    The ids are kept when the journey is saved, so a client can resume from
+    a message it saw live. Does nothing when no member id was reserved.
+    """
+    if not member_id:
+        return
+    for msg in messages:
+        msg.id = str(uuid.uuid4())
+        journey_events.publish(member_id, "message", message_payload(msg), msg.id)
+
+
+def persisted_journey_events(member_id: str, after_message_id: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    A saved journey as events: messages in (timestamp, id) order, then every
+    health event and journey state.
+
+    Messages start after after_message_id when it is one of the member's
+    messages, otherwise from the beginning of the journey; health events and
+    journey states are always replayed, since clients de-duplicate by id.
+    Used to catch up a subscriber whose resume point has left the in-memory
+    history. While a journey is still being generated nothing is saved yet,
+    so the missed events can't be recovered and a single resync event is
+    yielded instead.
+    """
+    db = read_session(member_id)
+    try:
+        try:
+            saved = db.query(Member.id).filter(Member.id == uuid.UUID(member_id)).first() is not None
+        except ValueError:
+            saved = False
+        if not saved:
+            yield resync_event(member_id)
+            return
+
+        query = db.query(
+            Message.id, Agent.name, Agent.role, Message.content, Message.message_type,
+            Message.timestamp, Message.journey_day, Message.journey_month
+        ).join(Agent, Agent.id == Message.agent_id).filter(Message.member_id == member_id)
+
+        anchor = None
+        if after_message_id:
+            try:
+                anchor = db.query(Message.timestamp, Message.id).filter(
+                    Message.member_id == member_id, Message.id == uuid.UUID(after_message_id)
+                ).first()
+            except ValueError:
+                anchor = None
+        if anchor:
+            # Row-value comparison, so Postgres seeks the (member_id, timestamp, id) index
+            query = query.filter(tuple_(Message.timestamp, Message.id) > (anchor.timestamp, anchor.id))
+
+        for message_id, agent_name, agent_role, content, message_type, timestamp, day, month in (
+            query.order_by(Message.timestamp, Message.id).yield_per(batch_size)
+        ):
+            yield {
+                "id": str(message_id),
+                "type": "message",
+                "member_id": str(member_id),
+                "data": {
+                    "id": str(message_id),
+                    "agent_name": agent_name,
+                    "agent_role": agent_role,
+                    "content": content,
+                    "message_type": message_type,
+                    "timestamp": timestamp,
+                    "day": day,
+                    "month": month
+                }
+            }
+
+        health_events = db.query(
+            HealthEvent.id, HealthEvent.event_type, HealthEvent.event_date, HealthEvent.description, HealthEvent.results
+        ).filter(HealthEvent.member_id == member_id).order_by(HealthEvent.event_date)
+        for event in health_events:
+            yield {"id": str(event.id), "type": "health_event", "member_id": str(member_id), "data": health_event_payload(event)}
+
+        journey_states = db.query(
+            JourneyState.id, JourneyState.month, JourneyState.biomarkers
+        ).filter(JourneyState.member_id == member_id).order_by(JourneyState.month)
+        for state in journey_states:
+            yield {"id": str(state.id), "type": "journey_state", "member_id": str(member_id), "data": journey_state_payload(state)}
+    finally:
+        db.close()
@@ -1,10 +1,18 @@
-from typing import Dict, Any, List
-from datetime import datetime, date, timedelta
+from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
 import random
 import json
+import uuid
+from app.agents.generated_message import GeneratedMessage
 from app.agents.langgraph_orchestrator import LangGraphOrchestrator, HealthJourneyState
+from app.agents.simulation_clock import SimulationClock
 from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, replica_router
+from app.core.cache import invalidate_journey_caches
+from app.core.tracing import traced
+from app.services.message_rollups import apply_message_rollups
+from app.services.journey_import import member_fields
+from app.services.journey_events import journey_events, health_event_payload, journey_state_payload, message_payload, publish_generated_messages
 
 
 class HealthJourneyGenerator:
@@ -171,16 +179,22 @@ class HealthJourneyGenerator:
         
         return events
     
-    def generate_complete_journey(self) -> Dict[str, Any]:
-        """Generate the complete 8-month health journey for Rohan"""
+    @traced("generator.basic_journey")
+    def generate_complete_journey(self, member_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate the complete 8-month health journey for Rohan, streaming messages to member_id's subscribers if given"""
+        
+        # Each journey starts on day 1 of the simulated calendar
+        self.orchestrator.clock = SimulationClock()
         
         # Initialize member profile and biomarker progression
         member_profile = self.generate_rohan_profile()
         biomarker_progression = self.generate_biomarker_progression()
         health_events = self.generate_health_events()
         
-        # Initialize journey state
-        initial_state: HealthJourneyState = {
+        # Generate messages for 8 months (240 days). The state is updated in
+        # place day by day and shares one message list with the journey.
+        all_messages: List[GeneratedMessage] = []
+        current_state: HealthJourneyState = {
             "member_profile": member_profile,
             "current_month": 1,
             "current_day": 1,
@@ -189,15 +203,11 @@ class HealthJourneyGenerator:
                 "current_interventions": [],
                 "progress_metrics": {}
             },
-            "messages": [],
+            "messages": all_messages,
             "agents": self.orchestrator.agents,
             "context": {}
         }
         
-        # Generate messages for 8 months (240 days)
-        all_messages = []
-        current_state = initial_state.copy()
-        
         for month in range(1, 9):
             current_state["current_month"] = month
             current_state["journey_state"]["biomarkers"] = biomarker_progression[month]
@@ -218,21 +228,21 @@ class HealthJourneyGenerator:
                 for _ in range(messages_today):
                     try:
                         new_messages = self.orchestrator.generate_day_messages(current_state)
+                        publish_generated_messages(member_id, new_messages)
                         all_messages.extend(new_messages)
-                        current_state["messages"].extend(new_messages)
                     except Exception as e:
                         # If orchestrator fails, create a simple message
-                        fallback_message = {
-                            "agent_name": "Neel",
-                            "agent_role": "Relationship Manager",
-                            "content": f"Checking in on your progress - Month {month}, Day {day}",
-                            "message_type": "daily_check",
-                            "timestamp": datetime.now(),
-                            "day": current_day,
-                            "month": month
-                        }
+                        fallback_message = GeneratedMessage(
+                            agent_name="Neel",
+                            agent_role="Relationship Manager",
+                            content=f"Checking in on your progress - Month {month}, Day {day}",
+                            message_type="daily_check",
+                            timestamp=self.orchestrator.clock.timestamp(current_day, "Neel"),
+                            day=current_day,
+                            month=month
+                        )
+                        publish_generated_messages(member_id, [fallback_message])
                         all_messages.append(fallback_message)
-                        current_state["messages"].append(fallback_message)
         
         return {
             "member_profile": member_profile,
@@ -244,21 +254,23 @@ class HealthJourneyGenerator:
                 "duration_months": 8,
                 "total_days": 240,
                 "major_milestones": len([e for e in health_events if e["event_type"] in ["milestone", "quarterly_diagnostic"]]),
-                "agent_interactions": len(set([m["agent_name"] for m in all_messages]))
+                "agent_interactions": len(set([m.agent_name for m in all_messages]))
             }
         }
     
-    def save_journey_to_database(self, journey_data: Dict[str, Any]) -> str:
-        """Save the generated journey to the database"""
+    @traced("generator.persistence")
+    def save_journey_to_database(self, journey_data: Dict[str, Any], member_id: Optional[str] = None) -> str:
+        """
+        Save the generated journey to the database, under member_id if one was reserved.
+
+        Takes either generator's output: the realistic generator's profile
+        shape, its quarterly_diagnostics and its messages from the member.
+        """
         try:
             # Create member record
-            member = Member(
-                name=journey_data["member_profile"]["name"],
-                age=journey_data["member_profile"]["age"],
-                occupation=journey_data["member_profile"]["occupation"],
-                location=journey_data["member_profile"]["location"],
-                health_goals=journey_data["member_profile"]["health_goals"]
-            )
+            member = Member(**member_fields(journey_data["member_profile"]))
+            if member_id:
+                member.id = uuid.UUID(member_id)
             self.db.add(member)
             self.db.flush()  # Get member ID
             
@@ -276,34 +288,56 @@ class HealthJourneyGenerator:
                 agent_ids[agent_name] = agent.id
             
             # Create message records
+            messages = []
             for msg in journey_data["messages"]:
+                if msg.agent_name not in agent_ids:
+                    # Senders outside the team, e.g. the member in realistic journeys
+                    agent = Agent(name=msg.agent_name, role=msg.agent_role, specialty="")
+                    self.db.add(agent)
+                    self.db.flush()
+                    agent_ids[msg.agent_name] = agent.id
+                context_data = {
+                    "day": msg.day,
+                    "month": msg.month,
+                    "agent_role": msg.agent_role
+                }
+                if msg.extra and msg.extra.get("is_member_initiated"):
+                    context_data["is_member_initiated"] = True
                 message = Message(
                     member_id=member.id,
-                    agent_id=agent_ids[msg["agent_name"]],
-                    content=msg["content"],
-                    message_type=msg["message_type"],
-                    timestamp=msg["timestamp"],
-                    context_data={
-                        "day": msg["day"],
-                        "month": msg["month"],
-                        "agent_role": msg["agent_role"]
-                    }
+                    agent_id=agent_ids[msg.agent_name],
+                    content=msg.content,
+                    message_type=msg.message_type,
+                    timestamp=msg.timestamp,
+                    context_data=context_data,
+                    journey_month=msg.month,
+                    journey_day=msg.day
                 )
+                # Messages streamed during generation keep the ids subscribers already saw
+                if msg.id:
+                    message.id = uuid.UUID(msg.id)
                 self.db.add(message)
+                messages.append(message)
+            
+            # Keep the monthly analytics rollups in step with the new messages
+            apply_message_rollups(self.db, messages)
             
             # Create health event records
-            for event in journey_data["health_events"]:
+            health_events = []
+            for event in journey_data.get("health_events", journey_data.get("quarterly_diagnostics", [])):
                 health_event = HealthEvent(
                     member_id=member.id,
                     event_type=event["event_type"],
                     event_date=date(2024, event["month"], event["day"]),
                     description=event["description"],
                     results=event["results"],
-                    related_agents=[agent_ids[name] for name in event["related_agents"] if name in agent_ids]
+                    related_agents=[agent_ids[name] for name in event.get("related_agents", []) if name in agent_ids]
                 )
                 self.db.add(health_event)
+                health_events.append(health_event)
             
             # Create journey state records for each month
+            journey_states = []
             for month, biomarkers in journey_data["biomarker_progression"].items():
                 journey_state = JourneyState(
                     member_id=member.id,
@@ -313,12 +347,47 @@ class HealthJourneyGenerator:
                     progress_metrics={}
                 )
                 self.db.add(journey_state)
+                journey_states.append(journey_state)
+            
+            # Capture live events before commit expires the instances
+            self.db.flush()
+            saved_events = self._saved_journey_events(journey_data["messages"], messages, health_events, journey_states)
             
             self.db.commit()
-            return str(member.id)
+            saved_member_id = str(member.id)
+            invalidate_journey_caches(saved_member_id)
+            replica_router.mark_written(saved_member_id)
+            
+            for event_type, data in saved_events:
+                journey_events.publish(saved_member_id, event_type, data, data["id"])
+            journey_events.publish(saved_member_id, "journey_complete", {
+                "member_id": saved_member_id,
+                "total_messages": len(messages),
+                "health_events": len(health_events),
+                "journey_states": len(journey_states)
+            })
+            return saved_member_id
             
         except Exception as e:
             self.db.rollback()
             raise e
         finally:
-            self.db.close()
\ No newline at end of file
+            self.db.close()
+    
+    def _saved_journey_events(
+        self,
+        generated_messages: List[GeneratedMessage],
+        messages: List[Message],
+        health_events: List[HealthEvent],
+        journey_states: List[JourneyState]
+    ) -> List[tuple]:
+        """Events for a saved journey; messages already streamed during generation are skipped"""
+        events = []
+        for msg, message in zip(generated_messages, messages):
+            if not msg.id:
+                events.append(("message", message_payload(msg, str(message.id))))
+        for health_event in health_events:
+            events.append(("health_event", health_event_payload(health_event)))
+        for journey_state in journey_states:
+            events.append(("journey_state", journey_state_payload(journey_state)))
+        return events
\ No newline at end of file
@@ -0,0 +1,445 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+import hashlib
+import json
+import os
+import threading
+import uuid
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.agents.simulation_clock import SimulationClock
+from app.db.database import SessionLocal
+from app.db.models import Member, Agent, Message, HealthEvent, JourneyState, JourneyImport
+from app.services.message_rollups import rebuild_message_rollups
+
+
+# Top-level arrays of a JSON backup that are read one element at a time
+# rather than decoded whole. Only messages is imported; the rest are
+# generator working data that is skipped without being held in memory.
+STREAMED_SECTIONS = ("messages", "member_conversations", "plan_adherence_events", "exercise_progressions")
+
+# Message senders that are the member rather than an Elyx agent
+MEMBER_AGENT_NAME = "Member"
+MEMBER_SENDER_ALIASES = ("Rohan", MEMBER_AGENT_NAME)
+
+BACKUP_EXTENSIONS = (".json", ".jsonl")
+
+# Guards creation of the shared Member agent across parallel import workers
+_agent_lock = threading.Lock()
+
+
+class _JsonStream:
+    """Incremental JSON tokenizer over a text file, decoding one value at a time"""
+
+    def __init__(self, handle, chunk_size: int = 1 << 16):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed journey backup: expected '{char}', found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more of the file as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value that runs to the end of the buffer (e.g. a number) may be truncated
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"Malformed journey backup: {e}")
+            self._fill()
+
+
+def iter_backup_sections(handle) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream (key, value) pairs from a JSON journey backup.
+
+    Arrays listed in STREAMED_SECTIONS yield one pair per element, so a
+    backup with any number of messages is parsed in bounded memory; every
+    other top-level key yields its decoded value once.
+    """
+    stream = _JsonStream(handle)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in STREAMED_SECTIONS and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield key, stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                        continue
+                    stream.expect("]")
+                    break
+        else:
+            yield key, stream.value()
+
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("}")
+        return
+
+
+def iter_jsonl_sections(handle) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream (key, value) pairs from a JSONL journey backup.
+
+    Accepts the record_type lines written by GET /journey/members/{id}/export
+    (member, message, health_event, journey_state), one record per line.
+    """
+    for line_number, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Malformed journey backup: line {line_number}: {e}")
+        yield record.get("record_type"), record
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 of a backup file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value if isinstance(value, datetime) else None
+
+
+def member_fields(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Member columns from either backup profile shape (realistic generator, basic generator or export)"""
+    goals = profile.get("top_health_goals") or profile.get("health_goals") or []
+    return {
+        "name": profile.get("preferred_name") or profile["name"],
+        "age": profile["age"],
+        "occupation": profile["occupation"],
+        "location": profile.get("primary_residence") or profile["location"],
+        "health_goals": [goal["goal"] if isinstance(goal, dict) else goal for goal in goals]
+    }
+
+
+class AgentResolver:
+    """Maps sender names in a backup to agent IDs, creating any agent the database lacks"""
+
+    def __init__(self, db: Session, session_factory: Callable[[], Session]):
+        self.db = db
+        self.session_factory = session_factory
+        self.agent_ids: Dict[str, Any] = {}
+        self.member_name: Optional[str] = None
+
+    def prepare(self) -> None:
+        """Load existing agents and make sure the shared Member agent exists, before any writes"""
+        for agent_id, name in self.db.query(Agent.id, Agent.name).order_by(Agent.name):
+            self.agent_ids.setdefault(name, agent_id)
+        if MEMBER_AGENT_NAME not in self.agent_ids:
+            self.agent_ids[MEMBER_AGENT_NAME] = self._create_member_agent()
+
+    def _create_member_agent(self) -> Any:
+        # Committed on its own, under a lock, so parallel workers share one Member agent
+        with _agent_lock:
+            db = self.session_factory()
+            try:
+                existing = db.query(Agent.id).filter(Agent.name == MEMBER_AGENT_NAME).first()
+                if existing:
+                    return existing[0]
+                agent = Agent(
+                    name=MEMBER_AGENT_NAME,
+                    role="Health Journey Member",
+                    specialty="Member Questions & Conversations",
+                    persona_prompt="I am the member on this health journey, asking questions and sharing updates."
+                )
+                db.add(agent)
+                db.commit()
+                return agent.id
+            finally:
+                db.close()
+
+    def resolve(self, name: Optional[str], role: Optional[str] = None) -> Any:
+        if not name or name in MEMBER_SENDER_ALIASES or name == self.member_name:
+            name = MEMBER_AGENT_NAME
+        if name not in self.agent_ids:
+            # Agents outside the standard team are created with the journey itself
+            agent = Agent(name=name, role=role or "Imported Agent", specialty="")
+            self.db.add(agent)
+            self.db.flush()
+            self.agent_ids[name] = agent.id
+        return self.agent_ids[name]
+
+
+class _JourneyWriter:
+    """Buffers one journey's rows and writes them with bulk inserts"""
+
+    def __init__(self, db: Session, agents: AgentResolver, batch_size: int):
+        self.db = db
+        self.agents = agents
+        self.batch_size = batch_size
+        self.member_id = uuid.uuid4()
+        self.member_written = False
+        # Stamps messages a backup left without a timestamp, from their journey day
+        self.clock = SimulationClock()
+        self.pending_messages: List[Dict[str, Any]] = []
+        # Health events and journey states are small; written once at the end
+        self.pending_rows: List[Tuple[Any, List[Dict[str, Any]]]] = []
+        self.message_count = 0
+        self.health_event_count = 0
+        self.journey_state_count = 0
+
+    def write_member(self, profile: Dict[str, Any]) -> None:
+        if self.member_written:
+            raise ValueError("Malformed journey backup: more than one member profile")
+        fields = member_fields(profile)
+        self.agents.member_name = fields["name"]
+        self.db.bulk_insert_mappings(Member, [{"id": self.member_id, **fields}])
+        self.member_written = True
+        self._flush_messages()
+
+    def add_message(self, msg: Dict[str, Any]) -> None:
+        agent_name = msg.get("agent_name")
+        context_data = msg.get("context_data")
+        if context_data is None:
+            context_data = {
+                "day": msg.get("day", 1),
+                "month": msg.get("month", 1),
+                "is_member_initiated": msg.get("is_member_initiated", False),
+                "sender": agent_name
+            }
+            if msg.get("agent_role"):
+                context_data["agent_role"] = msg["agent_role"]
+
+        self.pending_messages.append({
+            "id": uuid.uuid4(),
+            "member_id": self.member_id,
+            "agent_id": self.agents.resolve(agent_name, msg.get("agent_role")),
+            "content": msg.get("content", ""),
+            "message_type": msg.get("message_type", "general"),
+            "timestamp": _parse_timestamp(msg.get("timestamp")) or self.clock.timestamp(
+                context_data.get("day", 1), agent_name or MEMBER_AGENT_NAME
+            ),
+            "context_data": context_data,
+            "journey_month": context_data.get("month", 1),
+            "journey_day": context_data.get("day", 1)
+        })
+        # Messages can precede the profile in a backup; hold them until the member row exists
+        if self.member_written and len(self.pending_messages) >= self.batch_size:
+            self._flush_messages()
+
+    def _flush_messages(self) -> None:
+        if self.pending_messages:
+            self.db.bulk_insert_mappings(Message, self.pending_messages)
+            self.message_count += len(self.pending_messages)
+            self.pending_messages = []
+
+    def add_health_events(self, events: List[Dict[str, Any]]) -> None:
+        rows = []
+        for event in events:
+            if event.get("event_date"):
+                event_date = date.fromisoformat(event["event_date"][:10])
+            else:
+                event_date = date(2024, event.get("month", 1), event.get("day", 15))
+            rows.append({
+                "id": uuid.uuid4(),
+                "member_id": self.member_id,
+                "event_type": event.get("event_type", "quarterly_diagnostic"),
+                "event_date": event_date,
+                "description": event.get("description", ""),
+                "results": event.get("results", {}),
+                "related_agents": [self.agents.resolve(name) for name in event.get("related_agents", [])]
+            })
+        self.pending_rows.append((HealthEvent, rows))
+        self.health_event_count += len(rows)
+
+    def add_journey_states(self, states: List[Tuple[int, Dict[str, Any], Any, Any]]) -> None:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "member_id": self.member_id,
+                "month": month,
+                "biomarkers": biomarkers,
+                "current_interventions": interventions,
+                "progress_metrics": metrics
+            } for month, biomarkers, interventions, metrics in states
+        ]
+        self.pending_rows.append((JourneyState, rows))
+        self.journey_state_count += len(rows)
+
+    def finish(self) -> None:
+        if not self.member_written:
+            raise ValueError("Malformed journey backup: no member profile")
+        self._flush_messages()
+        for model, rows in self.pending_rows:
+            if rows:
+                self.db.bulk_insert_mappings(model, rows)
+        rebuild_message_rollups(self.db, self.member_id)
+        # Stamp the journey as of the end of the import, not when its profile row was inserted
+        self.db.query(Member).filter(Member.id == self.member_id).update(
+            {"journey_updated_at": datetime.utcnow()}, synchronize_session=False
+        )
+
+
+def _load_json_backup(handle, writer: _JourneyWriter) -> None:
+    """Feed a JSON backup (as written by scripts/generate_realistic_journey.py) to the writer"""
+    for key, value in iter_backup_sections(handle):
+        if key == "member_profile":
+            writer.write_member(value)
+        elif key == "messages":
+            writer.add_message(value)
+        elif key in ("quarterly_diagnostics", "health_events"):
+            writer.add_health_events(value)
+        elif key == "biomarker_progression":
+            # JSON object keys are strings, so months come back as "1".."8"
+            writer.add_journey_states([
+                (int(month), biomarkers, {}, {"adherence_rate": biomarkers.get("adherence_this_month", "50%")})
+                for month, biomarkers in value.items()
+            ])
+
+
+def _load_jsonl_backup(handle, writer: _JourneyWriter) -> None:
+    """Feed a JSONL backup (as written by the NDJSON export endpoint) to the writer"""
+    events, states = [], []
+    for record_type, record in iter_jsonl_sections(handle):
+        if record_type == "member":
+            writer.write_member(record)
+        elif record_type == "message":
+            writer.add_message(record)
+        elif record_type == "health_event":
+            events.append(record)
+        elif record_type == "journey_state":
+            states.append((record["month"], record.get("biomarkers"), record.get("interventions"), record.get("metrics")))
+    writer.add_health_events(events)
+    writer.add_journey_states(states)
+
+
+def import_journey_file(
+    path: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    Import one journey backup (.json or .jsonl) into the database.
+
+    The file is streamed rather than loaded whole, and rows are written with
+    bulk inserts in a single transaction. Imports are keyed by the file's
+    SHA-256, so re-importing the same backup is a no-op. Returns a summary
+    dict with status "imported" or "skipped".
+    """
+    content_hash = file_content_hash(path)
+    result = {"path": path, "content_hash": content_hash, "member_id": None, "messages": 0}
+
+    db = session_factory()
+    try:
+        existing = db.query(JourneyImport).filter(JourneyImport.content_hash == content_hash).first()
+        if existing:
+            return {**result, "status": "skipped", "member_id": str(existing.member_id), "messages": existing.message_count}
+
+        agents = AgentResolver(db, session_factory)
+        agents.prepare()
+        writer = _JourneyWriter(db, agents, batch_size)
+        with open(path, "r", encoding="utf-8") as handle:
+            if path.endswith(".jsonl"):
+                _load_jsonl_backup(handle, writer)
+            else:
+                _load_json_backup(handle, writer)
+        writer.finish()
+
+        db.add(JourneyImport(
+            content_hash=content_hash,
+            source=os.path.basename(path),
+            member_id=writer.member_id,
+            message_count=writer.message_count
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker imported identical content first
+            db.rollback()
+            return {**result, "status": "skipped"}
+
+        return {
+            **result,
+            "status": "imported",
+            "member_id": str(writer.member_id),
+            "messages": writer.message_count,
+            "health_events": writer.health_event_count,
+            "journey_states": writer.journey_state_count
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def find_backup_files(directory: str) -> List[str]:
+    """Journey backups (.json / .jsonl) directly inside directory, in name order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(BACKUP_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def import_journey_directory(
+    directory: str,
+    workers: int = 4,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Import every backup in a directory, workers files at a time.
+
+    Each file is imported in its own session and transaction, so one bad
+    file is reported with status "failed" without affecting the others.
+    """
+    def import_one(path: str) -> Dict[str, Any]:
+        try:
+            return import_journey_file(path, session_factory, batch_size)
+        except Exception as e:
+            return {"path": path, "status": "failed", "error": str(e), "member_id": None, "messages": 0}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(import_one, find_backup_files(directory)))
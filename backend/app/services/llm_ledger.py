@@ -0,0 +1,221 @@
+import contextvars
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.db.models import GenerationRun, LlmCall
+
+logger = logging.getLogger(__name__)
+
+# USD per million (prompt, completion) tokens, from Groq's published on-demand pricing
+MODEL_PRICES_PER_MILLION = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Cost of one call in USD, or None for models without a known price"""
+    prices = MODEL_PRICES_PER_MILLION.get(model)
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class GenerationLedger:
+    """LLM calls made while generating one journey, kept in memory until the run is saved"""
+
+    def __init__(self, generator: str):
+        self.run_id = uuid.uuid4()
+        self.generator = generator
+        self.member_id: Optional[str] = None
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, call: Dict[str, Any]) -> None:
+        with self._lock:
+            self.calls.append(call)
+
+
+# Ledger of the generation running in this context; None outside generation runs
+_active_ledger: contextvars.ContextVar[Optional[GenerationLedger]] = contextvars.ContextVar("llm_ledger", default=None)
+
+
+def record_call(
+    agent_name: str,
+    model: str,
+    message_type: Optional[str],
+    context: Dict[str, Any],
+    latency_seconds: float,
+    usage: Any = None,
+    error: Optional[Exception] = None
+) -> None:
+    """Add an LLM call to the active generation run's ledger; calls outside a run are not recorded"""
+    ledger = _active_ledger.get()
+    if ledger is None:
+        return
+    prompt_tokens = (getattr(usage, "prompt_tokens", 0) or 0) if usage is not None else 0
+    completion_tokens = (getattr(usage, "completion_tokens", 0) or 0) if usage is not None else 0
+    ledger.add({
+        "id": uuid.uuid4(),
+        "run_id": ledger.run_id,
+        "agent_name": agent_name,
+        "model": model,
+        "message_type": message_type,
+        "journey_month": context.get("current_month"),
+        "journey_day": context.get("current_day"),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency_ms": latency_seconds * 1000,
+        "cost_usd": call_cost(model, prompt_tokens, completion_tokens),
+        "error": type(error).__name__ if error is not None else None,
+        "created_at": datetime.utcnow()
+    })
+
+
+def save_ledger(ledger: GenerationLedger) -> None:
+    """Write the run and its calls in one transaction"""
+    db = SessionLocal()
+    try:
+        db.add(GenerationRun(
+            id=ledger.run_id,
+            member_id=ledger.member_id,
+            generator=ledger.generator,
+            status=ledger.status,
+            started_at=ledger.started_at,
+            completed_at=datetime.utcnow()
+        ))
+        db.flush()
+        if ledger.calls:
+            db.bulk_insert_mappings(LlmCall, [dict(call, member_id=ledger.member_id) for call in ledger.calls])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@contextmanager
+def generation_run(generator: str) -> Iterator[GenerationLedger]:
+    """
+    Record every LLM call made in the block against one generation run.
+
+    Set ledger.member_id once the journey is saved. The ledger is written
+    when the block exits, whether or not generation succeeded; failing to
+    write it is logged rather than failing the generation.
+    """
+    ledger = GenerationLedger(generator)
+    token = _active_ledger.set(ledger)
+    try:
+        yield ledger
+        ledger.status = "succeeded"
+    except BaseException:
+        ledger.status = "failed"
+        raise
+    finally:
+        _active_ledger.reset(token)
+        try:
+            save_ledger(ledger)
+        except Exception as e:
+            logger.warning("Failed to save LLM ledger for run %s: %s", ledger.run_id, e)
+
+
+# Aggregates shared by every usage breakdown
+USAGE_COLUMNS = (
+    func.count(LlmCall.id).label("calls"),
+    func.count(LlmCall.error).label("errors"),
+    func.coalesce(func.sum(LlmCall.prompt_tokens), 0).label("prompt_tokens"),
+    func.coalesce(func.sum(LlmCall.completion_tokens), 0).label("completion_tokens"),
+    func.sum(LlmCall.cost_usd).label("cost_usd"),
+    func.coalesce(func.sum(LlmCall.latency_ms), 0).label("latency_ms")
+)
+
+
+def usage_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "calls": row.calls,
+        "errors": row.errors,
+        "prompt_tokens": int(row.prompt_tokens),
+        "completion_tokens": int(row.completion_tokens),
+        "cost_usd": round(row.cost_usd, 6) if row.cost_usd is not None else None,
+        "avg_latency_ms": round(row.latency_ms / row.calls, 1) if row.calls else 0.0,
+        "avg_prompt_tokens": round(row.prompt_tokens / row.calls, 1) if row.calls else 0.0
+    }
+
+
+def total_usage(rows: List[Any]) -> Dict[str, Any]:
+    """Usage summed over breakdown rows, so totals need no query of their own"""
+    costs = [row.cost_usd for row in rows if row.cost_usd is not None]
+    return usage_dict(SimpleNamespace(
+        calls=sum(row.calls for row in rows),
+        errors=sum(row.errors for row in rows),
+        prompt_tokens=sum(int(row.prompt_tokens) for row in rows),
+        completion_tokens=sum(int(row.completion_tokens) for row in rows),
+        cost_usd=sum(costs) if costs else None,
+        latency_ms=sum(row.latency_ms for row in rows)
+    ))
+
+
+def member_usage(db: Session, member_id: str) -> Dict[str, Any]:
+    """A member's journey spend by agent, message type, journey month and generation run"""
+    by_agent = db.query(LlmCall.agent_name, LlmCall.model, *USAGE_COLUMNS).filter(
+        LlmCall.member_id == member_id
+    ).group_by(LlmCall.agent_name, LlmCall.model).order_by(LlmCall.agent_name, LlmCall.model).all()
+
+    by_message_type = db.query(LlmCall.message_type, *USAGE_COLUMNS).filter(
+        LlmCall.member_id == member_id
+    ).group_by(LlmCall.message_type).order_by(LlmCall.message_type).all()
+
+    by_month = db.query(LlmCall.journey_month, *USAGE_COLUMNS).filter(
+        LlmCall.member_id == member_id
+    ).group_by(LlmCall.journey_month).order_by(LlmCall.journey_month).all()
+
+    runs = db.query(
+        GenerationRun.id, GenerationRun.generator, GenerationRun.status,
+        GenerationRun.started_at, GenerationRun.completed_at, *USAGE_COLUMNS
+    ).outerjoin(LlmCall, LlmCall.run_id == GenerationRun.id).filter(
+        GenerationRun.member_id == member_id
+    ).group_by(
+        GenerationRun.id, GenerationRun.generator, GenerationRun.status,
+        GenerationRun.started_at, GenerationRun.completed_at
+    ).order_by(GenerationRun.started_at).all()
+
+    return {
+        "member_id": member_id,
+        "totals": total_usage(by_agent),
+        "by_agent": [{"agent_name": row.agent_name, "model": row.model, **usage_dict(row)} for row in by_agent],
+        "by_message_type": [{"message_type": row.message_type, **usage_dict(row)} for row in by_message_type],
+        "by_month": [{"month": row.journey_month, **usage_dict(row)} for row in by_month],
+        "runs": [
+            {
+                "run_id": str(row.id),
+                "generator": row.generator,
+                "status": row.status,
+                "started_at": row.started_at,
+                "completed_at": row.completed_at,
+                **usage_dict(row)
+            } for row in runs
+        ]
+    }
+
+
+def agent_usage(db: Session) -> Dict[str, Any]:
+    """Spend per agent and model across every recorded generation run"""
+    rows = db.query(LlmCall.agent_name, LlmCall.model, *USAGE_COLUMNS).group_by(
+        LlmCall.agent_name, LlmCall.model
+    ).order_by(LlmCall.agent_name, LlmCall.model).all()
+    journeys = db.query(func.count(func.distinct(LlmCall.member_id))).scalar()
+    return {
+        "totals": total_usage(rows),
+        "journeys": journeys,
+        "agents": [{"agent_name": row.agent_name, "model": row.model, **usage_dict(row)} for row in rows]
+    }
@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, Optional, Tuple
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models import Message, MessageRollup
+
+
+def _bucket_key(message: Message) -> Tuple:
+    """Rollup bucket (member, agent, month, message_type) for a message"""
+    return (message.member_id, message.agent_id, message.journey_month, message.message_type or "general")
+
+
+def apply_message_rollups(db: Session, messages: Iterable[Message]) -> int:
+    """
+    Add a batch of newly written messages to the monthly rollups.
+
+    Runs inside the caller's session so the rollup rows commit or roll back
+    together with the messages themselves. Returns the number of buckets touched.
+    """
+    increments = Counter(_bucket_key(message) for message in messages)
+    if not increments:
+        return 0
+    
+    # Load the existing buckets for the affected members in one query
+    member_ids = {key[0] for key in increments}
+    existing: Dict[Tuple, MessageRollup] = {
+        (row.member_id, row.agent_id, row.month, row.message_type): row
+        for row in db.query(MessageRollup).filter(
+            MessageRollup.member_id.in_(member_ids)
+        ).with_for_update()
+    }
+    
+    for key, count in increments.items():
+        rollup = existing.get(key)
+        if rollup:
+            rollup.message_count += count
+            rollup.updated_at = datetime.utcnow()
+        else:
+            member_id, agent_id, month, message_type = key
+            db.add(MessageRollup(
+                member_id=member_id,
+                agent_id=agent_id,
+                month=month,
+                message_type=message_type,
+                message_count=count
+            ))
+    
+    return len(increments)
+
+
+def rebuild_message_rollups(db: Session, member_id: Optional[str] = None) -> int:
+    """
+    Recompute rollups from the messages table, for one member or for everyone.
+
+    Used to backfill journeys written before rollups existed, or to repair
+    drift. The caller is responsible for committing. Returns the number of
+    buckets written.
+    """
+    delete_query = db.query(MessageRollup)
+    if member_id:
+        delete_query = delete_query.filter(MessageRollup.member_id == member_id)
+    delete_query.delete(synchronize_session=False)
+    
+    month_column = Message.journey_month.label("month")
+    message_type = func.coalesce(Message.message_type, "general").label("message_type")
+    bucket_query = db.query(
+        Message.member_id,
+        Message.agent_id,
+        month_column,
+        message_type,
+        func.count(Message.id)
+    )
+    if member_id:
+        bucket_query = bucket_query.filter(Message.member_id == member_id)
+    buckets = bucket_query.group_by(Message.member_id, Message.agent_id, month_column, message_type).all()
+    
+    db.bulk_insert_mappings(MessageRollup, [
+        {
+            "member_id": bucket_member_id,
+            "agent_id": agent_id,
+            "month": month,
+            "message_type": bucket_type,
+            "message_count": count
+        } for bucket_member_id, agent_id, month, bucket_type, count in buckets
+    ])
+    
+    return len(buckets)
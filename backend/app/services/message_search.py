@@ -0,0 +1,221 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+import heapq
+import math
+import re
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session, joinedload
+from app.db.models import Member, Message
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "i", "if", "in", "is",
+    "it", "me", "my", "of", "on", "or", "so", "that", "the", "this", "to", "was", "we",
+    "with", "you", "your"
+}
+SNIPPET_RADIUS = 60
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# Journeys are stamped when their write starts and visible once it commits, so
+# a refresh also rechecks members stamped this long before the latest it has seen
+REFRESH_LOOKBACK = timedelta(minutes=5)
+
+# A search document is (message_id, content, member_id, agent_id, month)
+SearchDocument = Tuple[Any, str, Any, Any, int]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with common stop words removed"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def highlight_snippet(content: str, terms: Iterable[str]) -> str:
+    """Return a window of content around the first matching term, with matches wrapped in <mark>"""
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    first = pattern.search(content)
+    start = max(0, first.start() - SNIPPET_RADIUS) if first else 0
+    end = min(len(content), (first.end() if first else 0) + SNIPPET_RADIUS * 2)
+
+    snippet = pattern.sub(lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_STOP}", content[start:end])
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(content) else "")
+
+
+class InvertedIndex:
+    """
+    In-process BM25 inverted index over message content.
+
+    Used as the search backend on databases without Postgres full-text
+    search (SQLite, local development). It is built from the messages table
+    on first use and kept current from members.journey_updated_at, which
+    every journey write sets: each search looks up the members written since
+    the index last caught up, through that column's index, and indexes their
+    journeys. A member already in the index whose journey was rewritten
+    triggers a full rebuild.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, int]] = {}
+        self._documents: Dict[Any, Tuple[str, str, int, int]] = {}
+        self._total_length = 0
+        # journey_updated_at of every member whose journey is indexed
+        self._members: Dict[str, datetime] = {}
+        # Latest journey_updated_at the index has caught up to; None while no journey is indexed
+        self._caught_up_to: Optional[datetime] = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def _add(self, document: SearchDocument) -> None:
+        message_id, content, member_id, agent_id, month = document
+        if message_id in self._documents:
+            return
+        term_counts = Counter(tokenize(content))
+        length = sum(term_counts.values())
+        self._documents[message_id] = (str(member_id), str(agent_id), month, length)
+        self._total_length += length
+        for term, count in term_counts.items():
+            self._postings.setdefault(term, {})[message_id] = count
+
+    @staticmethod
+    def _message_documents(db: Session, member_ids: Optional[List[Any]] = None):
+        query = db.query(Message.id, Message.content, Message.member_id, Message.agent_id, Message.journey_month)
+        if member_ids is not None:
+            query = query.filter(Message.member_id.in_(member_ids))
+        return query.yield_per(10000)
+
+    def _rebuild(self, db: Session) -> None:
+        # Built aside and swapped in, so searches already running keep a consistent index
+        fresh = InvertedIndex()
+        fresh._members = {str(member_id): updated_at for member_id, updated_at in db.query(Member.id, Member.journey_updated_at)}
+        for row in self._message_documents(db):
+            fresh._add(tuple(row))
+        self._postings, self._documents, self._total_length = fresh._postings, fresh._documents, fresh._total_length
+        self._members = fresh._members
+        self._caught_up_to = max(self._members.values(), default=None)
+        self._built = True
+
+    def ensure_current(self, db: Session) -> None:
+        """Build the index on first use, then index journeys written since it last caught up"""
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._rebuild(db)
+            return
+
+        written = db.query(Member.id, Member.journey_updated_at)
+        if self._caught_up_to is not None:
+            written = written.filter(Member.journey_updated_at >= self._caught_up_to - REFRESH_LOOKBACK)
+        written = written.all()
+        if all(self._members.get(str(member_id)) == updated_at for member_id, updated_at in written):
+            return
+        with self._lock:
+            changed = [
+                (member_id, updated_at) for member_id, updated_at in written
+                if self._members.get(str(member_id)) != updated_at
+            ]
+            if not changed:
+                return
+            if any(str(member_id) in self._members for member_id, _ in changed):
+                self._rebuild(db)
+                return
+            for row in self._message_documents(db, [member_id for member_id, _ in changed]):
+                self._add(tuple(row))
+            for member_id, updated_at in changed:
+                self._members[str(member_id)] = updated_at
+            latest = max(updated_at for _, updated_at in changed)
+            self._caught_up_to = latest if self._caught_up_to is None else max(self._caught_up_to, latest)
+
+    def search(
+        self,
+        terms: List[str],
+        member_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        month: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Tuple[Any, float]]:
+        """Return (message_id, score) pairs ranked by BM25, best first"""
+        if not self._documents:
+            return []
+
+        document_count = len(self._documents)
+        average_length = self._total_length / document_count
+        scores: Dict[Any, float] = {}
+
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for message_id, frequency in postings.items():
+                doc_member_id, doc_agent_id, doc_month, length = self._documents[message_id]
+                if member_id and doc_member_id != member_id:
+                    continue
+                if agent_id and doc_agent_id != agent_id:
+                    continue
+                if month and doc_month != month:
+                    continue
+                norm = frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[message_id] = scores.get(message_id, 0.0) + idf * frequency * (self.k1 + 1) / norm
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+# Shared fallback index for this process
+message_index = InvertedIndex()
+
+
+def full_text_search(
+    db: Session,
+    query: str,
+    member_id: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    month: Optional[int] = None,
+    limit: int = 50
+) -> List[Tuple[Message, float, str]]:
+    """
+    Relevance-ranked message search returning (message, rank, snippet) tuples.
+
+    On Postgres this uses the GIN-indexed search_vector column with
+    ts_rank_cd and ts_headline; elsewhere it falls back to the in-process
+    inverted index.
+    """
+    base_query = db.query(Message).options(joinedload(Message.member), joinedload(Message.agent))
+    if member_id:
+        base_query = base_query.filter(Message.member_id == member_id)
+    if agent_id:
+        base_query = base_query.filter(Message.agent_id == agent_id)
+    if month:
+        base_query = base_query.filter(Message.journey_month == month)
+
+    if db.get_bind().dialect.name == "postgresql":
+        search_vector = literal_column("messages.search_vector")
+        ts_query = func.websearch_to_tsquery("english", query)
+        rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+        snippet = func.ts_headline(
+            "english", Message.content, ts_query,
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=35, MinWords=15"
+        ).label("snippet")
+        rows = base_query.add_columns(rank, snippet).filter(
+            search_vector.op("@@")(ts_query)
+        ).order_by(rank.desc(), Message.timestamp.desc()).limit(limit).all()
+        return [(message, float(rank_value), snippet_value) for message, rank_value, snippet_value in rows]
+
+    terms = tokenize(query)
+    if not terms:
+        return []
+    message_index.ensure_current(db)
+    ranked = message_index.search(terms, member_id=member_id, agent_id=agent_id, month=month, limit=limit)
+    if not ranked:
+        return []
+
+    messages = {message.id: message for message in base_query.filter(Message.id.in_([message_id for message_id, _ in ranked]))}
+    return [
+        (messages[message_id], score, highlight_snippet(messages[message_id].content, terms))
+        for message_id, score in ranked if message_id in messages
+    ]
@@ -0,0 +1,253 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import json
+from sqlalchemy.orm import Session
+from app.db.models import Agent, Message, HealthEvent, JourneyState
+
+
+# context_data keys written by the generators, flattened into their own columns, with their column types
+MESSAGE_CONTEXT_FIELDS = {"agent_role": "string", "is_member_initiated": "bool", "sender": "string"}
+
+# Biomarker keys produced by the journey generators, flattened into biomarker_* columns.
+# The generators record them with units ("75kg", "128/82", "7/10"), so they stay strings.
+BIOMARKER_FIELDS = (
+    "weight", "body_fat", "blood_pressure", "resting_heart_rate", "sleep_average",
+    "stress_level", "cholesterol_total", "hdl_cholesterol", "ldl_cholesterol",
+    "triglycerides", "glucose_fasting", "hba1c", "adherence_this_month"
+)
+
+EXPORT_TABLES = ("messages", "health_events", "journey_state")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow; install it with `pip install pyarrow`")
+    return pyarrow, pyarrow.parquet
+
+
+def _extra_json(data: Optional[Dict[str, Any]], known: Tuple[str, ...]) -> Optional[str]:
+    """Serialize keys not promoted to columns, so nothing is lost in flattening"""
+    if not data:
+        return None
+    extra = {key: value for key, value in data.items() if key not in known}
+    return json.dumps(extra, default=str) if extra else None
+
+
+def _context_value(value: Any, kind: str) -> Any:
+    """Coerce a context_data value to its column type; imported backups may hold booleans as strings"""
+    if value is None:
+        return None
+    if kind == "bool":
+        return value if isinstance(value, bool) else str(value).strip().lower() in ("true", "1", "yes")
+    return str(value)
+
+
+def _message_schema(pa):
+    column_types = {"string": pa.string(), "bool": pa.bool_()}
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("member_id", pa.string()),
+            ("agent_id", pa.string()),
+            ("agent_name", pa.string()),
+            ("message_type", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("content", pa.string()),
+            ("month", pa.int32()),
+            ("day", pa.int32()),
+        ]
+        + [(f"context_{field}", column_types[kind]) for field, kind in MESSAGE_CONTEXT_FIELDS.items()]
+        + [("context_extra", pa.string())]
+    )
+
+
+def _message_rows(db: Session, member_ids: Optional[List[str]], batch_size: int) -> Iterator[Dict[str, Any]]:
+    query = db.query(
+        Message.id, Message.member_id, Message.agent_id, Agent.name, Message.message_type,
+        Message.timestamp, Message.content, Message.journey_month, Message.journey_day, Message.context_data
+    ).join(Agent, Agent.id == Message.agent_id)
+    if member_ids:
+        query = query.filter(Message.member_id.in_(member_ids))
+
+    for message_id, member_id, agent_id, agent_name, message_type, timestamp, content, month, day, context in query.yield_per(batch_size):
+        context = context or {}
+        row = {
+            "id": str(message_id),
+            "member_id": str(member_id),
+            "agent_id": str(agent_id),
+            "agent_name": agent_name,
+            "message_type": message_type,
+            "timestamp": timestamp,
+            "content": content,
+            "month": month,
+            "day": day,
+            "context_extra": _extra_json(context, tuple(MESSAGE_CONTEXT_FIELDS) + ("day", "month")),
+        }
+        for field, kind in MESSAGE_CONTEXT_FIELDS.items():
+            row[f"context_{field}"] = _context_value(context.get(field), kind)
+        yield row
+
+
+def _health_event_schema(pa):
+    return pa.schema([
+        ("id", pa.string()),
+        ("member_id", pa.string()),
+        ("event_type", pa.string()),
+        ("event_date", pa.date32()),
+        ("description", pa.string()),
+        ("results", pa.string()),
+        ("month", pa.int32()),
+    ])
+
+
+def _health_event_rows(db: Session, member_ids: Optional[List[str]], batch_size: int) -> Iterator[Dict[str, Any]]:
+    query = db.query(
+        HealthEvent.id, HealthEvent.member_id, HealthEvent.event_type,
+        HealthEvent.event_date, HealthEvent.description, HealthEvent.results
+    )
+    if member_ids:
+        query = query.filter(HealthEvent.member_id.in_(member_ids))
+
+    for event_id, member_id, event_type, event_date, description, results in query.yield_per(batch_size):
+        yield {
+            "id": str(event_id),
+            "member_id": str(member_id),
+            "event_type": event_type,
+            "event_date": event_date,
+            "description": description,
+            "results": json.dumps(results, default=str) if results is not None else None,
+            "month": event_date.month,
+        }
+
+
+def _journey_state_schema(pa):
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("member_id", pa.string()),
+            ("month", pa.int32()),
+            ("updated_at", pa.timestamp("us")),
+        ]
+        + [(f"biomarker_{field}", pa.string()) for field in BIOMARKER_FIELDS]
+        + [
+            ("biomarkers_extra", pa.string()),
+            ("current_interventions", pa.string()),
+            ("progress_metrics", pa.string()),
+        ]
+    )
+
+
+def _journey_state_rows(db: Session, member_ids: Optional[List[str]], batch_size: int) -> Iterator[Dict[str, Any]]:
+    query = db.query(
+        JourneyState.id, JourneyState.member_id, JourneyState.month, JourneyState.updated_at,
+        JourneyState.biomarkers, JourneyState.current_interventions, JourneyState.progress_metrics
+    )
+    if member_ids:
+        query = query.filter(JourneyState.member_id.in_(member_ids))
+
+    for state_id, member_id, month, updated_at, biomarkers, interventions, metrics in query.yield_per(batch_size):
+        biomarkers = biomarkers or {}
+        row = {
+            "id": str(state_id),
+            "member_id": str(member_id),
+            "month": month,
+            "updated_at": updated_at,
+            "biomarkers_extra": _extra_json(biomarkers, BIOMARKER_FIELDS),
+            "current_interventions": json.dumps(interventions, default=str) if interventions is not None else None,
+            "progress_metrics": json.dumps(metrics, default=str) if metrics is not None else None,
+        }
+        for field in BIOMARKER_FIELDS:
+            value = biomarkers.get(field)
+            row[f"biomarker_{field}"] = None if value is None else str(value)
+        yield row
+
+
+_TABLE_SOURCES: Dict[str, Tuple[Callable, Callable]] = {
+    "messages": (_message_schema, _message_rows),
+    "health_events": (_health_event_schema, _health_event_rows),
+    "journey_state": (_journey_state_schema, _journey_state_rows),
+}
+
+
+def iter_record_batches(
+    db: Session,
+    table: str,
+    member_ids: Optional[List[str]] = None,
+    batch_size: int = 50_000
+):
+    """
+    Yield RecordBatches for one table, batch_size rows at a time.
+
+    Rows stream from a server-side cursor and are converted to columns one
+    batch at a time, so memory is bounded by batch_size rather than table size.
+    """
+    pa, _ = _require_pyarrow()
+    if table not in _TABLE_SOURCES:
+        raise ValueError(f"Unknown export table '{table}', expected one of {', '.join(EXPORT_TABLES)}")
+    schema_for, rows_for = _TABLE_SOURCES[table]
+    schema = schema_for(pa)
+
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+    count = 0
+    for row in rows_for(db, member_ids, batch_size):
+        for name in schema.names:
+            columns[name].append(row[name])
+        count += 1
+        if count >= batch_size:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {name: [] for name in schema.names}
+            count = 0
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_parquet_file(
+    db: Session,
+    table: str,
+    path: str,
+    member_ids: Optional[List[str]] = None,
+    batch_size: int = 50_000
+) -> int:
+    """Write one table to a single Parquet file, one row group per batch. Returns rows written."""
+    pa, pq = _require_pyarrow()
+    if table not in _TABLE_SOURCES:
+        raise ValueError(f"Unknown export table '{table}', expected one of {', '.join(EXPORT_TABLES)}")
+    schema_for, _ = _TABLE_SOURCES[table]
+    rows = 0
+    with pq.ParquetWriter(path, schema_for(pa), compression="zstd") as writer:
+        for batch in iter_record_batches(db, table, member_ids, batch_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_parquet_dataset(
+    db: Session,
+    output_dir: str,
+    tables: Tuple[str, ...] = EXPORT_TABLES,
+    member_ids: Optional[List[str]] = None,
+    batch_size: int = 50_000
+) -> Dict[str, int]:
+    """
+    Export tables into Hive-partitioned Parquet datasets under output_dir.
+
+    Each table is written to output_dir/<table>/month=<n>/ so analytics tools
+    can prune by journey month. Returns rows written per table.
+    """
+    pa, pq = _require_pyarrow()
+    written = {}
+    for table in tables:
+        rows = 0
+        for batch_index, batch in enumerate(iter_record_batches(db, table, member_ids, batch_size)):
+            pq.write_to_dataset(
+                pa.Table.from_batches([batch]),
+                root_path=f"{output_dir}/{table}",
+                partition_cols=["month"],
+                basename_template=f"part-{batch_index:05d}-{{i}}.parquet",
+                compression="zstd"
+            )
+            rows += batch.num_rows
+        written[table] = rows
+    return written
@@ -1,10 +1,17 @@
-from typing import Dict, Any, List, Tuple
-from datetime import datetime, date, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, timedelta
 import random
 import json
+from app.agents.generated_message import GeneratedMessage
 from app.agents.langgraph_orchestrator import LangGraphOrchestrator, HealthJourneyState
+from app.agents.simulation_clock import SimulationClock
 from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
 from app.db.database import SessionLocal
+from app.services.journey_events import publish_generated_messages
+from app.core.tracing import traced
+
+# Shared by every member question rather than a dict per message; to_dict() copies it
+MEMBER_INITIATED = {"is_member_initiated": True}
 
 
 class RealisticJourneyGenerator:
@@ -133,6 +140,7 @@ class RealisticJourneyGenerator:
         
         return calendar
     
+    @traced("generator.quarterly_diagnostics")
     def generate_quarterly_diagnostics(self) -> List[Dict[str, Any]]:
         """Generate comprehensive diagnostic tests every 3 months"""
         diagnostics = []
@@ -217,6 +225,7 @@ class RealisticJourneyGenerator:
         
         return diagnostics
     
+    @traced("generator.member_conversations")
     def generate_member_initiated_conversations(self) -> List[Dict[str, Any]]:
         """Generate realistic member-initiated conversations (5 per week average)"""
         conversations = []
@@ -288,6 +297,7 @@ class RealisticJourneyGenerator:
         
         return " ".join(words)
     
+    @traced("generator.plan_adherence")
     def generate_plan_adherence_events(self) -> List[Dict[str, Any]]:
         """Generate realistic plan adherence (~50%) with adjustments"""
         events = []
@@ -339,6 +349,7 @@ class RealisticJourneyGenerator:
         
         return plan_changes
     
+    @traced("generator.exercise_progression")
     def generate_exercise_progression(self) -> List[Dict[str, Any]]:
         """Generate exercise updates every 2 weeks based on progress"""
         progressions = []
@@ -392,8 +403,9 @@ class RealisticJourneyGenerator:
         
         return random.choice(rationales)
     
-    def generate_realistic_complete_journey(self) -> Dict[str, Any]:
-        """Generate complete journey with all realistic constraints"""
+    @traced("generator.realistic_journey")
+    def generate_realistic_complete_journey(self, member_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate complete journey with all realistic constraints, streaming messages to member_id's subscribers if given"""
         
         # Enhanced member profile
         member_profile = self.generate_rohan_profile_realistic()
@@ -420,6 +432,7 @@ class RealisticJourneyGenerator:
             plan_adherence,
             exercise_progressions
         )
+        publish_generated_messages(member_id, all_messages)
         
         return {
             "member_profile": member_profile,
@@ -443,6 +456,7 @@ class RealisticJourneyGenerator:
             }
         }
     
+    @traced("generator.biomarker_progression")
     def _generate_realistic_biomarker_progression(self) -> Dict[int, Dict[str, Any]]:
         """Generate realistic biomarker progression with setbacks and plateaus"""
         progression = {}
@@ -537,16 +551,18 @@ class RealisticJourneyGenerator:
         
         return progression
     
+    @traced("generator.realistic_messages")
     def _generate_realistic_messages(
         self,
         member_profile: Dict[str, Any],
         member_conversations: List[Dict[str, Any]], 
         plan_adherence: List[Dict[str, Any]],
         exercise_progressions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[GeneratedMessage]:
         """Generate messages incorporating all realistic constraints"""
         
         all_messages = []
+        clock = SimulationClock()
         
         # Use existing orchestrator but enhance with realistic elements
         for week in range(1, 33):  # 32 weeks = 8 months
@@ -555,44 +571,47 @@ class RealisticJourneyGenerator:
             # Add member-initiated conversations for this week
             week_conversations = [c for c in member_conversations if c["week"] == week]
             for conv in week_conversations:
-                all_messages.append({
-                    "agent_name": "Rohan",  # Member
-                    "agent_role": "Member",
-                    "content": conv["content"],
-                    "message_type": "member_question",
-                    "timestamp": datetime.now(),
-                    "day": (week - 1) * 7 + conv["day"],
-                    "month": month,
-                    "is_member_initiated": True
-                })
+                day = (week - 1) * 7 + conv["day"]
+                all_messages.append(GeneratedMessage(
+                    agent_name="Rohan",  # Member
+                    agent_role="Member",
+                    content=conv["content"],
+                    message_type="member_question",
+                    timestamp=clock.timestamp(day, "Rohan"),
+                    day=day,
+                    month=month,
+                    extra=MEMBER_INITIATED
+                ))
             
             # Add plan adherence adjustments
             week_adjustments = [p for p in plan_adherence if p["week"] == week]
             for adj in week_adjustments:
-                all_messages.append({
-                    "agent_name": "Neel",
-                    "agent_role": "Relationship Manager",
-                    "content": f"I notice {adj['issue']}. Let's try this adjustment: {adj['adjustment']}",
-                    "message_type": "plan_adjustment",
-                    "timestamp": datetime.now(),
-                    "day": (week - 1) * 7 + 3,
-                    "month": month,
-                    "adherence_change": {"before": adj["adherence_before"], "after": adj["adherence_after"]}
-                })
+                day = (week - 1) * 7 + 3
+                all_messages.append(GeneratedMessage(
+                    agent_name="Neel",
+                    agent_role="Relationship Manager",
+                    content=f"I notice {adj['issue']}. Let's try this adjustment: {adj['adjustment']}",
+                    message_type="plan_adjustment",
+                    timestamp=clock.timestamp(day, "Neel"),
+                    day=day,
+                    month=month,
+                    extra={"adherence_change": {"before": adj["adherence_before"], "after": adj["adherence_after"]}}
+                ))
             
             # Add exercise progressions every 2 weeks
             if week % 2 == 0:
                 week_progressions = [e for e in exercise_progressions if e["week"] == week]
                 for prog in week_progressions:
-                    all_messages.append({
-                        "agent_name": "Carla",
-                        "agent_role": "Fitness Coach",
-                        "content": f"Time for your bi-weekly update! {prog['rationale']}. New focus: {prog['changes']['focus']}",
-                        "message_type": "exercise_update",
-                        "timestamp": datetime.now(),
-                        "day": (week - 1) * 7 + 1,
-                        "month": month,
-                        "exercise_changes": prog["changes"]
-                    })
+                    day = (week - 1) * 7 + 1
+                    all_messages.append(GeneratedMessage(
+                        agent_name="Carla",
+                        agent_role="Fitness Coach",
+                        content=f"Time for your bi-weekly update! {prog['rationale']}. New focus: {prog['changes']['focus']}",
+                        message_type="exercise_update",
+                        timestamp=clock.timestamp(day, "Carla"),
+                        day=day,
+                        month=month,
+                        extra={"exercise_changes": prog["changes"]}
+                    ))
         
         return all_messages
\ No newline at end of file
@@ -6,7 +6,7 @@ Script to save realistic journey data to Supabase database
 import sys
 import os
 import json
-from datetime import datetime, date
+from datetime import date
 from uuid import uuid4
 
 # Add the backend directory to the Python path
@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 from app.db.database import SessionLocal
 from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
 from app.services.realistic_journey_generator import RealisticJourneyGenerator
+from app.services.message_rollups import apply_message_rollups
 
 def save_realistic_journey_to_db():
     """Generate realistic journey and save to database properly"""
@@ -66,15 +67,16 @@ def save_realistic_journey_to_db():
         
         # 3. Create message records
         messages = journey_data.get("messages", [])
+        message_records = []
         message_count = 0
         print(f"   - Processing {len(messages)} messages...")
         
         # Debug: check first few messages
         for i, msg in enumerate(messages[:3]):
-            print(f"   - Debug msg {i+1}: agent={msg.get('agent_name')}, month={msg.get('month', 'MISSING')}, day={msg.get('day', 'MISSING')}")
+            print(f"   - Debug msg {i+1}: agent={msg.agent_name}, month={msg.month}, day={msg.day}")
         
         for msg in messages:
-            agent_name = msg.get("agent_name", "Neel")
+            agent_name = msg.agent_name
             
             # All agents should now be in lookup (including Member for Rohan)
             if agent_name in agent_lookup:
@@ -83,18 +85,11 @@ def save_realistic_journey_to_db():
                 # Skip unknown agents
                 print(f"   - Skipping unknown agent: {agent_name}")
                 continue
-                
-            # Handle timestamp
-            timestamp = msg.get("timestamp")
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            elif not isinstance(timestamp, datetime):
-                timestamp = datetime.now()
             
             context_data = {
-                "day": msg.get("day", 1),
-                "month": msg.get("month", 1),
-                "is_member_initiated": msg.get("is_member_initiated", False),
+                "day": msg.day,
+                "month": msg.month,
+                "is_member_initiated": bool(msg.extra and msg.extra.get("is_member_initiated")),
                 "sender": agent_name  # Track who sent the message
             }
             
@@ -105,16 +100,23 @@ def save_realistic_journey_to_db():
             message = Message(
                 member_id=member.id,
                 agent_id=agent_id,
-                content=msg.get("content", ""),
-                message_type=msg.get("message_type", "general"),
-                timestamp=timestamp,
-                context_data=context_data
+                content=msg.content,
+                message_type=msg.message_type,
+                timestamp=msg.timestamp,
+                context_data=context_data,
+                journey_month=context_data["month"],
+                journey_day=context_data["day"]
             )
             db.add(message)
+            message_records.append(message)
             message_count += 1
         
         print(f"   - Created {message_count} messages")
         
+        # Update monthly analytics rollups in the same transaction
+        bucket_count = apply_message_rollups(db, message_records)
+        print(f"   - Updated {bucket_count} analytics rollup buckets")
+        
         # 4. Create health events (quarterly diagnostics)
         diagnostics = journey_data.get("quarterly_diagnostics", [])
         event_count = 0
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Backfill messages.journey_month / journey_day from context_data.
+Adds the columns and their (member_id, journey_month, journey_day) index if
+the database predates them, then fills them one member at a time. Run after
+upgrading an existing database, followed by rebuild_message_rollups.py.
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import func, inspect, text, update
+from app.db.database import SessionLocal, engine
+from app.db.models import Member, Message
+
+
+def ensure_columns():
+    """Add the journey position columns and index, and the journey write stamp, to an existing database"""
+    existing = {column["name"] for column in inspect(engine).get_columns("messages")}
+    with engine.begin() as connection:
+        for column in ("journey_month", "journey_day"):
+            if column not in existing:
+                connection.execute(text(f"ALTER TABLE messages ADD COLUMN {column} INTEGER NOT NULL DEFAULT 1"))
+                print(f"   - Added messages.{column}")
+        if "journey_updated_at" not in {column["name"] for column in inspect(engine).get_columns("members")}:
+            connection.execute(text("ALTER TABLE members ADD COLUMN journey_updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"))
+            print("   - Added members.journey_updated_at")
+    for index in Message.__table__.indexes:
+        if index.name == "idx_messages_member_month_day":
+            index.create(engine, checkfirst=True)
+
+
+def main():
+    """Backfill journey month/day for all members, or a single member"""
+    parser = argparse.ArgumentParser(description="Backfill messages.journey_month/journey_day from context_data")
+    parser.add_argument("--member-id", help="Only backfill this member's messages")
+    args = parser.parse_args()
+    
+    print("Backfilling journey month/day columns...")
+    
+    db = SessionLocal()
+    try:
+        ensure_columns()
+        
+        member_ids = [args.member_id] if args.member_id else [row[0] for row in db.query(Member.id)]
+        updated = 0
+        # One transaction per member keeps each UPDATE's row locks short
+        for member_id in member_ids:
+            result = db.execute(
+                update(Message).where(Message.member_id == member_id).values(
+                    journey_month=func.coalesce(Message.context_data["month"].as_integer(), 1),
+                    journey_day=func.coalesce(Message.context_data["day"].as_integer(), 1)
+                )
+            )
+            db.execute(update(Member).where(Member.id == member_id).values(journey_updated_at=datetime.utcnow()))
+            db.commit()
+            updated += result.rowcount
+        
+        print(f"SUCCESS Backfilled {updated} messages for {len(member_ids)} members")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR Failed to backfill journey columns: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
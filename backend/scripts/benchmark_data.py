@@ -0,0 +1,139 @@
+"""
+Dataset seeding and the fake LLM shared by the benchmark, profiling and
+load test scripts.
+Import only after DATABASE_URL points at the benchmark database, since the
+app's engine is created on first import.
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.db.database import engine
+from app.db import models
+from app.db.models import Member, Agent, Message, HealthEvent, JourneyState
+from app.agents.personas import AGENT_PERSONAS
+from app.services.message_rollups import rebuild_message_rollups
+
+MESSAGE_TYPES = [
+    "daily_medical_check", "weekly_review", "daily_nutrition", "weekly_meal_plan",
+    "daily_fitness", "mental_wellness", "coordination", "member_question"
+]
+VOCABULARY = [
+    "blood", "pressure", "sleep", "training", "protein", "stress", "travel", "glucose",
+    "cholesterol", "recovery", "hydration", "meditation", "zone2", "cardio", "fasting", "vitamin"
+]
+BATCH_SIZE = 10_000
+JOURNEY_START = datetime(2024, 1, 1)
+# Fake LLM completions are drawn from these
+WORDS = ("great", "progress", "sleep", "protein", "walk", "blood", "pressure", "hydrate", "stretch", "plan")
+
+
+class FakeLLM:
+    """
+    Stand-in for the Groq client with the same chat.completions.create shape.
+
+    Each call sleeps latency_ms plus ms_per_token per completion token,
+    varied by +/- jitter, and returns fresh strings as a decoded API response
+    would. on_call, if given, is called with the seconds waited and the
+    prompt and completion token counts. Patch it in with functools.partial,
+    e.g. base_agent.Groq = partial(FakeLLM, latency_ms=50).
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        rng=None,
+        latency_ms=0.0,
+        ms_per_token=0.0,
+        jitter=0.0,
+        completion_tokens=120,
+        on_call=None
+    ):
+        self.rng = rng or random.Random()
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.jitter = jitter
+        self.completion_tokens = completion_tokens
+        self.on_call = on_call
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        latency = (self.latency_ms + self.ms_per_token * self.completion_tokens) / 1000
+        latency *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+
+        waited = 0.0
+        if latency > 0:
+            started = time.perf_counter()
+            time.sleep(latency)
+            waited = time.perf_counter() - started
+        if self.on_call:
+            self.on_call(waited, prompt_tokens, self.completion_tokens)
+
+        content = " ".join(self.rng.choice(WORDS) for _ in range(max(1, self.completion_tokens * 3 // 4)))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=self.completion_tokens)
+        )
+
+
+def seed(db, members: int, messages: int, rng: random.Random):
+    """Insert members, agents, messages, health events and journey states in batches, then build rollups"""
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+    agent_ids = [uuid.uuid4() for _ in AGENT_PERSONAS]
+    db.bulk_insert_mappings(Agent, [
+        {"id": agent_id, "name": name, "role": config["role"], "specialty": config["specialty"]}
+        for agent_id, (name, config) in zip(agent_ids, AGENT_PERSONAS.items())
+    ])
+
+    member_ids = [uuid.uuid4() for _ in range(members)]
+    for offset in range(0, members, BATCH_SIZE):
+        chunk = member_ids[offset:offset + BATCH_SIZE]
+        db.bulk_insert_mappings(Member, [
+            {"id": member_id, "name": f"Member {offset + i}", "age": 30 + (offset + i) % 30,
+             "occupation": "Benchmark", "location": "Singapore", "health_goals": ["Lower blood pressure"]}
+            for i, member_id in enumerate(chunk)
+        ])
+        db.bulk_insert_mappings(HealthEvent, [
+            {"id": uuid.uuid4(), "member_id": member_id, "event_type": "quarterly_diagnostic",
+             "event_date": (JOURNEY_START + timedelta(days=90 * quarter - 1)).date(),
+             "description": f"Quarter {quarter} diagnostic", "results": {"blood_pressure": "128/82"}}
+            for member_id in chunk for quarter in (1, 2)
+        ])
+        db.bulk_insert_mappings(JourneyState, [
+            {"id": uuid.uuid4(), "member_id": member_id, "month": month,
+             "biomarkers": {"weight": 80 - month, "blood_pressure": f"{135 - month}/{88 - month}"},
+             "current_interventions": [], "progress_metrics": {}}
+            for member_id in chunk for month in range(1, 9)
+        ])
+        db.commit()
+    print(f"   - Seeded {members} members with health events and journey states")
+
+    for offset in range(0, messages, BATCH_SIZE):
+        batch = []
+        for _ in range(min(BATCH_SIZE, messages - offset)):
+            day = rng.randint(1, 240)
+            batch.append({
+                "id": uuid.uuid4(),
+                "member_id": rng.choice(member_ids),
+                "agent_id": rng.choice(agent_ids),
+                "content": " ".join(rng.choices(VOCABULARY, k=12)),
+                "message_type": rng.choice(MESSAGE_TYPES),
+                "timestamp": JOURNEY_START + timedelta(days=day - 1, seconds=rng.randrange(86400)),
+                "context_data": {"day": day, "month": (day - 1) // 30 + 1},
+                "journey_month": (day - 1) // 30 + 1,
+                "journey_day": day
+            })
+        db.bulk_insert_mappings(Message, batch)
+        db.commit()
+        if (offset + len(batch)) % 100_000 == 0 or offset + len(batch) == messages:
+            print(f"   - Seeded {offset + len(batch)}/{messages} messages")
+
+    bucket_count = rebuild_message_rollups(db)
+    db.commit()
+    print(f"   - Built {bucket_count} rollup buckets")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput of journey generation and persistence.
+Runs full journeys through HealthJourneyGenerator and RealisticJourneyGenerator
+against an in-process LLM stand-in with configurable latency, at several
+concurrency levels, and breaks wall time down into LLM wait, prompt building,
+graph overhead and persistence. Reports messages/sec, tokens/sec and peak RSS.
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark journey generation throughput with a fake LLM")
+    parser.add_argument("--database-url", default="sqlite:///generation_benchmark.db", help="Database journeys are saved to")
+    parser.add_argument("--generators", default="basic,realistic", help="Comma-separated generators to run: basic, realistic")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated numbers of journeys generated at once")
+    parser.add_argument("--journeys", type=int, default=0, help="Journeys per concurrency level (default: the concurrency level)")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="Fixed latency of each fake LLM call")
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="Extra fake LLM latency per completion token")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Random +/- fraction applied to each call's latency")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="Completion tokens per fake LLM call")
+    parser.add_argument("--skip-save", action="store_true", help="Generate only, without persisting journeys")
+    parser.add_argument("--output", default="generation_benchmark.json", help="JSON results file")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generation and fake latency")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Point the app at the benchmark database before any app module creates its engine
+os.environ["DATABASE_URL"] = args.database_url
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import engine
+from app.db import models
+from app.services.journey_generator import HealthJourneyGenerator
+from app.services.realistic_journey_generator import RealisticJourneyGenerator
+from scripts.benchmark_data import FakeLLM
+
+STAGES = ("setup", "llm_wait", "prompt_building", "graph_overhead", "journey_building", "persistence")
+
+
+def _timed(function, stats, key):
+    def wrapper(*call_args, **call_kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*call_args, **call_kwargs)
+        finally:
+            stats[key] += time.perf_counter() - started
+    return wrapper
+
+
+def instrument(orchestrator, stats, rng):
+    """Swap in the fake LLM and time agent calls and graph runs on this orchestrator's instances"""
+    def record_call(waited, prompt_tokens, completion_tokens):
+        stats["llm_wait"] += waited
+        stats["llm_calls"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+
+    for agent in orchestrator.agents.values():
+        agent.client = FakeLLM(
+            rng=rng,
+            latency_ms=args.llm_latency_ms,
+            ms_per_token=args.ms_per_token,
+            jitter=args.jitter,
+            completion_tokens=args.completion_tokens,
+            on_call=record_call
+        )
+        agent.generate_message = _timed(agent.generate_message, stats, "agent_total")
+    generate_day_messages = _timed(orchestrator.generate_day_messages, stats, "graph_total")
+
+    def counted(state):
+        try:
+            return generate_day_messages(state)
+        except Exception:
+            stats["graph_errors"] += 1
+            raise
+    orchestrator.generate_day_messages = counted
+
+
+def run_journey(kind, seed):
+    """Generate (and save) one journey, returning its timing breakdown"""
+    stats = dict.fromkeys(
+        ("setup", "llm_wait", "agent_total", "graph_total", "generation", "persistence", "wall"), 0.0
+    )
+    stats.update(llm_calls=0, prompt_tokens=0, completion_tokens=0, graph_errors=0, messages=0, save_error=None)
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    saver = HealthJourneyGenerator()
+    instrument(saver.orchestrator, stats, rng)
+    generator = saver
+    if kind == "realistic":
+        generator = RealisticJourneyGenerator()
+        instrument(generator.orchestrator, stats, rng)
+    stats["setup"] = time.perf_counter() - started
+    
+    generation_started = time.perf_counter()
+    if kind == "basic":
+        journey_data = generator.generate_complete_journey()
+    else:
+        journey_data = generator.generate_realistic_complete_journey()
+    stats["generation"] = time.perf_counter() - generation_started
+    stats["messages"] = len(journey_data["messages"])
+
+    if not args.skip_save:
+        save_started = time.perf_counter()
+        try:
+            saver.save_journey_to_database(journey_data)
+        except Exception as e:
+            stats["save_error"] = f"{type(e).__name__}: {str(e).splitlines()[0][:160]}"
+        stats["persistence"] = time.perf_counter() - save_started
+    else:
+        saver.db.close()
+    stats["wall"] = time.perf_counter() - started
+    return stats
+
+
+class RSSSampler:
+    """Peak resident set size while a block runs, sampled from /proc (falls back to ru_maxrss)"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current_bytes():
+        try:
+            with open("/proc/self/statm") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            # ru_maxrss is the lifetime peak, in KiB on Linux and bytes on macOS
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+
+def run_setting(kind, concurrency):
+    journeys = args.journeys or concurrency
+    with RSSSampler() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(
+                lambda index: run_journey(kind, f"{args.seed}:{kind}:{concurrency}:{index}"), range(journeys)
+            ))
+        wall = time.perf_counter() - started
+
+    totals = {key: sum(result[key] for result in results) for key in (
+        "setup", "llm_wait", "agent_total", "graph_total", "generation", "persistence", "wall",
+        "llm_calls", "prompt_tokens", "completion_tokens", "graph_errors", "messages"
+    )}
+
+    # Journey thread time split into stages, summed over journeys. Under
+    # concurrency these include time spent waiting for the GIL.
+    breakdown = {
+        "setup": totals["setup"],
+        "llm_wait": totals["llm_wait"],
+        "prompt_building": totals["agent_total"] - totals["llm_wait"],
+        "graph_overhead": totals["graph_total"] - totals["agent_total"],
+        "journey_building": totals["generation"] - totals["graph_total"],
+        "persistence": totals["persistence"],
+    }
+    thread_seconds = totals["wall"] or 1.0
+
+    return {
+        "generator": kind,
+        "concurrency": concurrency,
+        "journeys": journeys,
+        "wall_seconds": round(wall, 3),
+        "messages": totals["messages"],
+        "messages_per_sec": round(totals["messages"] / wall, 2),
+        "llm_calls": totals["llm_calls"],
+        "tokens_per_sec": round((totals["prompt_tokens"] + totals["completion_tokens"]) / wall, 1),
+        "completion_tokens_per_sec": round(totals["completion_tokens"] / wall, 1),
+        "graph_errors": totals["graph_errors"],
+        "save_errors": sorted({result["save_error"] for result in results if result["save_error"]}),
+        "peak_rss_mb": round(rss.peak_bytes / 1024 ** 2, 1),
+        "breakdown_seconds": {stage: round(breakdown[stage], 3) for stage in STAGES},
+        "breakdown_percent": {stage: round(breakdown[stage] / thread_seconds * 100, 1) for stage in STAGES},
+    }
+
+
+def main():
+    """Run every generator at every concurrency level and write the results"""
+    kinds = [kind.strip() for kind in args.generators.split(",") if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in ("basic", "realistic")]
+    if unknown:
+        print(f"ERROR Unknown generators {', '.join(unknown)}; expected basic and/or realistic")
+        sys.exit(1)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    print("JOURNEY GENERATION THROUGHPUT BENCHMARK")
+    print("=" * 100)
+    print(
+        f"Fake LLM: {args.llm_latency_ms:g}ms + {args.ms_per_token:g}ms/token, "
+        f"{args.completion_tokens} completion tokens, +/-{args.jitter * 100:g}% jitter\n"
+    )
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+    print(
+        f"{'generator':<10}{'conc':>5}{'msgs/s':>10}{'tok/s':>11}{'peak MB':>9}  "
+        + "".join(f"{stage:>17}" for stage in STAGES)
+    )
+    print("-" * 130)
+    results = []
+    for kind in kinds:
+        for concurrency in levels:
+            result = run_setting(kind, concurrency)
+            results.append(result)
+            stages = "".join(
+                f"{result['breakdown_seconds'][stage]:>9.2f}s {result['breakdown_percent'][stage]:>5.1f}%" for stage in STAGES
+            )
+            print(
+                f"{kind:<10}{concurrency:>5}{result['messages_per_sec']:>10.1f}{result['tokens_per_sec']:>11.0f}"
+                f"{result['peak_rss_mb']:>9.0f}  {stages}"
+            )
+            for error in result["save_errors"]:
+                print(f"   ! save failed: {error}")
+            if result["graph_errors"]:
+                print(f"   ! {result['graph_errors']} graph runs failed and fell back to canned messages")
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "fake_llm": {
+            "latency_ms": args.llm_latency_ms,
+            "ms_per_token": args.ms_per_token,
+            "jitter": args.jitter,
+            "completion_tokens": args.completion_tokens
+        },
+        "results": results
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nSUCCESS Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
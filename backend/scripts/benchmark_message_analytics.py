@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Latency budget check for the message analytics endpoints.
+Seeds a local database with a large synthetic message set, then times
+/messages/analytics and /messages/types with the cache cold and warm.
+Exits non-zero if either p95 latency exceeds its budget.
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import random
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark message analytics against a seeded dataset")
+    parser.add_argument("--database-url", default="sqlite:///analytics_benchmark.db", help="Database to seed and query")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Number of messages to seed")
+    parser.add_argument("--members", type=int, default=1000, help="Number of members to spread messages across")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed requests per endpoint")
+    parser.add_argument("--cold-budget-ms", type=float, default=500.0, help="Cold-cache p95 latency budget in milliseconds")
+    parser.add_argument("--warm-budget-ms", type=float, default=5.0, help="Warm-cache p95 latency budget in milliseconds")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the seeded data")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Point the app at the benchmark database before any app module creates its engine
+os.environ["DATABASE_URL"] = args.database_url
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal
+from app.core.cache import analytics_cache
+from app.api.routes.messages import get_message_analytics, get_message_types
+from scripts.benchmark_data import seed
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_endpoint(endpoint, db, cold):
+    samples = []
+    for _ in range(args.iterations):
+        if cold:
+            analytics_cache.clear()
+        started = time.perf_counter()
+        asyncio.run(endpoint(db=db))
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    """Seed the dataset and check analytics latency against the budget"""
+    print("MESSAGE ANALYTICS LATENCY BENCHMARK")
+    print("=" * 50)
+
+    db = SessionLocal()
+    try:
+        if not args.skip_seed:
+            print(f"Seeding {args.messages} messages across {args.members} members...")
+            seed(db, args.members, args.messages, random.Random(args.seed))
+
+        within_budget = True
+        for name, endpoint in [("analytics", get_message_analytics), ("types", get_message_types)]:
+            for cold in (True, False):
+                samples = time_endpoint(endpoint, db, cold)
+                p50, p95 = percentile(samples, 0.5), percentile(samples, 0.95)
+                label = "cold" if cold else "warm"
+                budget = args.cold_budget_ms if cold else args.warm_budget_ms
+                status = "OK" if p95 <= budget else "OVER BUDGET"
+                print(f"   - /messages/{name} ({label}): p50={p50:.2f}ms p95={p95:.2f}ms budget={budget:.0f}ms {status}")
+                if p95 > budget:
+                    within_budget = False
+
+        if not within_budget:
+            print("ERROR p95 latency exceeded the budget")
+            sys.exit(1)
+        print("SUCCESS All endpoints within budget")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
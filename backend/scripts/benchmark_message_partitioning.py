@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Compare per-member query latency on a plain vs hash-partitioned messages table.
+Seeds two scratch tables (bench_messages_plain, bench_messages_hashed) with
+identical synthetic rows inside Postgres, builds the same indexes on both,
+then times the hot read paths for random members. Postgres only.
+"""
+
+import sys
+import os
+import argparse
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, text
+from app.db.partitioning import MESSAGE_INDEXES, message_table_ddl
+
+LAYOUTS = ("bench_messages_plain", "bench_messages_hashed")
+MESSAGE_TYPES = (
+    "daily_medical_check", "weekly_review", "daily_nutrition", "weekly_meal_plan",
+    "daily_fitness", "mental_wellness", "coordination", "member_question"
+)
+SEED_CHUNK = 1_000_000
+JOURNEY_START = datetime(2024, 1, 1)
+
+# The read paths the API issues per member, as plain SQL over {table}
+QUERIES = {
+    "journey first page": """
+        SELECT id, agent_id, content, message_type, timestamp FROM {table}
+        WHERE member_id = :member_id ORDER BY timestamp, id LIMIT 100
+    """,
+    "journey keyset page": """
+        SELECT id, agent_id, content, message_type, timestamp FROM {table}
+        WHERE member_id = :member_id AND (timestamp, id) > (:after, '00000000-0000-0000-0000-000000000000')
+        ORDER BY timestamp, id LIMIT 100
+    """,
+    "week range": """
+        SELECT id, agent_id, content, message_type, timestamp FROM {table}
+        WHERE member_id = :member_id AND timestamp >= :since AND timestamp < :until
+        ORDER BY timestamp, id
+    """,
+    "month filter": """
+        SELECT id, agent_id, content, message_type, timestamp FROM {table}
+        WHERE member_id = :member_id AND journey_month = :month
+        ORDER BY journey_day LIMIT 100
+    """,
+    "timeline ranking": """
+        SELECT ranked.journey_month, m.content FROM (
+            SELECT id, journey_month, row_number() OVER (
+                PARTITION BY journey_month ORDER BY timestamp, id
+            ) AS position
+            FROM {table} WHERE member_id = :member_id
+        ) ranked JOIN {table} m ON m.id = ranked.id AND m.member_id = :member_id
+        WHERE ranked.position <= 50
+    """,
+    "rollup rebuild": """
+        SELECT agent_id, journey_month, message_type, count(*) FROM {table}
+        WHERE member_id = :member_id GROUP BY agent_id, journey_month, message_type
+    """,
+    "global latest (no member)": """
+        SELECT id, content, timestamp FROM {table} ORDER BY timestamp DESC, id DESC LIMIT 100
+    """,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark plain vs hash-partitioned messages layouts")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"), help="Postgres database for the scratch tables")
+    parser.add_argument("--messages", type=int, default=10_000_000, help="Rows seeded into each layout")
+    parser.add_argument("--members", type=int, default=10_000, help="Members the rows are spread across")
+    parser.add_argument("--partitions", type=int, default=16, help="Hash partitions for the partitioned layout")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs per query and layout")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse scratch tables from a previous run")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables afterwards (for --skip-seed reruns)")
+    return parser.parse_args()
+
+
+def member_uuid(index: int) -> str:
+    """Deterministic member id, matching md5('member-' || n)::uuid used when seeding"""
+    digest = hashlib.md5(f"member-{index}".encode("utf-8")).hexdigest()
+    return f"{digest[:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:]}"
+
+
+def seed(engine, args):
+    """Create both layouts and fill them with the same rows, indexing after the load"""
+    index_count = len(MESSAGE_INDEXES)
+    with engine.connect() as connection:
+        for table in LAYOUTS:
+            partitions = args.partitions if table.endswith("hashed") else 0
+            ddl = message_table_ddl(table, partitions, foreign_keys=False)
+            with connection.begin():
+                connection.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+                for statement in ddl[:-index_count]:
+                    connection.execute(text(statement))
+
+            started = time.perf_counter()
+            for start in range(0, args.messages, SEED_CHUNK):
+                end = min(start + SEED_CHUNK, args.messages) - 1
+                with connection.begin():
+                    connection.execute(text(f"""
+                        INSERT INTO {table} (id, member_id, agent_id, content, message_type, timestamp,
+                                             context_data, journey_month, journey_day)
+                        SELECT gen_random_uuid(),
+                               md5('member-' || (g % :members))::uuid,
+                               md5('agent-' || (g % 6))::uuid,
+                               'Benchmark message ' || g || ': blood pressure, sleep and training check-in',
+                               (CAST(:types AS text[]))[1 + (g % 8)::int],
+                               :journey_start + make_interval(days => day - 1, secs => g % 86400),
+                               jsonb_build_object('day', day, 'month', (day - 1) / 30 + 1),
+                               (day - 1) / 30 + 1,
+                               day
+                        FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g,
+                             LATERAL (SELECT 1 + ((g / :members) % 240)::int AS day) AS d
+                    """), {
+                        "members": args.members, "types": list(MESSAGE_TYPES),
+                        "journey_start": JOURNEY_START, "start": start, "end": end
+                    })
+                print(f"   - {table}: seeded {end + 1}/{args.messages} rows")
+
+            with connection.begin():
+                for statement in ddl[-index_count:]:
+                    connection.execute(text(statement))
+            print(f"   - {table}: loaded and indexed in {time.perf_counter() - started:.0f}s")
+
+    # VACUUM cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for table in LAYOUTS:
+            connection.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def table_size(connection, table: str) -> int:
+    """Bytes used by a table and its indexes, summed over partitions"""
+    return connection.execute(text(
+        "SELECT coalesce(sum(pg_total_relation_size(relid)), 0) FROM pg_partition_tree(CAST(:table AS regclass))"
+    ), {"table": table}).scalar()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_queries(engine, args):
+    """p50/p95/p99 per query and layout, using the same random members for both"""
+    rng = random.Random(42)
+    params = []
+    for _ in range(args.iterations):
+        week = rng.randint(1, 33)
+        params.append({
+            "member_id": member_uuid(rng.randrange(args.members)),
+            "after": JOURNEY_START + timedelta(days=rng.randint(0, 200)),
+            "since": JOURNEY_START + timedelta(weeks=week - 1),
+            "until": JOURNEY_START + timedelta(weeks=week),
+            "month": rng.randint(1, 8),
+        })
+
+    results = {}
+    with engine.connect() as connection:
+        for name, sql in QUERIES.items():
+            for table in LAYOUTS:
+                statement = text(sql.format(table=table))
+                # Warm the plan cache and buffers before timing
+                for values in params[:5]:
+                    connection.execute(statement, values).fetchall()
+                samples = []
+                for values in params:
+                    started = time.perf_counter()
+                    connection.execute(statement, values).fetchall()
+                    samples.append((time.perf_counter() - started) * 1000)
+                results[(name, table)] = samples
+        sizes = {table: table_size(connection, table) for table in LAYOUTS}
+    return results, sizes
+
+
+def main():
+    """Seed both layouts and compare query latency"""
+    args = parse_args()
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        print("ERROR This benchmark needs a Postgres --database-url (or DATABASE_URL)")
+        sys.exit(1)
+
+    engine = create_engine(args.database_url)
+
+    print("MESSAGES PARTITIONING BENCHMARK")
+    print("=" * 78)
+    print(f"{args.messages} rows, {args.members} members, {args.partitions} hash partitions\n")
+
+    try:
+        if not args.skip_seed:
+            print("Seeding scratch tables...")
+            seed(engine, args)
+
+        results, sizes = time_queries(engine, args)
+
+        print(f"\n{'query':<28}{'layout':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        print("-" * 78)
+        for name in QUERIES:
+            for table in LAYOUTS:
+                samples = results[(name, table)]
+                layout = "hashed" if table.endswith("hashed") else "plain"
+                print(
+                    f"{name:<28}{layout:<10}{percentile(samples, 0.50):>10.2f}"
+                    f"{percentile(samples, 0.95):>10.2f}{percentile(samples, 0.99):>10.2f}"
+                )
+
+        print("\nTable + index size:")
+        for table, size in sizes.items():
+            print(f"   - {table}: {size / 1024 ** 3:.2f} GiB")
+    finally:
+        if not args.keep:
+            with engine.begin() as connection:
+                for table in LAYOUTS:
+                    connection.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Latency, query count and payload size for every read endpoint.
+Seeds a local database at a chosen scale with the ORM models, drives each
+read route in journey.py, messages.py and agents.py in-process through the
+ASGI app, and writes p50/p95/p99 latency, queries per request and bytes per
+response to a JSON file so runs can be diffed between commits.
+"""
+
+import sys
+import os
+import argparse
+import importlib.util
+import json
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+# (members, messages) per preset scale
+SCALES = {
+    "small": (10, 10_000),
+    "medium": (1_000, 1_000_000),
+    "large": (100_000, 10_000_000),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the read API against a seeded dataset")
+    parser.add_argument("--database-url", default="sqlite:///read_api_benchmark.db", help="Database to seed and query")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Preset dataset size")
+    parser.add_argument("--members", type=int, default=None, help="Override the preset member count")
+    parser.add_argument("--messages", type=int, default=None, help="Override the preset message count")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed requests per endpoint")
+    parser.add_argument("--endpoints", default=None, help="Comma-separated endpoint names to run (default: all)")
+    parser.add_argument("--warm-cache", action="store_true", help="Keep the in-process response caches between requests")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--output", default="read_api_benchmark.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare p95 latency against")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request parameters")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Point the app at the benchmark database before any app module creates its engine
+os.environ["DATABASE_URL"] = args.database_url
+os.environ["READ_REPLICA_URLS"] = ""
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.db.database import SessionLocal, engine
+from app.db.models import Member, Agent, Message
+from app.core.cache import analytics_cache, journey_response_cache
+from scripts.benchmark_data import seed
+
+SEARCH_TERMS = ["blood pressure", "sleep", "travel stress", "glucose"]
+
+
+def endpoint_requests(member_ids, agent_ids):
+    """Request builders per endpoint, each taking an rng and returning (method, url, params, json)"""
+    member = lambda rng: str(rng.choice(member_ids))
+    agent = lambda rng: str(rng.choice(agent_ids))
+    endpoints = {
+        # journey.py
+        "journey.list_members": lambda rng: ("GET", "/api/v1/journey/members", {"limit": 100}, None),
+        "journey.member": lambda rng: ("GET", f"/api/v1/journey/members/{member(rng)}", {}, None),
+        "journey.member_page": lambda rng: ("GET", f"/api/v1/journey/members/{member(rng)}", {"limit": 100}, None),
+        "journey.member_sparse": lambda rng: (
+            "GET", f"/api/v1/journey/members/{member(rng)}",
+            {"include": "journey_states", "fields[journey_states]": "month,biomarkers"}, None
+        ),
+        "journey.timeline": lambda rng: ("GET", f"/api/v1/journey/members/{member(rng)}/timeline", {}, None),
+        "journey.export_ndjson": lambda rng: ("GET", f"/api/v1/journey/members/{member(rng)}/export", {}, None),
+        "journey.batch": lambda rng: (
+            "POST", "/api/v1/journey/members/batch", {},
+            {"member_ids": [str(member_id) for member_id in rng.sample(member_ids, min(50, len(member_ids)))]}
+        ),
+        # messages.py
+        "messages.list": lambda rng: ("GET", "/api/v1/messages/", {"limit": 100}, None),
+        "messages.list_member": lambda rng: ("GET", "/api/v1/messages/", {"member_id": member(rng), "limit": 100}, None),
+        "messages.list_month": lambda rng: ("GET", "/api/v1/messages/", {"month": rng.randint(1, 8), "limit": 100}, None),
+        "messages.types": lambda rng: ("GET", "/api/v1/messages/types", {}, None),
+        "messages.search": lambda rng: ("GET", "/api/v1/messages/search", {"query": rng.choice(SEARCH_TERMS)}, None),
+        "messages.analytics": lambda rng: ("GET", "/api/v1/messages/analytics", {}, None),
+        # agents.py
+        "agents.list": lambda rng: ("GET", "/api/v1/agents/", {}, None),
+        "agents.personas": lambda rng: ("GET", "/api/v1/agents/personas", {}, None),
+        "agents.messages": lambda rng: ("GET", f"/api/v1/agents/{agent(rng)}/messages", {}, None),
+        "agents.stats": lambda rng: ("GET", f"/api/v1/agents/{agent(rng)}/stats", {}, None),
+    }
+    if importlib.util.find_spec("pyarrow"):
+        endpoints["journey.export_parquet"] = lambda rng: (
+            "GET", "/api/v1/journey/export/messages", {"member_id": member(rng)}, None
+        )
+    return endpoints
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_endpoint(client, build, rng, counter):
+    """Time one endpoint over the configured iterations after a single warm-up request"""
+    samples, queries, sizes, errors = [], [], [], 0
+    for iteration in range(args.iterations + 1):
+        method, url, params, body = build(rng)
+        if not args.warm_cache:
+            journey_response_cache.clear()
+            analytics_cache.clear()
+        counter[0] = 0
+        started = time.perf_counter()
+        response = client.request(method, url, params=params, json=body)
+        elapsed = (time.perf_counter() - started) * 1000
+        if iteration == 0:
+            continue
+        samples.append(elapsed)
+        queries.append(counter[0])
+        sizes.append(len(response.content))
+        if response.status_code >= 400:
+            errors += 1
+    return {
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+        "bytes_per_response": round(sum(sizes) / len(sizes)),
+        "errors": errors
+    }
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for name, current in results.items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        change = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 if previous["p95_ms"] else 0.0
+        print(
+            f"   - {name:<26} p95 {previous['p95_ms']:>9.2f} -> {current['p95_ms']:>9.2f} ms ({change:+.1f}%)"
+            f"  queries {previous['queries_per_request']:g} -> {current['queries_per_request']:g}"
+        )
+
+
+def main():
+    """Seed the dataset, benchmark every read endpoint and write the results"""
+    members, messages = SCALES[args.scale]
+    members = args.members or members
+    messages = args.messages or messages
+    rng = random.Random(args.seed)
+
+    print("READ API BENCHMARK")
+    print("=" * 78)
+
+    db = SessionLocal()
+    try:
+        if not args.skip_seed:
+            print(f"Seeding {messages} messages across {members} members...")
+            seed(db, members, messages, rng)
+        member_ids = [row.id for row in db.query(Member.id).limit(10_000).all()]
+        agent_ids = [row.id for row in db.query(Agent.id).all()]
+        members = db.query(Member).count()
+        messages = db.query(Message).count()
+    finally:
+        db.close()
+    if not member_ids or not agent_ids:
+        print("ERROR The benchmark database has no members or agents; run without --skip-seed")
+        sys.exit(1)
+
+    endpoints = endpoint_requests(member_ids, agent_ids)
+    if args.endpoints:
+        wanted = [name.strip() for name in args.endpoints.split(",")]
+        unknown = [name for name in wanted if name not in endpoints]
+        if unknown:
+            print(f"ERROR Unknown endpoints {', '.join(unknown)}; available: {', '.join(endpoints)}")
+            sys.exit(1)
+        endpoints = {name: endpoints[name] for name in wanted}
+
+    # Every statement the app sends during a request is counted against it
+    counter = [0]
+
+    def count_query(*_):
+        counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+
+    results = {}
+    with TestClient(app) as client:
+        print(f"\n{'endpoint':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'bytes':>12}")
+        print("-" * 78)
+        for name, build in endpoints.items():
+            result = run_endpoint(client, build, random.Random(f"{args.seed}:{name}"), counter)
+            results[name] = result
+            flag = f"  ({result['errors']} errors)" if result["errors"] else ""
+            print(
+                f"{name:<26}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                f"{result['queries_per_request']:>9g}{result['bytes_per_response']:>12}{flag}"
+            )
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "database": engine.dialect.name,
+        "dataset": {"members": members, "messages": messages, "scale": args.scale},
+        "iterations": args.iterations,
+        "warm_cache": args.warm_cache,
+        "endpoints": results
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+    failed = [name for name, result in results.items() if result["errors"]]
+    if failed:
+        print(f"ERROR Requests failed for {', '.join(failed)}; results written to {args.output}")
+        sys.exit(1)
+    print(f"\nSUCCESS Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
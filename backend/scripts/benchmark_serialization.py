@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Serialization cost of a large journey response.
+Builds a synthetic journey payload shaped like GET /journey/members/{id} and
+times the old jsonable_encoder + json path against the typed response model
+and the orjson path the API now uses.
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, date, timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.api.responses import dumps
+from app.models.schemas import MemberJourney
+
+
+def build_journey(message_count: int) -> dict:
+    """Journey payload with the same field types the route builds from the ORM"""
+    start = datetime(2024, 1, 1, 8, 0)
+    return {
+        "member": {
+            "id": str(uuid.uuid4()),
+            "name": "Rohan Patel",
+            "age": 46,
+            "occupation": "Regional Head of Sales",
+            "location": "Singapore",
+            "health_goals": ["Reduce risk of heart disease", "Enhance cognitive function"]
+        },
+        "messages": [
+            {
+                "id": str(uuid.uuid4()),
+                "agent_name": "Dr. Warren",
+                "agent_role": "The Medical Strategist",
+                "content": "Your blood pressure trend is improving; keep the morning Zone 2 sessions going. " * 3,
+                "message_type": "daily_medical_check",
+                "timestamp": start + timedelta(minutes=70 * i),
+                "context_data": {"day": i // 20 + 1, "month": i // 600 + 1, "agent_role": "Lead Physician"}
+            } for i in range(message_count)
+        ],
+        "health_events": [
+            {
+                "id": str(uuid.uuid4()),
+                "event_type": "quarterly_diagnostic",
+                "event_date": date(2024, month, 15),
+                "description": "Comprehensive health panel",
+                "results": {"blood_pressure": "128/82", "hba1c": "5.3%"}
+            } for month in (3, 6)
+        ],
+        "journey_states": [
+            {
+                "month": month,
+                "biomarkers": {"weight": "73kg", "blood_pressure": "125/80", "adherence_this_month": "60%"},
+                "interventions": [],
+                "metrics": {}
+            } for month in range(1, 9)
+        ],
+        "next_cursor": None
+    }
+
+
+def time_it(label: str, serialize, payload, iterations: int) -> float:
+    body = serialize(payload)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serialize(payload)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+    print(f"   - {label:<38} {elapsed_ms:8.2f} ms  ({len(body) / 1024:.0f} KiB)")
+    return elapsed_ms
+
+
+def main():
+    """Compare journey serialization strategies"""
+    parser = argparse.ArgumentParser(description="Benchmark journey response serialization")
+    parser.add_argument("--messages", type=int, default=5000, help="Messages in the synthetic journey")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per strategy")
+    args = parser.parse_args()
+
+    payload = build_journey(args.messages)
+    journey_adapter = TypeAdapter(MemberJourney)
+
+    print(f"JOURNEY SERIALIZATION BENCHMARK ({args.messages} messages)")
+    print("=" * 60)
+    before = time_it(
+        "before: jsonable_encoder + json.dumps",
+        lambda data: json.dumps(jsonable_encoder(data)).encode("utf-8"),
+        payload, args.iterations
+    )
+    time_it(
+        "response model: validate + dump_json",
+        lambda data: journey_adapter.dump_json(journey_adapter.validate_python(data)),
+        payload, args.iterations
+    )
+    after = time_it("after: orjson", dumps, payload, args.iterations)
+    print(f"\nSpeedup (before / after): {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Check route query budgets in strict mode against a seeded SQLite database.
+Calls every route that declares a budget and verifies it succeeds within
+it, then verifies that a route going over its budget fails with a 500
+naming the budget and the statement, rather than a generic error.
+"""
+
+import sys
+import os
+import argparse
+import random
+import tempfile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check route query budgets with QUERY_BUDGET_STRICT enabled")
+    parser.add_argument("--database-url", default=None, help="Database to seed and check (default: SQLite in a temp dir)")
+    parser.add_argument("--members", type=int, default=5, help="Members to seed")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages to seed")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the dataset")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Strict budgets on a throwaway database, configured before any app module loads
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='query_budgets_'), 'budgets.db')}"
+os.environ["READ_REPLICA_URLS"] = ""
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+os.environ["QUERY_TIMING_HEADERS"] = "true"
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import Depends, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.query_audit import QueryBudgetExceeded, query_budget
+from app.db.database import SessionLocal, get_read_db
+from app.db.models import Member
+from app.main import app
+from scripts.benchmark_data import seed
+
+failures = []
+
+
+def check(label: str, passed: bool):
+    print(f"   {'PASS' if passed else 'FAIL'} {label}")
+    if not passed:
+        failures.append(label)
+
+
+@app.get("/__query_budget_check", dependencies=[Depends(query_budget(1))])
+async def over_budget(db: Session = Depends(get_read_db)):
+    """Runs two statements against a budget of one, behind the routes' usual error handling"""
+    try:
+        db.query(Member.id).first()
+        db.query(Member.id).first()
+        return {}
+    except QueryBudgetExceeded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def budgeted_requests(member_id: str, agent_id: str):
+    """(label, method, url, params or JSON body, budget) for every route that declares a budget"""
+    return [
+        ("GET /messages/", "GET", "/api/v1/messages/", {"limit": 50}, 1),
+        ("GET /messages/types", "GET", "/api/v1/messages/types", {}, 1),
+        ("GET /messages/search (first, builds the index)", "GET", "/api/v1/messages/search", {"query": "blood pressure"}, 4),
+        ("GET /messages/search", "GET", "/api/v1/messages/search", {"query": "sleep"}, 4),
+        ("GET /messages/analytics", "GET", "/api/v1/messages/analytics", {}, 1),
+        ("GET /agents/", "GET", "/api/v1/agents/", {}, 1),
+        ("GET /agents/{id}/messages", "GET", f"/api/v1/agents/{agent_id}/messages", {}, 2),
+        ("GET /agents/{id}/stats", "GET", f"/api/v1/agents/{agent_id}/stats", {}, 2),
+        ("GET /journey/members", "GET", "/api/v1/journey/members", {"limit": 2}, 1),
+        ("GET /journey/members/{id}", "GET", f"/api/v1/journey/members/{member_id}", {}, 5),
+        ("GET /journey/members/{id}/timeline", "GET", f"/api/v1/journey/members/{member_id}/timeline", {}, 6),
+        ("GET /journey/members/{id}/llm-usage", "GET", f"/api/v1/journey/members/{member_id}/llm-usage", {}, 5),
+        ("POST /journey/members/batch", "POST", "/api/v1/journey/members/batch", {"member_ids": [member_id]}, 9)
+    ]
+
+
+def main():
+    """Seed, call the budgeted routes in strict mode and check an over-budget route"""
+    print("QUERY BUDGET CHECK (strict mode)")
+    print("=" * 50)
+    print(f"Database: {os.environ['DATABASE_URL']}\n")
+
+    db = SessionLocal()
+    try:
+        seed(db, args.members, args.messages, random.Random(args.seed))
+    finally:
+        db.close()
+
+    client = TestClient(app)
+    member_id = client.get("/api/v1/journey/members").json()["members"][0]["id"]
+    agent_id = client.get("/api/v1/agents/").json()[0]["id"]
+
+    print("Budgeted routes:")
+    for label, method, url, payload, budget in budgeted_requests(member_id, agent_id):
+        if method == "GET":
+            response = client.get(url, params=payload)
+        else:
+            response = client.post(url, json=payload)
+        queries = response.headers.get("x-db-queries", "?")
+        check(f"{label}: {response.status_code}, {queries} of {budget} statements", response.status_code == 200)
+
+    print("\nOver budget:")
+    response = client.get("/__query_budget_check")
+    body = response.json()
+    check("over-budget route answers 500", response.status_code == 500)
+    check("the error names the budget and the statement", body.get("budget") == 1 and "SELECT" in body.get("statement", ""))
+
+    if failures:
+        print(f"\nERROR {len(failures)} query budget checks failed")
+        sys.exit(1)
+    print("\nSUCCESS Every budgeted route stays within its budget")
+
+
+if __name__ == "__main__":
+    main()
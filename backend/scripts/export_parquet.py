@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Export journeys to partitioned Parquet datasets for the data team.
+Writes messages, health_events and journey_state under the output directory,
+partitioned by journey month, with context_data and biomarkers flattened
+into columns.
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal
+from app.services.parquet_export import EXPORT_TABLES, export_parquet_dataset
+
+
+def main():
+    """Export selected members (or everyone) to Parquet"""
+    parser = argparse.ArgumentParser(description="Export journeys to partitioned Parquet files")
+    parser.add_argument("--output", default="parquet_export", help="Output directory")
+    parser.add_argument("--member-id", action="append", dest="member_ids", help="Member to export (repeatable, default: all)")
+    parser.add_argument("--tables", default=",".join(EXPORT_TABLES), help="Comma-separated tables to export")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per batch / row group")
+    args = parser.parse_args()
+    
+    tables = tuple(table.strip() for table in args.tables.split(",") if table.strip())
+    unknown = [table for table in tables if table not in EXPORT_TABLES]
+    if unknown:
+        print(f"ERROR Unknown tables: {', '.join(unknown)} (expected {', '.join(EXPORT_TABLES)})")
+        sys.exit(1)
+    
+    scope = f"{len(args.member_ids)} members" if args.member_ids else "all members"
+    print(f"Exporting {', '.join(tables)} for {scope} to {args.output}/...")
+    
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = export_parquet_dataset(db, args.output, tables, args.member_ids, args.batch_size)
+        elapsed = time.perf_counter() - started
+        for table, rows in written.items():
+            print(f"   - {table}: {rows} rows")
+        print(f"SUCCESS Export finished in {elapsed:.1f}s")
+    except Exception as e:
+        print(f"ERROR Export failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -125,7 +125,8 @@ def main():
         
         # Prepare JSON-serializable data
         json_data = journey_data.copy()
-        for msg in json_data.get("messages", []):
+        json_data["messages"] = [msg.to_dict() for msg in journey_data["messages"]]
+        for msg in json_data["messages"]:
             if isinstance(msg.get("timestamp"), datetime):
                 msg["timestamp"] = msg["timestamp"].isoformat()
         
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Load journey backups back into the database without regenerating them.
+Accepts the rohan_realistic_journey_*.json files written by
+generate_realistic_journey.py and the NDJSON export (.jsonl). Files already
+imported (same content hash) are skipped.
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.journey_import import import_journey_file, import_journey_directory
+
+
+def main():
+    """Import a backup file or a directory of backups"""
+    parser = argparse.ArgumentParser(description="Import journey JSON/JSONL backups")
+    parser.add_argument("path", help="Backup file, or a directory of .json/.jsonl backups")
+    parser.add_argument("--workers", type=int, default=4, help="Files imported in parallel (directories only)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Messages per bulk insert")
+    args = parser.parse_args()
+    
+    print("IMPORTING JOURNEY BACKUPS")
+    print("=" * 50)
+    
+    started = time.perf_counter()
+    if os.path.isdir(args.path):
+        results = import_journey_directory(args.path, workers=args.workers, batch_size=args.batch_size)
+    else:
+        try:
+            results = [import_journey_file(args.path, batch_size=args.batch_size)]
+        except Exception as e:
+            results = [{"path": args.path, "status": "failed", "error": str(e), "member_id": None, "messages": 0}]
+    elapsed = time.perf_counter() - started
+    
+    for result in results:
+        name = os.path.basename(result["path"])
+        if result["status"] == "imported":
+            print(f"   - {name}: imported {result['messages']} messages (Member ID: {result['member_id']})")
+        elif result["status"] == "skipped":
+            print(f"   - {name}: already imported (Member ID: {result['member_id']})")
+        else:
+            print(f"   - {name}: FAILED - {result['error']}")
+    
+    counts = {status: sum(1 for result in results if result["status"] == status) for status in ("imported", "skipped", "failed")}
+    print(f"\nImported {counts['imported']}, skipped {counts['skipped']}, failed {counts['failed']} in {elapsed:.1f}s")
+    
+    if counts["failed"]:
+        print("ERROR Some backups could not be imported")
+        sys.exit(1)
+    print("SUCCESS Import complete")
+
+
+if __name__ == "__main__":
+    main()
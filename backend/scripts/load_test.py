@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+How many concurrent dashboard users one instance serves, optionally while
+journeys are being generated.
+Virtual users replay the frontend's api.ts call pattern (journey and agents
+on page load, then timeline, search and analytics with think time between
+clicks) against the app in-process or a running server, adding users in
+steps. Writes a per-second latency/error time series, per-step results and
+a saturation report naming the step where p95 latency, errors or
+throughput gave out.
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from functools import partial
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ramp simulated dashboard users against the API and find where it saturates")
+    parser.add_argument("--base-url", default=None, help="Running server to load, e.g. http://localhost:8000 (default: the app in-process)")
+    parser.add_argument("--database-url", default="sqlite:///load_test.db", help="Database to seed and serve in-process")
+    parser.add_argument("--members", type=int, default=50, help="Members to seed in-process")
+    parser.add_argument("--messages", type=int, default=50_000, help="Messages to seed in-process")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded in-process database")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent users at the last step")
+    parser.add_argument("--step-users", type=int, default=5, help="Users added at each step")
+    parser.add_argument("--step-seconds", type=float, default=15.0, help="Seconds each step runs before more users join")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds a user waits between clicks (exponential)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--with-generation", action="store_true", help="Keep journey generation jobs running throughout")
+    parser.add_argument("--generator", choices=("basic", "realistic"), default="basic", help="Generation endpoint to keep busy")
+    parser.add_argument("--generation-jobs", type=int, default=1, help="Generation jobs kept running at once")
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=50.0,
+        help="Latency of each fake LLM call in-process; a --base-url server calls its real LLM"
+    )
+    parser.add_argument("--p95-slo-ms", type=float, default=1000.0, help="p95 latency a step must stay under")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Fraction of failed requests a step may have")
+    parser.add_argument("--output", default="load_test.json", help="JSON results file")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and user behaviour")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+import httpx
+
+IN_PROCESS = args.base_url is None
+if IN_PROCESS:
+    # Point the app at the load test database before any app module creates its engine
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["READ_REPLICA_URLS"] = ""
+
+    # Add the backend directory to the Python path
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+    import app.agents.base_agent as base_agent
+    from app.main import app
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Member, Agent
+    from scripts.benchmark_data import FakeLLM, seed
+
+SEARCH_TERMS = ["blood pressure", "sleep", "travel stress", "glucose", "protein", "meditation"]
+# Clicks after a page load, weighted roughly by how often the dashboard makes them
+ACTIONS = {
+    "journey.timeline": 4,
+    "messages.search": 3,
+    "messages.analytics": 2,
+    "journey.member": 1,
+}
+
+
+def api_request(name, member_id, rng):
+    """(method, url, params) for one api.ts call"""
+    return {
+        # getMemberJourneyData / getMember
+        "journey.member": ("GET", f"/api/v1/journey/members/{member_id}", {}),
+        # getMemberTimeline
+        "journey.timeline": ("GET", f"/api/v1/journey/members/{member_id}/timeline", {}),
+        # getAgents
+        "agents.list": ("GET", "/api/v1/agents/", {}),
+        # searchMessages
+        "messages.search": ("GET", "/api/v1/messages/search", {"query": rng.choice(SEARCH_TERMS)}),
+        # getMessageAnalytics
+        "messages.analytics": ("GET", "/api/v1/messages/analytics", {}),
+    }[name]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class Recorder:
+    """Every finished request as (started offset, endpoint, latency ms, error or None)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples = []
+        self.users = 0
+        # Active users at each elapsed second, sampled as users join
+        self.users_at = {}
+        self.generation = {"started": 0, "succeeded": 0, "failed": 0, "seconds": []}
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    async def request(self, client, name, method, url, params=None):
+        started = self.elapsed()
+        error = None
+        try:
+            response = await client.request(method, url, params=params)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        self.samples.append((started, name, (self.elapsed() - started) * 1000, error))
+
+    def add_users(self, count):
+        self.users += count
+        self.users_at[int(self.elapsed())] = self.users
+
+
+async def virtual_user(client, recorder, member_ids, rng):
+    """One dashboard session after another: load a member's page, click around it, move to another member"""
+    while True:
+        member_id = rng.choice(member_ids)
+        # useJourneyData fetches the journey and the agents together on page load
+        await asyncio.gather(
+            recorder.request(client, "journey.member", *api_request("journey.member", member_id, rng)),
+            recorder.request(client, "agents.list", *api_request("agents.list", member_id, rng))
+        )
+        for _ in range(rng.randint(3, 8)):
+            await asyncio.sleep(rng.expovariate(1 / args.think_time) if args.think_time > 0 else 0)
+            name = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+            await recorder.request(client, name, *api_request(name, member_id, rng))
+
+
+async def generation_worker(client, recorder):
+    """Start a journey generation as soon as the previous one finishes"""
+    path = "/api/v1/journey/generate-realistic" if args.generator == "realistic" else "/api/v1/journey/generate"
+    while True:
+        recorder.generation["started"] += 1
+        started = time.perf_counter()
+        try:
+            response = await client.post(path, timeout=None)
+            outcome = "succeeded" if response.status_code < 400 else "failed"
+        except httpx.HTTPError:
+            outcome = "failed"
+        recorder.generation[outcome] += 1
+        recorder.generation["seconds"].append(time.perf_counter() - started)
+
+
+async def load_ids(client):
+    """Member and agent ids to browse, read through the API so a remote server needs no database access"""
+    if IN_PROCESS:
+        db = SessionLocal()
+        try:
+            return [str(row.id) for row in db.query(Member.id).limit(1000).all()], db.query(Agent.id).count()
+        finally:
+            db.close()
+    members = (await client.get("/api/v1/journey/members", params={"limit": 1000})).json()["members"]
+    agents = (await client.get("/api/v1/agents/")).json()
+    return [member["id"] for member in members], len(agents)
+
+
+def summarize(samples):
+    latencies = [sample[2] for sample in samples]
+    errors = sum(sample[3] is not None for sample in samples)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+
+def time_series(recorder, duration):
+    """Requests, errors and latency percentiles for each second of the run, by the second requests started in"""
+    by_second = defaultdict(list)
+    for sample in recorder.samples:
+        by_second[int(sample[0])].append(sample)
+    series, users = [], 0
+    for second in range(int(duration)):
+        users = recorder.users_at.get(second, users)
+        series.append({"second": second, "users": users, **summarize(by_second[second])})
+    return series
+
+
+def step_results(recorder, steps):
+    """Results per step, leaving out each step's first second while its new users make their first requests"""
+    results = []
+    for users, start, end in steps:
+        samples = [sample for sample in recorder.samples if start + 1 <= sample[0] < end]
+        by_endpoint = defaultdict(list)
+        for sample in samples:
+            by_endpoint[sample[1]].append(sample)
+        results.append({
+            "users": users,
+            "throughput_rps": round(len(samples) / max(end - start - 1, 1e-9), 2),
+            **summarize(samples),
+            "endpoints": {name: summarize(by_endpoint[name]) for name in sorted(by_endpoint)},
+        })
+    return results
+
+
+def saturation_report(steps):
+    """The first step that broke the latency or error budget, and the first where throughput stopped keeping up with users"""
+    breach = None
+    for step in steps:
+        reasons = []
+        if step["p95_ms"] > args.p95_slo_ms:
+            reasons.append(f"p95 {step['p95_ms']:.0f}ms over the {args.p95_slo_ms:g}ms SLO")
+        if step["error_rate"] > args.max_error_rate:
+            reasons.append(f"error rate {step['error_rate'] * 100:.1f}% over {args.max_error_rate * 100:g}%")
+        if reasons:
+            breach = {"users": step["users"], "reasons": reasons}
+            break
+
+    # With think time fixed, throughput should grow with users until the
+    # instance saturates; flag the first step that gained less than half of that
+    knee = None
+    for previous, step in zip(steps, steps[1:]):
+        if not previous["throughput_rps"]:
+            continue
+        expected = step["users"] / previous["users"]
+        actual = step["throughput_rps"] / previous["throughput_rps"]
+        if actual - 1 < (expected - 1) / 2:
+            knee = {"users": step["users"], "throughput_rps": step["throughput_rps"], "previous_rps": previous["throughput_rps"]}
+            break
+
+    within = [step for step in steps if breach is None or step["users"] < breach["users"]]
+    return {
+        "p95_slo_ms": args.p95_slo_ms,
+        "max_error_rate": args.max_error_rate,
+        "max_users_within_slo": within[-1]["users"] if within else 0,
+        "slo_breached_at": breach,
+        "throughput_knee_at": knee,
+        "peak_throughput_rps": max((step["throughput_rps"] for step in steps), default=0.0),
+    }
+
+
+async def run_load(member_ids):
+    recorder = Recorder()
+    if IN_PROCESS:
+        # App errors come back as 500s instead of raising into the virtual user
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout)
+    else:
+        # Unpooled, so client-side connection limits never queue users
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits)
+
+    tasks, steps = [], []
+    rng = random.Random(args.seed)
+    try:
+        if args.with_generation:
+            tasks += [asyncio.create_task(generation_worker(client, recorder)) for _ in range(args.generation_jobs)]
+
+        users = 0
+        while users < args.users:
+            added = min(args.step_users, args.users - users)
+            tasks += [
+                asyncio.create_task(virtual_user(client, recorder, member_ids, random.Random(rng.random())))
+                for _ in range(added)
+            ]
+            users += added
+            recorder.add_users(added)
+            start = recorder.elapsed()
+            await asyncio.sleep(args.step_seconds)
+            steps.append((users, start, recorder.elapsed()))
+
+            completed = [sample for sample in recorder.samples if start + 1 <= sample[0]]
+            stats = summarize(completed)
+            print(
+                f"{users:>6}{len(completed) / max(args.step_seconds - 1, 1e-9):>10.1f}{stats['p50_ms']:>10.1f}"
+                f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['error_rate'] * 100:>8.1f}%"
+                f"{recorder.generation['succeeded']:>8}"
+            )
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client.aclose()
+    return recorder, steps
+
+
+def main():
+    """Seed if in-process, ramp users step by step and write the time series and saturation report"""
+    print("DASHBOARD LOAD TEST")
+    print("=" * 70)
+    target = args.base_url or f"in-process app on {args.database_url}"
+    print(f"Target: {target}")
+
+    if IN_PROCESS:
+        # Calls block like the real client's, so in-process generation costs nothing but the wait
+        base_agent.Groq = partial(FakeLLM, latency_ms=args.llm_latency_ms, jitter=0.2)
+        if not args.skip_seed:
+            print(f"Seeding {args.messages} messages across {args.members} members...")
+            db = SessionLocal()
+            try:
+                seed(db, args.members, args.messages, random.Random(args.seed))
+            finally:
+                db.close()
+
+    async def fetch_ids():
+        if IN_PROCESS:
+            return await load_ids(None)
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+            return await load_ids(client)
+
+    try:
+        member_ids, agent_count = asyncio.run(fetch_ids())
+    except Exception as e:
+        print(f"ERROR Could not list members and agents from {target}: {e}")
+        sys.exit(1)
+    if not member_ids or not agent_count:
+        print("ERROR The target has no members or agents; seed it or generate a journey first")
+        sys.exit(1)
+
+    generation_note = f", {args.generation_jobs} {args.generator} generation job(s) running" if args.with_generation else ""
+    print(
+        f"Ramping to {args.users} users, {args.step_users} every {args.step_seconds:g}s, "
+        f"{args.think_time:g}s mean think time{generation_note}\n"
+    )
+    print(f"{'users':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'jobs':>8}")
+    print("-" * 63)
+
+    recorder, steps = asyncio.run(run_load(member_ids))
+    duration = steps[-1][2] if steps else 0.0
+    results = step_results(recorder, steps)
+    saturation = saturation_report(results)
+    error_kinds = Counter(sample[3] for sample in recorder.samples if sample[3] is not None)
+    generation_seconds = recorder.generation["seconds"]
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "target": target,
+        "database": engine.dialect.name if IN_PROCESS else None,
+        "settings": {
+            "users": args.users,
+            "step_users": args.step_users,
+            "step_seconds": args.step_seconds,
+            "think_time": args.think_time,
+            "with_generation": args.with_generation,
+            "generator": args.generator if args.with_generation else None,
+            "generation_jobs": args.generation_jobs if args.with_generation else 0,
+            "llm_latency_ms": args.llm_latency_ms if IN_PROCESS else None,
+        },
+        "members": len(member_ids),
+        "totals": summarize(recorder.samples),
+        "errors_by_kind": dict(error_kinds),
+        "generation": {
+            "started": recorder.generation["started"],
+            "succeeded": recorder.generation["succeeded"],
+            "failed": recorder.generation["failed"],
+            "mean_seconds": round(sum(generation_seconds) / len(generation_seconds), 2) if generation_seconds else None,
+        },
+        "steps": results,
+        "saturation": saturation,
+        "time_series": time_series(recorder, duration),
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    print("\nSATURATION")
+    print("-" * 63)
+    print(f"   - Max users within SLO: {saturation['max_users_within_slo']}")
+    if saturation["slo_breached_at"]:
+        breach = saturation["slo_breached_at"]
+        print(f"   - SLO breached at {breach['users']} users: {'; '.join(breach['reasons'])}")
+    if saturation["throughput_knee_at"]:
+        knee = saturation["throughput_knee_at"]
+        print(
+            f"   - Throughput flattened at {knee['users']} users: "
+            f"{knee['previous_rps']:.1f} -> {knee['throughput_rps']:.1f} req/s"
+        )
+    print(f"   - Peak throughput: {saturation['peak_throughput_rps']:.1f} req/s")
+    for kind, count in error_kinds.most_common():
+        print(f"   ! {count} x {kind}")
+    if args.with_generation and IN_PROCESS and recorder.generation["succeeded"] == 0:
+        print("   ! No generation job finished during the run; lengthen the steps or lower --llm-latency-ms")
+
+    print(f"\nSUCCESS Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
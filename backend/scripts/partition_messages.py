@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migrate messages to a hash-partitioned table (Postgres only, optional).
+Builds a copy of messages partitioned by member_id, copies every row and
+swaps it in, all in one transaction. The original table is kept as
+messages_unpartitioned until dropped with --drop-old.
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+from app.db.database import engine
+from app.db.partitioning import is_partitioned, partition_messages_statements
+
+
+def main():
+    """Partition the messages table by member_id"""
+    parser = argparse.ArgumentParser(description="Hash-partition the messages table by member_id")
+    parser.add_argument("--partitions", type=int, default=16, help="Number of hash partitions")
+    parser.add_argument("--dry-run", action="store_true", help="Print the migration SQL without running it")
+    parser.add_argument("--drop-old", action="store_true", help="Drop messages_unpartitioned left by a previous run")
+    args = parser.parse_args()
+    
+    if engine.dialect.name != "postgresql":
+        print(f"ERROR Partitioning requires Postgres (DATABASE_URL uses {engine.dialect.name})")
+        sys.exit(1)
+    if args.partitions < 2:
+        print("ERROR --partitions must be at least 2")
+        sys.exit(1)
+    
+    try:
+        if args.drop_old:
+            with engine.begin() as connection:
+                connection.execute(text("DROP TABLE IF EXISTS messages_unpartitioned"))
+            print("SUCCESS Dropped messages_unpartitioned")
+            return
+        
+        with engine.connect() as connection:
+            if is_partitioned(connection):
+                print("messages is already partitioned, nothing to do")
+                return
+            statements = partition_messages_statements(connection, args.partitions)
+            row_count = connection.execute(text("SELECT count(*) FROM messages")).scalar()
+        
+        if args.dry_run:
+            for statement in statements:
+                print(f"{statement};\n")
+            return
+        
+        print(f"Partitioning messages ({row_count} rows) into {args.partitions} hash partitions...")
+        print("   - Writes to messages wait until the migration commits")
+        
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+        elapsed = time.perf_counter() - started
+        
+        print(f"SUCCESS messages is now partitioned ({elapsed:.1f}s)")
+        print("   - Previous table kept as messages_unpartitioned; remove it with --drop-old")
+    except Exception as e:
+        print(f"ERROR Partitioning failed, nothing was changed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
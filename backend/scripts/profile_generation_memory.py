@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-journey memory footprint of journey generation, measured with tracemalloc.
+Generates journeys against an in-process LLM stand-in and reports, for each
+generator, the memory a finished journey keeps alive, the peak while it is
+being generated, the bytes held by its messages and the source lines that
+allocated the most. Results go to a JSON file; --baseline compares them with
+an earlier run, e.g. one taken before a change to the message representation.
+"""
+
+import sys
+import os
+import argparse
+import gc
+import json
+import random
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile the memory footprint of journey generation with tracemalloc")
+    parser.add_argument("--database-url", default="sqlite:///generation_benchmark.db", help="Database the generators open sessions on")
+    parser.add_argument("--generators", default="basic,realistic", help="Comma-separated generators to profile: basic, realistic")
+    parser.add_argument("--journeys", type=int, default=3, help="Journeys profiled per generator")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="Completion tokens per fake LLM call, which sets message length")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites listed per generator")
+    parser.add_argument("--output", default="generation_memory_profile.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generation and fake content")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Point the app at the benchmark database before any app module creates its engine
+os.environ["DATABASE_URL"] = args.database_url
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app.agents.base_agent as base_agent
+from app.services.journey_generator import HealthJourneyGenerator
+from app.services.realistic_journey_generator import RealisticJourneyGenerator
+from scripts.benchmark_data import FakeLLM
+
+
+def deep_size(value, seen=None):
+    """Bytes reachable from value through containers and instance attributes, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    else:
+        for name in getattr(type(value), "__slots__", ()):
+            if hasattr(value, name):
+                size += deep_size(getattr(value, name), seen)
+        if hasattr(value, "__dict__"):
+            size += deep_size(vars(value), seen)
+    return size
+
+
+def generate(kind):
+    if kind == "basic":
+        return HealthJourneyGenerator().generate_complete_journey()
+    return RealisticJourneyGenerator().generate_realistic_complete_journey()
+
+
+def profile_journey(kind, index):
+    """Retained and peak traced bytes for one journey, plus the allocation sites it left behind"""
+    random.seed(f"{args.seed}:{kind}:{index}")
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+
+    journey_data = generate(kind)
+    gc.collect()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+
+    messages = journey_data["messages"]
+    messages_bytes = deep_size(messages)
+    sites = after.compare_to(before, "lineno")
+    return {
+        "messages": len(messages),
+        "retained_bytes": retained_bytes - start_bytes,
+        "peak_bytes": peak_bytes - start_bytes,
+        "messages_bytes": messages_bytes,
+        "bytes_per_message": round(messages_bytes / len(messages)) if messages else 0,
+        "sites": [
+            {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "bytes": stat.size_diff, "blocks": stat.count_diff}
+            for stat in sites[:args.top] if stat.size_diff > 0
+        ]
+    }
+
+
+def short_site(site):
+    # Paths under the backend directory print relative to it
+    backend = os.path.realpath(os.path.join(os.path.dirname(__file__), '..')) + os.sep
+    site = os.path.realpath(site)
+    return site[len(backend):] if site.startswith(backend) else site
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for kind, current in results.items():
+        previous = baseline.get("generators", {}).get(kind)
+        if not previous:
+            continue
+        for key in ("retained_bytes", "peak_bytes", "messages_bytes", "bytes_per_message"):
+            change = (current[key] - previous[key]) / previous[key] * 100 if previous[key] else 0.0
+            scale, unit = (1, "B") if key == "bytes_per_message" else (1024, "KiB")
+            print(
+                f"   - {kind:<10}{key:<20}{previous[key] / scale:>12.1f} -> {current[key] / scale:>10.1f} {unit} ({change:+.1f}%)"
+            )
+
+
+def main():
+    """Profile every generator over the configured journeys and write the results"""
+    kinds = [kind.strip() for kind in args.generators.split(",") if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in ("basic", "realistic")]
+    if unknown:
+        print(f"ERROR Unknown generators {', '.join(unknown)}; expected basic and/or realistic")
+        sys.exit(1)
+
+    # Returns instantly, so only the app's own allocations are measured
+    base_agent.Groq = partial(FakeLLM, rng=random.Random(args.seed), completion_tokens=args.completion_tokens)
+
+    print("JOURNEY GENERATION MEMORY PROFILE")
+    print("=" * 86)
+    # A first journey per generator outside tracing, so imports and one-off caches aren't billed to journeys
+    for kind in kinds:
+        generate(kind)
+
+    tracemalloc.start()
+    results = {}
+    print(f"{'generator':<12}{'messages':>10}{'retained KiB':>15}{'peak KiB':>12}{'messages KiB':>15}{'B/message':>12}")
+    print("-" * 86)
+    for kind in kinds:
+        runs = [profile_journey(kind, index) for index in range(args.journeys)]
+        result = {
+            key: round(statistics.median(run[key] for run in runs))
+            for key in ("messages", "retained_bytes", "peak_bytes", "messages_bytes", "bytes_per_message")
+        }
+        result["journeys"] = len(runs)
+        result["sites"] = runs[-1]["sites"]
+        results[kind] = result
+        print(
+            f"{kind:<12}{result['messages']:>10}{result['retained_bytes'] / 1024:>15.1f}{result['peak_bytes'] / 1024:>12.1f}"
+            f"{result['messages_bytes'] / 1024:>15.1f}{result['bytes_per_message']:>12}"
+        )
+    tracemalloc.stop()
+
+    for kind, result in results.items():
+        print(f"\nTop allocation sites still alive after a {kind} journey:")
+        for site in result["sites"]:
+            print(f"   {site['bytes'] / 1024:>10.1f} KiB {site['blocks']:>8} blocks  {short_site(site['site'])}")
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "completion_tokens": args.completion_tokens,
+        "generators": results
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        print_comparison(results, args.baseline)
+    print(f"\nSUCCESS Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
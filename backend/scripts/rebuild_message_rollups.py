@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Backfill or rebuild the monthly message rollups used by the analytics endpoints.
+Run after upgrading an existing database, or to repair rollups for one member.
+"""
+
+import sys
+import os
+import argparse
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal
+from app.services.message_rollups import rebuild_message_rollups
+
+
+def main():
+    """Rebuild message rollups for all members, or a single member"""
+    parser = argparse.ArgumentParser(description="Rebuild monthly message rollups from the messages table")
+    parser.add_argument("--member-id", help="Only rebuild rollups for this member")
+    args = parser.parse_args()
+    
+    scope = f"member {args.member_id}" if args.member_id else "all members"
+    print(f"Rebuilding message rollups for {scope}...")
+    
+    db = SessionLocal()
+    try:
+        bucket_count = rebuild_message_rollups(db, args.member_id)
+        db.commit()
+        print(f"SUCCESS Wrote {bucket_count} rollup buckets")
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR Failed to rebuild rollups: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Inspect traces written by TRACING_EXPORTER=file offline.
+Without --trace-id, lists the slowest traces in the file. With one, prints
+the span tree (same-named siblings, e.g. thousands of db.query spans,
+collapsed into one line) and where the time went by span name, counting each
+span's self time so nested spans are not double-counted.
+"""
+
+import sys
+import argparse
+import json
+from collections import defaultdict
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Show traces from a TRACING_EXPORTER=file JSON lines file")
+    parser.add_argument("--file", default="traces.jsonl", help="Trace file written by the file exporter")
+    parser.add_argument("--trace-id", default=None, help="Trace to show (a unique prefix is enough); default lists traces")
+    parser.add_argument("--slowest", action="store_true", help="Show the slowest trace in the file")
+    parser.add_argument("--limit", type=int, default=20, help="Traces to list")
+    parser.add_argument("--depth", type=int, default=6, help="Deepest span level printed in the tree")
+    return parser.parse_args()
+
+
+def load_spans(path):
+    traces = defaultdict(list)
+    with open(path) as handle:
+        for line in handle:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def build_tree(spans):
+    """Roots and children by span id; spans whose parent isn't in the file count as roots"""
+    ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in sorted(spans, key=lambda span: span["start_time_unix_nano"]):
+        if span["parent_span_id"] in ids:
+            children[span["parent_span_id"]].append(span)
+        else:
+            roots.append(span)
+    return roots, children
+
+
+def trace_duration_ms(spans):
+    start = min(span["start_time_unix_nano"] for span in spans)
+    end = max(span["end_time_unix_nano"] for span in spans)
+    return (end - start) / 1e6
+
+
+def span_runs(spans, by_name):
+    """Consecutive same-named siblings as runs, or every same-named span as one run when by_name"""
+    runs = {} if by_name else []
+    for span in spans:
+        if by_name:
+            runs.setdefault(span["name"], []).append(span)
+        elif runs and runs[-1][0]["name"] == span["name"]:
+            runs[-1].append(span)
+        else:
+            runs.append([span])
+    return list(runs.values()) if by_name else runs
+
+
+def print_tree(spans, children, depth, max_depth, by_name=False):
+    """Print spans in start order, collapsing runs of same-named siblings into one line"""
+    for run in span_runs(spans, by_name):
+        indent = "  " * depth
+        total = sum(span["duration_ms"] for span in run)
+        errors = sum(span["status"] == "ERROR" for span in run)
+        error_note = f"  [{errors} ERROR]" if errors else ""
+        if len(run) == 1:
+            attributes = {
+                key: value for key, value in run[0]["attributes"].items() if key != "db.statement"
+            }
+            print(f"{indent}{run[0]['name']:<{60 - len(indent)}}{total:>12.1f}ms  {attributes or ''}{error_note}")
+        else:
+            print(f"{indent}{run[0]['name'] + f' x{len(run)}':<{60 - len(indent)}}{total:>12.1f}ms  (total){error_note}")
+
+        if depth + 1 < max_depth:
+            # Children of a collapsed run are aggregated by name, so repeated subtrees collapse too
+            merged = sorted(
+                (child for span in run for child in children[span["span_id"]]),
+                key=lambda span: span["start_time_unix_nano"]
+            )
+            print_tree(merged, children, depth + 1, max_depth, by_name=by_name or len(run) > 1)
+
+
+def self_times(spans, children):
+    """Milliseconds spent in each span name excluding time in its child spans"""
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for span in spans:
+        child_ms = sum(child["duration_ms"] for child in children[span["span_id"]])
+        totals[span["name"]] += max(span["duration_ms"] - child_ms, 0.0)
+        counts[span["name"]] += 1
+    return totals, counts
+
+
+def list_traces(traces, limit):
+    print(f"{'trace_id':<34}{'root span':<50}{'spans':>7}{'errors':>8}{'duration':>14}")
+    print("-" * 113)
+    ranked = sorted(traces.items(), key=lambda item: trace_duration_ms(item[1]), reverse=True)
+    for trace_id, spans in ranked[:limit]:
+        roots, _ = build_tree(spans)
+        errors = sum(span["status"] == "ERROR" for span in spans)
+        print(f"{trace_id:<34}{roots[0]['name'][:48]:<50}{len(spans):>7}{errors:>8}{trace_duration_ms(spans):>12.1f}ms")
+
+
+def show_trace(trace_id, spans, max_depth):
+    roots, children = build_tree(spans)
+    duration = trace_duration_ms(spans)
+    print(f"TRACE {trace_id}  {len(spans)} spans  {duration:.1f}ms")
+    print("=" * 100)
+    print_tree(roots, children, 0, max_depth)
+
+    totals, counts = self_times(spans, children)
+    print("\nSELF TIME BY SPAN NAME")
+    print("-" * 100)
+    for name, total in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+        share = total / duration * 100 if duration else 0.0
+        print(f"{name:<60}{counts[name]:>8}{total:>14.1f}ms{share:>8.1f}%")
+
+
+def main():
+    """List traces, or show one as a tree with a self-time breakdown"""
+    args = parse_args()
+    try:
+        traces = load_spans(args.file)
+    except OSError as e:
+        print(f"ERROR Could not read {args.file}: {e}")
+        sys.exit(1)
+    if not traces:
+        print(f"ERROR No spans in {args.file}")
+        sys.exit(1)
+
+    if args.slowest:
+        trace_id = max(traces, key=lambda key: trace_duration_ms(traces[key]))
+    elif args.trace_id:
+        matches = [key for key in traces if key.startswith(args.trace_id)]
+        if len(matches) != 1:
+            print(f"ERROR {len(matches)} traces match {args.trace_id!r}")
+            sys.exit(1)
+        trace_id = matches[0]
+    else:
+        list_traces(traces, args.limit)
+        return
+
+    show_trace(trace_id, traces[trace_id], args.depth)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,11 @@ CREATE TABLE IF NOT EXISTS members (
 -- Add indexes for performance
 CREATE INDEX IF NOT EXISTS idx_members_name ON members(name);
 CREATE INDEX IF NOT EXISTS idx_members_location ON members(location);
+-- Keyset pagination over (created_at, id) for GET /journey/members
+CREATE INDEX IF NOT EXISTS idx_members_created_at_id ON members(created_at, id);
+-- Last journey write per member, for search index refreshes and journey ETags
+ALTER TABLE members ADD COLUMN IF NOT EXISTS journey_updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_members_journey_updated_at ON members(journey_updated_at);
 
 -- ========================================
 -- 2. AGENTS TABLE
@@ -47,15 +52,38 @@ CREATE TABLE IF NOT EXISTS messages (
     content TEXT NOT NULL,
     message_type VARCHAR(50),
     timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    context_data JSONB
+    context_data JSONB,
+    journey_month INTEGER NOT NULL DEFAULT 1,
+    journey_day INTEGER NOT NULL DEFAULT 1
 );
 
 -- Add indexes for performance
-CREATE INDEX IF NOT EXISTS idx_messages_member_id ON messages(member_id);
 CREATE INDEX IF NOT EXISTS idx_messages_agent_id ON messages(agent_id);
-CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);
 CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(message_type);
-CREATE INDEX IF NOT EXISTS idx_messages_context_month ON messages USING GIN((context_data->'month'));
+-- Journey month/day as typed columns (existing databases: add and backfill them from context_data)
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS journey_month INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS journey_day INTEGER NOT NULL DEFAULT 1;
+UPDATE messages SET
+    journey_month = COALESCE((context_data->>'month')::INTEGER, 1),
+    journey_day = COALESCE((context_data->>'day')::INTEGER, 1)
+WHERE context_data ? 'month' OR context_data ? 'day';
+DROP INDEX IF EXISTS idx_messages_context_month;
+CREATE INDEX IF NOT EXISTS idx_messages_member_month_day ON messages(member_id, journey_month, journey_day);
+-- Keyset pagination over (timestamp, id), globally and per member. The per-member
+-- index covers the small columns so timeline ranking and rollup rebuilds are
+-- index-only scans. Single-column indexes on member_id and timestamp are
+-- dropped: these composites serve the same lookups through their leading columns.
+CREATE INDEX IF NOT EXISTS idx_messages_timestamp_id ON messages(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_messages_member_timestamp_covering ON messages(member_id, timestamp, id)
+    INCLUDE (agent_id, message_type, journey_month, journey_day);
+DROP INDEX IF EXISTS idx_messages_member_timestamp_id;
+DROP INDEX IF EXISTS idx_messages_member_id;
+DROP INDEX IF EXISTS idx_messages_timestamp;
+
+-- Full-text search: generated tsvector column kept in sync on write, with a GIN index
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_messages_search_vector ON messages USING GIN (search_vector);
 
 -- ========================================
 -- 4. HEALTH EVENTS TABLE
@@ -94,7 +122,79 @@ CREATE INDEX IF NOT EXISTS idx_journey_state_month ON journey_state(month);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_journey_state_member_month ON journey_state(member_id, month);
 
 -- ========================================
--- 6. ROW LEVEL SECURITY (Optional but recommended)
+-- 6. MESSAGE ROLLUPS TABLE
+-- ========================================
+-- Message counts per (member, agent, month, message_type), maintained on write
+-- by the journey save paths. Backfill with scripts/rebuild_message_rollups.py
+CREATE TABLE IF NOT EXISTS message_rollups (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    member_id UUID NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    agent_id UUID NOT NULL REFERENCES agents(id) ON DELETE CASCADE,
+    month INTEGER NOT NULL,
+    message_type VARCHAR(50) NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Add indexes for performance
+CREATE UNIQUE INDEX IF NOT EXISTS idx_message_rollups_bucket ON message_rollups(member_id, agent_id, month, message_type);
+CREATE INDEX IF NOT EXISTS idx_message_rollups_agent_id ON message_rollups(agent_id);
+
+-- ========================================
+-- 7. JOURNEY IMPORTS TABLE
+-- ========================================
+-- One row per imported journey backup, keyed by the SHA-256 of the file so
+-- scripts/import_journey_backups.py can skip files it has already loaded
+CREATE TABLE IF NOT EXISTS journey_imports (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    content_hash VARCHAR(64) NOT NULL,
+    source TEXT,
+    member_id UUID NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    imported_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_journey_imports_content_hash ON journey_imports(content_hash);
+
+-- ========================================
+-- 8. LLM USAGE LEDGER
+-- ========================================
+-- One row per journey generation, and one per LLM call made during it, with
+-- token counts, latency and cost so spend can be attributed per member and agent
+CREATE TABLE IF NOT EXISTS generation_runs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    member_id UUID REFERENCES members(id) ON DELETE SET NULL,
+    generator VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_generation_runs_member_id ON generation_runs(member_id);
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    run_id UUID NOT NULL REFERENCES generation_runs(id) ON DELETE CASCADE,
+    member_id UUID REFERENCES members(id) ON DELETE SET NULL,
+    agent_name VARCHAR(100) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    message_type VARCHAR(50),
+    journey_month INTEGER,
+    journey_day INTEGER,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms DOUBLE PRECISION NOT NULL,
+    cost_usd DOUBLE PRECISION,
+    error VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_calls_member_id ON llm_calls(member_id);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_run_id ON llm_calls(run_id);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_agent_model ON llm_calls(agent_name, model);
+
+-- ========================================
+-- 9. ROW LEVEL SECURITY (Optional but recommended)
 -- ========================================
 -- Enable RLS on all tables
 ALTER TABLE members ENABLE ROW LEVEL SECURITY;
@@ -102,6 +202,10 @@ ALTER TABLE agents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE messages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE health_events ENABLE ROW LEVEL SECURITY;
 ALTER TABLE journey_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE message_rollups ENABLE ROW LEVEL SECURITY;
+ALTER TABLE journey_imports ENABLE ROW LEVEL SECURITY;
+ALTER TABLE generation_runs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE llm_calls ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for public access (suitable for demo/hackathon)
 -- In production, you'd want more restrictive policies
@@ -121,8 +225,20 @@ CREATE POLICY "Allow all operations on health_events" ON health_events
 CREATE POLICY "Allow all operations on journey_state" ON journey_state
     FOR ALL USING (true) WITH CHECK (true);
 
+CREATE POLICY "Allow all operations on message_rollups" ON message_rollups
+    FOR ALL USING (true) WITH CHECK (true);
+
+CREATE POLICY "Allow all operations on journey_imports" ON journey_imports
+    FOR ALL USING (true) WITH CHECK (true);
+
+CREATE POLICY "Allow all operations on generation_runs" ON generation_runs
+    FOR ALL USING (true) WITH CHECK (true);
+
+CREATE POLICY "Allow all operations on llm_calls" ON llm_calls
+    FOR ALL USING (true) WITH CHECK (true);
+
 -- ========================================
--- 7. INSERT INITIAL AGENT DATA
+-- 10. INSERT INITIAL AGENT DATA
 -- ========================================
 INSERT INTO agents (name, role, specialty) VALUES
     ('Dr. Warren', 'The Medical Strategist', 'Clinical Authority & Medical Direction'),
@@ -134,7 +250,7 @@ INSERT INTO agents (name, role, specialty) VALUES
 ON CONFLICT DO NOTHING;
 
 -- ========================================
--- 8. VERIFICATION QUERIES
+-- 11. VERIFICATION QUERIES
 -- ========================================
 -- Run these to verify setup worked correctly
 
@@ -142,7 +258,7 @@ ON CONFLICT DO NOTHING;
 SELECT table_name 
 FROM information_schema.tables 
 WHERE table_schema = 'public' 
-    AND table_name IN ('members', 'agents', 'messages', 'health_events', 'journey_state')
+    AND table_name IN ('members', 'agents', 'messages', 'health_events', 'journey_state', 'message_rollups', 'journey_imports', 'generation_runs', 'llm_calls')
 ORDER BY table_name;
 
 -- Check agents were inserted
@@ -152,5 +268,5 @@ SELECT name, role, specialty FROM agents ORDER BY name;
 SELECT indexname, tablename 
 FROM pg_indexes 
 WHERE schemaname = 'public' 
-    AND tablename IN ('members', 'agents', 'messages', 'health_events', 'journey_state')
+    AND tablename IN ('members', 'agents', 'messages', 'health_events', 'journey_state', 'message_rollups', 'journey_imports', 'generation_runs', 'llm_calls')
 ORDER BY tablename, indexname;